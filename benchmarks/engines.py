@@ -0,0 +1,115 @@
+"""
+    Compare two engines of the AI: search speed (nodes per second) on fixed
+    positions and strength over a few self-play games.
+
+    Usage (from the root of the repository):
+        python3 benchmarks/engines.py [first_engine] [second_engine] [games] [timeout_turn_ms]
+"""
+
+import os
+import sys
+import random
+from typing import Dict, List, Tuple
+
+sys.path.append(os.getcwd())
+try:
+    from src.ai import AI
+    from src.bitboard import BitBoard
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+BOARD_SIZE = 15
+MAX_MOVES = 150
+
+# Positions of the speed test: (player stones, enemy stones)
+POSITIONS: List[Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]] = [
+    ([(7, 7)], [(7, 8)]),
+    ([(7, 7), (8, 8), (6, 8)], [(7, 8), (8, 7), (6, 6)]),
+    ([(7, 7), (7, 8), (7, 9), (9, 9)], [(6, 6), (8, 8), (6, 8), (8, 6)])
+]
+
+
+def build_board(player: List[Tuple[int, int]], enemy: List[Tuple[int, int]]) -> List[List[int]]:
+    """
+    Create a board holding the given stones.
+    """
+    board = [[CONST.CELL_EMPTY] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+    for y, x in player:
+        board[y][x] = CONST.CELL_PLAYER
+    for y, x in enemy:
+        board[y][x] = CONST.CELL_ENEMY
+    return board
+
+
+def create_ai(engine: str, timeout_turn: int) -> AI:
+    """
+    Create a single process AI thinking timeout_turn milliseconds per move.
+    """
+    ai = AI(engine, 0)
+    ai.time_manager.timeout_turn = timeout_turn
+    return ai
+
+
+def measure_speed(engine: str, timeout_turn: int) -> float:
+    """
+    Return the nodes per second of the engine over the test positions.
+    """
+    ai = create_ai(engine, timeout_turn)
+    nodes: int = 0
+    elapsed: float = 0.0
+    for player, enemy in POSITIONS:
+        ai.play_ai_turn(build_board(player, enemy))
+        nodes += ai.nodes
+        elapsed += ai.search_time
+    return nodes / elapsed if elapsed > 0 else 0.0
+
+
+def play_game(engines: Dict[int, str], first: int, timeout_turn: int, seed: int) -> int:
+    """
+    Play one game between the engines (stone colour -> engine) and return
+    the colour of the winner, CELL_EMPTY for a draw.
+    """
+    random.seed(seed)
+    board = [[CONST.CELL_EMPTY] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+    players = {colour: create_ai(engine, timeout_turn) for colour, engine in engines.items()}
+    turn: int = first
+    for _ in range(MAX_MOVES):
+        # Every AI sees its own stones as CELL_PLAYER
+        view = [
+            [cell if cell == CONST.CELL_EMPTY else (CONST.CELL_PLAYER if cell == turn else CONST.CELL_ENEMY) for cell in row]
+            for row in board
+        ]
+        y, x = map(int, players[turn].play_ai_turn(view).split(","))
+        board[y][x] = turn
+        if BitBoard.from_board(board).has_five(turn):
+            return turn
+        turn = 3 - turn
+    return CONST.CELL_EMPTY
+
+
+def main(arguments: List[str]) -> int:
+    """
+    Run the speed test of both engines, then the games (colours alternate).
+    """
+    first_engine: str = arguments[0] if len(arguments) > 0 else CONST.ENGINE_ALPHABETA
+    second_engine: str = arguments[1] if len(arguments) > 1 else CONST.ENGINE_MCTS
+    games: int = int(arguments[2]) if len(arguments) > 2 else 4
+    timeout_turn: int = int(arguments[3]) if len(arguments) > 3 else 400
+    for engine in (first_engine, second_engine):
+        print(f"{engine}: {measure_speed(engine, timeout_turn):.0f} nodes/s")
+    engines = {CONST.CELL_PLAYER: first_engine, CONST.CELL_ENEMY: second_engine}
+    results = {CONST.CELL_EMPTY: 0, CONST.CELL_PLAYER: 0, CONST.CELL_ENEMY: 0}
+    for game in range(games):
+        first: int = CONST.CELL_PLAYER if game % 2 == 0 else CONST.CELL_ENEMY
+        results[play_game(engines, first, timeout_turn, game)] += 1
+    print(
+        f"{first_engine} {results[CONST.CELL_PLAYER]} - "
+        f"{results[CONST.CELL_ENEMY]} {second_engine} "
+        f"({results[CONST.CELL_EMPTY]} draws)"
+    )
+    return CONST.SUCCESS
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
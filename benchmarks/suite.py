@@ -0,0 +1,260 @@
+"""
+    Measure the throughput of the building blocks of the AI (move generation,
+    win check, playouts, evaluation) and of whole turns on fixed seeded
+    positions, for several board sizes, and write the results as JSON.
+
+    Every measure repeats its operation for a fixed duration and reports the
+    operations per second (playouts per second for the playouts, nodes per
+    second for the turns). The peak memory of the operation is measured in a
+    separate short run under tracemalloc, so that tracing does not slow the
+    timed run. Every measured turn records its duration against its
+    timeout_turn, and the command fails when a turn went over its limit.
+    With --baseline, the results are compared with a previous file and the
+    command fails when a measure lost more than --tolerance.
+
+    Usage (from the root of the repository):
+        python3 benchmarks/suite.py [--sizes 15 20 40 60] [--duration 0.5]
+                                    [--turn 200] [--output results.json]
+                                    [--baseline previous.json] [--tolerance 0.2]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.append(os.getcwd())
+try:
+    from src.ai import AI
+    from src.bitboard import BitBoard
+    from src.candidates import CandidateSet
+    from src.evaluator import Evaluator
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+try:
+    import resource
+except ImportError:
+    resource = None
+
+SIZES = [15, 20, 40, 60]
+SEED = 2024
+MEMORY_RUNS = 3
+
+Measure = Dict[str, Any]
+
+
+def build_position(size: int, seed: int = SEED) -> List[List[int]]:
+    """
+    Create a middle game position without five: about two stones per row,
+    alternating colours, drawn around the centre.
+    """
+    generator = random.Random(seed + size)
+    board = [[CONST.CELL_EMPTY] * size for _ in range(size)]
+    center: int = size // 2
+    spread: int = max(3, size // 4)
+    colour: int = CONST.CELL_PLAYER
+    placed: int = 0
+    while placed < 2 * size:
+        y = min(size - 1, max(0, center + generator.randint(-spread, spread)))
+        x = min(size - 1, max(0, center + generator.randint(-spread, spread)))
+        if board[y][x] != CONST.CELL_EMPTY:
+            continue
+        board[y][x] = colour
+        if BitBoard.from_board(board).has_five(colour):
+            board[y][x] = CONST.CELL_EMPTY
+            continue
+        colour = 3 - colour
+        placed += 1
+    return board
+
+
+def time_operation(operation: Callable[[], Any], duration: float) -> float:
+    """
+    Return the calls per second of operation, repeated for duration seconds.
+    """
+    calls: int = 0
+    start: float = time.perf_counter()
+    end: float = start + duration
+    now: float = start
+    while now < end or calls == 0:
+        operation()
+        calls += 1
+        now = time.perf_counter()
+    return calls / (now - start)
+
+
+def peak_memory(operation: Callable[[], Any]) -> int:
+    """
+    Return the peak memory (bytes) allocated by a few calls of operation.
+    """
+    tracemalloc.start()
+    try:
+        for _ in range(MEMORY_RUNS):
+            operation()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(name: str, size: int, operation: Callable[[], Any], duration: float, unit: str = "ops_per_second") -> Measure:
+    """
+    Time operation and measure its peak memory.
+    """
+    return {
+        "name": name,
+        "size": size,
+        unit: time_operation(operation, duration),
+        "peak_memory_bytes": peak_memory(operation)
+    }
+
+
+def measure_turn(size: int, board: List[List[int]], timeout_turn: int, engine: str) -> Measure:
+    """
+    Play a full turn (new AI, single process) and report the search figures
+    and whether the turn stayed within timeout_turn (milliseconds).
+    """
+    ai = AI(engine, 0)
+    ai.time_manager.timeout_turn = timeout_turn
+    start: float = time.perf_counter()
+    ai.play_ai_turn([row[:] for row in board])
+    elapsed: float = time.perf_counter() - start
+    ai.reset()
+    tracemalloc.start()
+    try:
+        ai.play_ai_turn([row[:] for row in board])
+        memory: int = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "name": f"play_ai_turn_{engine}",
+        "size": size,
+        "ops_per_second": 1 / elapsed,
+        "nodes_per_second": ai.nodes / ai.search_time if ai.search_time > 0 else 0.0,
+        "elapsed_seconds": elapsed,
+        "timeout_turn_seconds": timeout_turn / 1000,
+        "over_time": timeout_turn > 0 and elapsed > timeout_turn / 1000,
+        "peak_memory_bytes": memory
+    }
+
+
+def run_size(size: int, duration: float, timeout_turn: int, engines: List[str]) -> List[Measure]:
+    """
+    Run every measure on the position of the given size.
+    """
+    ai = AI(CONST.ENGINE_MCTS, 0)
+    board = build_position(size)
+    bitboard = BitBoard.from_board(board)
+    candidates = CandidateSet.from_board(board)
+    random.seed(SEED)
+    results: List[Measure] = [
+        measure("generate_possible_moves", size, lambda: ai._generate_possible_moves(board), duration),
+        measure("generate_possible_moves_bitboard", size, lambda: ai._generate_possible_moves_bitboard(bitboard), duration),
+        measure("candidate_set_build", size, lambda: CandidateSet.from_board(board), duration),
+        measure("check_all_alignments", size, lambda: ai._check_all_alignments(board, CONST.CELL_PLAYER), duration),
+        measure("has_five_bitboard", size, lambda: bitboard.has_five(CONST.CELL_PLAYER), duration),
+        measure("evaluator_build", size, lambda: Evaluator.from_board(board), duration),
+        measure(
+            "simulate_random_game", size,
+            lambda: ai._simulate_random_game(board, CONST.CELL_PLAYER, CONST.PLAYOUT_DEPTH),
+            duration, "playouts_per_second"
+        ),
+        measure(
+            "simulate_random_game_bitboard", size,
+            lambda: ai._simulate_random_game_bitboard(bitboard, CONST.CELL_PLAYER, CONST.PLAYOUT_DEPTH, candidates),
+            duration, "playouts_per_second"
+        )
+    ]
+    for engine in engines:
+        results.append(measure_turn(size, board, timeout_turn, engine))
+    return results
+
+
+def compare(results: List[Measure], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Return the measures slower than the baseline by more than tolerance.
+    """
+    previous: Dict[str, Measure] = {
+        f"{entry['name']}@{entry['size']}": entry for entry in baseline.get("results", [])
+    }
+    regressions: List[str] = []
+    for entry in results:
+        old: Optional[Measure] = previous.get(f"{entry['name']}@{entry['size']}")
+        if old is None:
+            continue
+        for unit in ("ops_per_second", "playouts_per_second", "nodes_per_second"):
+            if unit in entry and old.get(unit):
+                ratio: float = entry[unit] / old[unit]
+                if ratio < 1 - tolerance:
+                    regressions.append(f"{entry['name']} ({entry['size']}): {unit} {ratio:.0%} of the baseline")
+    return regressions
+
+
+def over_time(results: List[Measure]) -> List[str]:
+    """
+    Return the turns that took longer than their timeout_turn.
+    """
+    return [
+        f"{entry['name']} ({entry['size']}): {1000 * entry['elapsed_seconds']:.0f} ms "
+        f"for a timeout_turn of {1000 * entry['timeout_turn_seconds']:.0f} ms"
+        for entry in results if entry.get("over_time")
+    ]
+
+
+def main(arguments: List[str]) -> int:
+    """
+    Run the suite, print a summary, write the JSON and check the turn times
+    and the baseline.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark suite of the AI")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--duration", type=float, default=0.5, help="seconds per measure")
+    parser.add_argument("--turn", type=int, default=200, help="milliseconds per measured turn")
+    parser.add_argument("--engines", nargs="+", default=[CONST.ENGINE_MCTS, CONST.ENGINE_ALPHABETA])
+    parser.add_argument("--output", default="", help="JSON file of the results (stdout when empty)")
+    parser.add_argument("--baseline", default="", help="JSON file of a previous run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown against the baseline")
+    options = parser.parse_args(arguments)
+    results: List[Measure] = []
+    for size in options.sizes:
+        for entry in run_size(size, options.duration, options.turn, options.engines):
+            rate: str = next(f"{entry[key]:.1f} {key}" for key in ("playouts_per_second", "ops_per_second") if key in entry)
+            print(f"{entry['size']:>3} {entry['name']:<34} {rate:<32} {entry['peak_memory_bytes'] / 1024:.0f} KiB", file=sys.stderr)
+            results.append(entry)
+    report: Dict[str, Any] = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "duration": options.duration,
+        "timeout_turn": options.turn,
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource is not None else None,
+        "results": results
+    }
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    overruns: List[str] = over_time(results)
+    for overrun in overruns:
+        print(f"OVERTIME {overrun}", file=sys.stderr)
+    if options.baseline:
+        with open(options.baseline, encoding="utf-8") as baseline:
+            regressions: List[str] = compare(results, json.load(baseline), options.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return CONST.ERROR
+    if overruns:
+        return CONST.ERROR
+    return CONST.SUCCESS
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,361 @@
+"""
+    Play a match between two brains, standing in for the protocol manager.
+
+    Every game starts two brain processes (pbrain-gomoku-ai by default) and
+    drives them through the protocol: START, INFO (time limits, engine),
+    BOARD for the opening stones (BEGIN on an empty opening), TURN for the
+    following moves, END. The time of every answer is measured: a brain
+    answering after timeout_turn (plus the margin) or running out of match
+    time loses the game, like an illegal move, a crash or an ERROR answer.
+    Games are played in pairs on the same random opening with the colours
+    swapped, and several games run at once.
+
+    The report gives the score of the first brain with its 95% confidence
+    interval, the matching Elo difference and the average time per move.
+
+    Usage (from the root of the repository):
+        python3 benchmarks/tournament.py [first_engine] [second_engine]
+            [--games 20] [--jobs N] [--size 20] [--turn 1000] [--match 0]
+            [--margin 1000] [--opening 3] [--seed 1] [--output FILE]
+            [--first-command CMD] [--first-env NAME=VALUE ...]
+            [--second-command CMD] [--second-env NAME=VALUE ...]
+    The brains run with PBRAIN_PONDER=0 and PBRAIN_WORKERS=0 unless their
+    environment says otherwise.
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import queue
+import random
+import shlex
+import argparse
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.append(os.getcwd())
+try:
+    from src.bitboard import BitBoard
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+BRAIN = "pbrain-gomoku-ai"
+# Environment of the brains unless given: no pondering (the brains share the
+# cores) and no worker processes (the games run in parallel)
+BRAIN_ENVIRONMENT = {CONST.ENV_PONDER: "0", CONST.ENV_WORKERS: "0"}
+START_TIMEOUT = 30.0
+END_TIMEOUT = 5.0
+Z_95 = 1.96
+
+
+class BrainError(Exception):
+    """
+    A brain broke the rules: its game is lost.
+    """
+
+
+class Brain:
+    """
+    The class in charge of one brain process and of its answers.
+    Lines are read by a thread so that every answer can be waited for with
+    a timeout; MESSAGE and DEBUG lines are skipped.
+    """
+
+    def __init__(self, command: List[str], environment: Dict[str, str]):
+        self.process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, env=environment, text=True, bufsize=1
+        )
+        self.lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+        self.time_used: float = 0.0
+        self.moves: int = 0
+
+    def _read(self) -> None:
+        """
+        Body of the reading thread, None marks the end of the output.
+        """
+        for line in self.process.stdout:
+            self.lines.put(line.strip())
+        self.lines.put(None)
+
+    def send(self, *lines: str) -> None:
+        """
+        Send lines to the brain.
+        """
+        try:
+            self.process.stdin.write("".join(f"{line}\n" for line in lines))
+            self.process.stdin.flush()
+        except OSError as error:
+            raise BrainError(f"cannot write to the brain: {error}") from error
+
+    def receive(self, timeout: float) -> str:
+        """
+        Return the next answer of the brain, waiting at most timeout seconds.
+        """
+        deadline: float = time.perf_counter() + timeout
+        while True:
+            remaining: float = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise BrainError("timeout")
+            try:
+                line: Optional[str] = self.lines.get(timeout=remaining)
+            except queue.Empty as error:
+                raise BrainError("timeout") from error
+            if line is None:
+                raise BrainError("the brain exited")
+            if line.startswith(("MESSAGE", "DEBUG")) or not line:
+                continue
+            if line.startswith(("ERROR", "UNKNOWN")):
+                raise BrainError(line)
+            return line
+
+    def play(self, lines: List[str], timeout: float, size: int) -> Tuple[int, int]:
+        """
+        Send the lines asking for a move and return the move, timed.
+        """
+        start: float = time.perf_counter()
+        self.send(*lines)
+        answer: str = self.receive(timeout)
+        self.time_used += time.perf_counter() - start
+        self.moves += 1
+        try:
+            x, y = (int(value) for value in answer.split(","))
+        except ValueError as error:
+            raise BrainError(f"invalid move {answer}") from error
+        if not (0 <= x < size and 0 <= y < size):
+            raise BrainError(f"move out of the board {answer}")
+        return x, y
+
+    def close(self) -> None:
+        """
+        Send END and wait for the process (killed when it lingers).
+        """
+        try:
+            self.send(CONST.CMD_END)
+            self.process.stdin.close()
+        except (BrainError, OSError):
+            pass
+        try:
+            self.process.wait(END_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+def make_opening(size: int, stones: int, seed: int) -> List[Tuple[int, int]]:
+    """
+    Draw the opening stones of a game pair (alternating colours, first
+    stone at the centre, the others close to it).
+    """
+    generator = random.Random(seed)
+    center: int = size // 2
+    opening: List[Tuple[int, int]] = []
+    while len(opening) < stones:
+        cell = (center, center) if not opening else (
+            center + generator.randint(-2, 2), center + generator.randint(-2, 2)
+        )
+        if cell not in opening:
+            opening.append(cell)
+    return opening
+
+
+def play_game(options: argparse.Namespace, players: List[Dict[str, Any]], first: int, opening: List[Tuple[int, int]]) -> Dict[str, Any]:
+    """
+    Play one game, players[first] moving first (after the opening).
+    Return the index of the winner (None for a draw), the reason and the
+    time used by each player.
+    """
+    size: int = options.size
+    timeout: float = (options.turn + options.margin) / 1000
+    brains: List[Optional[Brain]] = [None, None]
+    board = BitBoard(size)
+    # Colour of the stones: 1 for the player moving first after the opening
+    colours: Dict[int, int] = {first: CONST.CELL_PLAYER, 1 - first: CONST.CELL_ENEMY}
+    history: List[Tuple[int, int, int]] = []
+    for index, (y, x) in enumerate(opening):
+        colour: int = CONST.CELL_PLAYER if (len(opening) - index) % 2 == 0 else CONST.CELL_ENEMY
+        board.set_cell(y, x, colour)
+        history.append((y, x, colour))
+    result: Dict[str, Any] = {"winner": None, "reason": "draw", "moves": len(opening)}
+    turn: int = first
+    try:
+        for index, player in enumerate(players):
+            environment = dict(os.environ)
+            environment.update(BRAIN_ENVIRONMENT)
+            environment.update(player["environment"])
+            environment[CONST.ENV_ENGINE] = player["engine"]
+            brains[index] = Brain(player["command"], environment)
+        for index, brain in enumerate(brains):
+            turn = index
+            brain.send(f"{CONST.CMD_START} {size}")
+            if brain.receive(START_TIMEOUT) != "OK":
+                raise BrainError("START refused")
+            brain.send(
+                f"{CONST.CMD_INFO} {CONST.INFO_TIMEOUT_TURN} {options.turn}",
+                f"{CONST.CMD_INFO} {CONST.INFO_TIMEOUT_MATCH} {options.match}",
+                f"{CONST.CMD_INFO} {CONST.INFO_ENGINE} {players[index]['engine']}"
+            )
+        last: Optional[Tuple[int, int]] = None
+        turn = first
+        for _ in range(size * size - len(opening)):
+            brain: Brain = brains[turn]
+            colour = colours[turn]
+            lines: List[str] = []
+            if options.match > 0:
+                left: int = int(options.match - brain.time_used * 1000)
+                if left <= 0:
+                    raise BrainError("match time exceeded")
+                lines.append(f"{CONST.CMD_INFO} {CONST.INFO_TIME_LEFT} {left}")
+            if brain.moves == 0 and history:
+                lines.append(CONST.CMD_BOARD)
+                lines.extend(f"{y},{x},{1 if stone == colour else 2}" for y, x, stone in history)
+                lines.append("DONE")
+            elif brain.moves == 0:
+                lines.append(CONST.CMD_BEGIN)
+            else:
+                lines.append(f"{CONST.CMD_TURN} {last[0]},{last[1]}")
+            y, x = brain.play(lines, timeout, size)
+            if options.match > 0 and brain.time_used * 1000 > options.match:
+                raise BrainError("match time exceeded")
+            if board.get_cell(y, x) != CONST.CELL_EMPTY:
+                raise BrainError(f"occupied cell {y},{x}")
+            board.set_cell(y, x, colour)
+            history.append((y, x, colour))
+            result["moves"] += 1
+            last = (y, x)
+            if board.has_five(colour):
+                result["winner"] = turn
+                result["reason"] = "five"
+                break
+            turn = 1 - turn
+    except BrainError as error:
+        result["winner"] = 1 - turn
+        result["reason"] = f"{players[turn]['name']}: {error}"
+    finally:
+        for brain in brains:
+            if brain is not None:
+                brain.close()
+    result["time"] = [brain.time_used if brain is not None else 0.0 for brain in brains]
+    result["brain_moves"] = [brain.moves if brain is not None else 0 for brain in brains]
+    return result
+
+
+def score_interval(scores: List[float]) -> Tuple[float, float, float]:
+    """
+    Return the mean score and its 95% confidence interval (normal approximation).
+    """
+    games: int = len(scores)
+    if games == 0:
+        return 0.0, 0.0, 0.0
+    mean: float = sum(scores) / games
+    variance: float = sum((score - mean) ** 2 for score in scores) / max(1, games - 1)
+    error: float = Z_95 * math.sqrt(variance / games)
+    return mean, max(0.0, mean - error), min(1.0, mean + error)
+
+
+def elo(score: float) -> float:
+    """
+    Return the Elo difference matching an expected score.
+    """
+    score = min(max(score, 1e-3), 1 - 1e-3)
+    return -400 * math.log10(1 / score - 1)
+
+
+def player_spec(engine: str, command: str, environment: List[str], name: str) -> Dict[str, Any]:
+    """
+    Describe a player: engine, brain command and environment variables.
+    """
+    variables: Dict[str, str] = {}
+    for assignment in environment:
+        key, _, value = assignment.partition("=")
+        variables[key] = value
+    return {
+        "name": name,
+        "engine": engine,
+        "command": shlex.split(command) if command else [sys.executable, BRAIN],
+        "environment": variables
+    }
+
+
+def main(arguments: List[str]) -> int:
+    """
+    Play the games, print the report and write it as JSON when asked.
+    """
+    parser = argparse.ArgumentParser(description="Local tournament between two brains")
+    parser.add_argument("first", nargs="?", default=CONST.ENGINE_ALPHABETA)
+    parser.add_argument("second", nargs="?", default=CONST.ENGINE_MCTS)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--jobs", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--turn", type=int, default=1000, help="timeout_turn in milliseconds")
+    parser.add_argument("--match", type=int, default=0, help="timeout_match in milliseconds (0: none)")
+    parser.add_argument("--margin", type=int, default=1000, help="milliseconds allowed over timeout_turn")
+    parser.add_argument("--opening", type=int, default=3, help="random opening stones")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--first-command", default="")
+    parser.add_argument("--second-command", default="")
+    parser.add_argument("--first-env", action="append", default=[])
+    parser.add_argument("--second-env", action="append", default=[])
+    parser.add_argument("--output", default="")
+    options = parser.parse_args(arguments)
+    first_name: str = f"1:{options.first}"
+    second_name: str = f"2:{options.second}"
+    players = [
+        player_spec(options.first, options.first_command, options.first_env, first_name),
+        player_spec(options.second, options.second_command, options.second_env, second_name)
+    ]
+    jobs: List[Tuple[int, List[Tuple[int, int]]]] = []
+    for game in range(options.games):
+        opening = make_opening(options.size, options.opening, options.seed + game // 2)
+        jobs.append((game % 2, opening))
+    with ThreadPoolExecutor(max_workers=options.jobs) as executor:
+        results = list(executor.map(lambda job: play_game(options, players, job[0], job[1]), jobs))
+    scores: List[float] = []
+    for game, result in enumerate(results):
+        score: float = 0.5 if result["winner"] is None else (1.0 if result["winner"] == 0 else 0.0)
+        scores.append(score)
+        print(f"game {game + 1}: {score:g} ({result['reason']}, {result['moves']} moves)", file=sys.stderr)
+    mean, low, high = score_interval(scores)
+    average_time: List[float] = [
+        1000 * sum(result["time"][index] for result in results) / max(1, sum(result["brain_moves"][index] for result in results))
+        for index in range(2)
+    ]
+    report: Dict[str, Any] = {
+        "first": first_name,
+        "second": second_name,
+        "games": len(results),
+        "wins": sum(1 for result in results if result["winner"] == 0),
+        "losses": sum(1 for result in results if result["winner"] == 1),
+        "draws": sum(1 for result in results if result["winner"] is None),
+        "score": mean,
+        "score_interval": [low, high],
+        "elo": elo(mean),
+        "elo_interval": [elo(low), elo(high)],
+        "ms_per_move": average_time,
+        "settings": {
+            "size": options.size, "timeout_turn": options.turn,
+            "timeout_match": options.match, "opening": options.opening
+        },
+        "results": results
+    }
+    print(
+        f"{first_name} vs {second_name}: +{report['wins']} ={report['draws']} -{report['losses']}, "
+        f"score {mean:.3f} [{low:.3f}, {high:.3f}], "
+        f"elo {report['elo']:+.0f} [{report['elo_interval'][0]:+.0f}, {report['elo_interval'][1]:+.0f}], "
+        f"ms/move {average_time[0]:.0f} / {average_time[1]:.0f}"
+    )
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    return CONST.SUCCESS
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -2,17 +2,260 @@
 The file contains the AI class that will be used to play the game
 """
 
+import os
+import math
 import random
+import threading
 import time
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from . import constants as CONST
+from .bitboard import BitBoard
+from .candidates import CandidateSet
+from .evaluator import Evaluator, line_cache_memory, set_line_cache_limit
+from .mcts import MCTS
+from .time_manager import TimeManager
+from .parallel import ParallelSearch, RootStatistics, merge_root_statistics
+from .batch_engine import BatchPlayouts
+from .zobrist import TranspositionTable
+from .alphabeta import AlphaBeta
+from .opening_book import OpeningBook
+from .symmetry import Symmetry
+from .memory import MemoryBudget
 
 class AI:
     """
     The class that contains the ai for the gomoku game
     """
-    def __init__(self):
-        pass
+    def __init__(self, engine: Optional[str] = None, workers: Optional[int] = None):
+        self.ponder_thread: Optional[threading.Thread] = None
+        self.engine: str = CONST.DEFAULT_ENGINE
+        if workers is None:
+            try:
+                workers = int(os.environ.get(CONST.ENV_WORKERS, CONST.DEFAULT_WORKERS))
+            except ValueError:
+                workers = CONST.DEFAULT_WORKERS
+        self.parallel: ParallelSearch = ParallelSearch(workers, _init_worker)
+        self.memory: MemoryBudget = MemoryBudget(0, 1 + self.parallel.workers)
+        self.table: TranspositionTable = TranspositionTable(
+            TranspositionTable.buckets_for(self.memory.share(self.engine, CONST.MEMORY_TABLE))
+        )
+        self.mcts: MCTS = MCTS(self._simulate_random_game_bitboard, table=self.table)
+        self.alphabeta: AlphaBeta = AlphaBeta(
+            table=TranspositionTable(
+                TranspositionTable.buckets_for(self.memory.share(self.engine, CONST.MEMORY_ALPHABETA_TABLE))
+            ),
+            symmetry=Symmetry()
+        )
+        self.book: OpeningBook = OpeningBook()
+        self.symmetry: Symmetry = Symmetry()
+        self.nodes: int = 0
+        self.search_time: float = 0.0
+        self.turn_statistics: Dict[str, Union[str, int, float]] = {}
+        self.ponder: bool = os.environ.get(CONST.ENV_PONDER, "1" if CONST.DEFAULT_PONDER else "0") not in ("", "0")
+        self.ponder_nodes: int = 0
+        self.pondered_nodes: int = 0
+        self.time_manager: TimeManager = TimeManager()
+        self.batch: BatchPlayouts = BatchPlayouts()
+        self._apply_memory()
+        if not self.set_engine(os.environ.get(CONST.ENV_ENGINE, "") if engine is None else engine):
+            self.engine = CONST.DEFAULT_ENGINE
+
+    def start_workers(self) -> bool:
+        """
+        Start the worker processes of the parallel search (once per session)
+        """
+        return self.parallel.start()
+
+    def stop_workers(self) -> None:
+        """
+        Stop the worker processes of the parallel search
+        """
+        self.parallel.stop()
+
+    def reset(self) -> None:
+        """
+        Forget what was learnt during the previous game (new game)
+        """
+        self.stop_pondering()
+        self.pondered_nodes = 0
+        self.mcts.reset()
+        self.table.clear()
+        if self.alphabeta.table is not None:
+            self.alphabeta.table.clear()
+
+    def take_back(self, move: int, player: int) -> None:
+        """
+        Forget the stone of player on the cell of index move (TAKEBACK):
+        the pondering stops and the tree kept for the next search steps
+        back to the position without it
+        """
+        self.stop_pondering()
+        self.mcts.take_back(move, player)
+
+    def start_pondering(self, bitboard: BitBoard, candidates: CandidateSet, evaluator: Evaluator) -> bool:
+        """
+        Search the position after our move in the background, as the
+        opponent: the results land in the transposition tables, so the
+        search of the next turn starts from them
+        """
+        if not self.ponder or self.ponder_thread is not None:
+            return False
+        if self.engine not in (CONST.ENGINE_MCTS, CONST.ENGINE_ALPHABETA):
+            return False
+        duration: float = CONST.PONDER_TURNS * self.time_manager.timeout_turn / 1000
+        if duration <= 0 or len(candidates) == 0:
+            return False
+        self.mcts.stop_requested = False
+        self.alphabeta.stop_requested = False
+        self.ponder_nodes = 0
+        self.ponder_thread = threading.Thread(
+            target=self._ponder,
+            args=(bitboard.copy(), candidates.copy(), evaluator.copy(), time.time() + duration),
+            daemon=True
+        )
+        self.ponder_thread.start()
+        return True
+
+    def stop_pondering(self) -> None:
+        """
+        Stop the background search and wait for it to leave the engine, its
+        nodes are kept for the figures of the next turn (the parser stops
+        the pondering as soon as a line arrives, before the turn starts)
+        """
+        if self.ponder_thread is None:
+            return
+        self.mcts.stop_requested = True
+        self.alphabeta.stop_requested = True
+        self.ponder_thread.join()
+        self.ponder_thread = None
+        self.pondered_nodes = self.ponder_nodes
+        self.mcts.stop_requested = False
+        self.alphabeta.stop_requested = False
+
+    def _ponder(self, bitboard: BitBoard, candidates: CandidateSet, evaluator: Evaluator, deadline: float) -> None:
+        """
+        Body of the pondering thread
+        The replies of the opponent are checked first: a winning reply leaves
+        nothing to search, and a four of ours to block has a single reply,
+        so the position after it (our next turn) is searched instead.
+        """
+        player: int = CONST.CELL_ENEMY
+        if self._five_cells(bitboard, candidates, player):
+            return
+        blocks: List[Tuple[int, int]] = self._five_cells(bitboard, candidates, CONST.CELL_PLAYER)
+        if len(blocks) > 1:
+            return
+        if blocks:
+            y, x = blocks[0]
+            bitboard.stones[player] |= 1 << bitboard.index(y, x)
+            candidates.place(y, x)
+            evaluator.set_cell(y, x, player)
+            player = CONST.CELL_PLAYER
+        if self.engine == CONST.ENGINE_ALPHABETA:
+            self.alphabeta.search(bitboard, candidates, evaluator, deadline, player=player)
+            self.ponder_nodes = self.alphabeta.nodes
+        else:
+            self.mcts.search(bitboard, candidates, deadline, evaluator=evaluator, player=player)
+            self.ponder_nodes = self.mcts.iterations
+
+    @staticmethod
+    def _five_cells(bitboard: BitBoard, candidates: CandidateSet, player: int) -> List[Tuple[int, int]]:
+        """
+        Return the candidate cells where player would make five
+        """
+        stones = bitboard.stones
+        cells: List[Tuple[int, int]] = []
+        for move in candidates.cells():
+            bit: int = 1 << bitboard.index(move[0], move[1])
+            stones[player] |= bit
+            if bitboard.has_five(player):
+                cells.append(move)
+            stones[player] &= ~bit
+        return cells
+
+    def _book_move(self, bitboard: BitBoard, hashes: Optional[List[int]] = None) -> Optional[Tuple[int, int]]:
+        """
+        Return the move of the opening book for the position, if it has one,
+        hashes are the keys of the eight images of the position when known
+        """
+        if not self.book.loaded:
+            return None
+        if self.symmetry.size != bitboard.size:
+            self.symmetry.create(bitboard.size)
+        if hashes is None:
+            key, transform = self.symmetry.canonical(bitboard.stones)
+        else:
+            key, transform = Symmetry.select(hashes)
+        move = self.book.lookup(key)
+        if move is None or move[0] >= bitboard.size or move[1] >= bitboard.size:
+            return None
+        move = self.symmetry.cell_from_canonical(move[0], move[1], transform)
+        if bitboard.get_cell(move[0], move[1]) != CONST.CELL_EMPTY:
+            return None
+        return move
+
+    def set_engine(self, engine: str) -> bool:
+        """
+        Select the engine used by the next turns, unknown names are refused
+        """
+        engine = engine.lower()
+        if engine not in CONST.ENGINES:
+            return False
+        self.stop_pondering()
+        if engine != self.engine:
+            self.engine = engine
+            self._apply_memory()
+        return True
+
+    def set_memory(self, max_memory: int, processes: Optional[int] = None) -> None:
+        """
+        Share max_memory (bytes, 0 for no limit) among the search structures
+        of the processes (the brain and its workers by default)
+        """
+        self.stop_pondering()
+        self.memory.max_memory = max(0, max_memory)
+        self.memory.processes = max(1, 1 + self.parallel.workers if processes is None else processes)
+        self._apply_memory()
+
+    def _apply_memory(self) -> None:
+        """
+        Give every growable structure its share of the memory budget for the
+        engine in use, the transposition tables are cleared when resized
+        """
+        memory: MemoryBudget = self.memory
+        self.table.resize(TranspositionTable.buckets_for(memory.share(self.engine, CONST.MEMORY_TABLE)))
+        if self.alphabeta.table is not None:
+            self.alphabeta.table.resize(
+                TranspositionTable.buckets_for(memory.share(self.engine, CONST.MEMORY_ALPHABETA_TABLE))
+            )
+        self.mcts.set_memory_limit(max(CONST.MEMORY_MINIMUM, memory.share(self.engine, CONST.MEMORY_TREE)))
+        set_line_cache_limit(memory.share(self.engine, CONST.MEMORY_LINES) // CONST.EVALUATOR_ENTRY_BYTES)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Return the estimated size in bytes of every growable structure
+        """
+        return {
+            CONST.MEMORY_TREE: self.mcts.memory(),
+            CONST.MEMORY_TABLE: self.table.memory(),
+            CONST.MEMORY_ALPHABETA_TABLE: self.alphabeta.table.memory() if self.alphabeta.table is not None else 0,
+            CONST.MEMORY_LINES: line_cache_memory()
+        }
+
+    def search_statistics(self) -> Dict[str, Union[str, int, float]]:
+        """
+        Return the figures of the last search: engine, nodes (playouts for the
+        Monte Carlo engines), time spent, nodes per second, alpha-beta depth
+        and visits inherited from the previous tree search
+        """
+        return {
+            "engine": self.engine,
+            "nodes": self.nodes,
+            "time": self.search_time,
+            "nodes_per_second": self.nodes / self.search_time if self.search_time > 0 else 0.0,
+            "depth": self.alphabeta.depth if self.engine == CONST.ENGINE_ALPHABETA else 0,
+            "reused_visits": self.mcts.reused_visits if self.engine == CONST.ENGINE_MCTS else 0
+        }
 
     def _generate_possible_moves(self, board: List[List[int]], radius: int = 2) -> List[Tuple[int, int]]:
         """
@@ -35,41 +278,60 @@ class AI:
 
     def _check_all_alignments(self, board: List[List[int]], player: int) -> bool:
         """
-        Check all alignments
+        Check all alignments of the board (full scan, used as the reference checker)
         """
-        rows: int = len(board[0])
         cols: int = len(board)
-        vertical: List[Tuple[int, int]] = []
-        horizontal: List[Tuple[int, int]] = []
-        diag_down: List[Tuple[int, int]] = []
-        diag_up: List[Tuple[int, int]] = []
+        rows: int = len(board[0])
 
         for y in range(cols):
             for x in range(rows):
-                if len(horizontal) == 0 or (y == horizontal[-1][0] and x == horizontal[-1][1] + 1 and board[y][x] == player):
-                    horizontal.append((y, x))
-                    if len(horizontal) == 5:
-                        return True
-                elif len(horizontal) != 0 and y == horizontal[-1][0] and x == horizontal[-1][1] + 1 and board[y][x] != player:
-                    horizontal.clear()
-                if len(vertical) == 0 or (y == vertical[-1][0] + 1 and x == vertical[-1][1] and board[y][x] == player):
-                    vertical.append((y, x))
-                    if len(vertical) == 5:
-                        return True
-                elif len(vertical) != 0 and y == vertical[-1][0] + 1 and x == vertical[-1][1] and board[y][x] != player:
-                    vertical.clear()
-                if len(diag_down) == 0 or (y == diag_down[-1][0] + 1 and x == diag_down[-1][1] + 1 and board[y][x] == player):
-                    diag_down.append((y, x))
-                    if len(diag_down) == 5:
-                        return True
-                elif len(diag_down) != 0 and y == diag_down[-1][0] + 1 and x == diag_down[-1][1] + 1 and board[y][x] != player:
-                    diag_down.clear()
-                if len(diag_up) == 0 or (y == diag_up[-1][0] - 1 and x == diag_up[-1][1] + 1 and board[y][x] == player):
-                    diag_up.append((y, x))
-                    if len(diag_up) == 5:
-                        return True
-                elif len(diag_up) != 0 and y == diag_up[-1][0] - 1 and x == diag_up[-1][1] + 1 and board[y][x] != player:
-                    diag_up.clear()
+                if board[y][x] != player:
+                    continue
+                for dy, dx in CONST.ALIGNMENT_DIRECTIONS:
+                    py = y - dy
+                    px = x - dx
+                    if 0 <= py < cols and 0 <= px < rows and board[py][px] == player:
+                        continue
+                    length: int = 1
+                    ny = y + dy
+                    nx = x + dx
+                    while 0 <= ny < cols and 0 <= nx < rows and board[ny][nx] == player:
+                        length += 1
+                        if length >= CONST.WIN_LENGTH:
+                            return True
+                        ny += dy
+                        nx += dx
+        return False
+
+    def _check_win_from_move(self, board: List[List[int]], y: int, x: int, player: int) -> bool:
+        """
+        Check if the stone placed at (y, x) completes an alignment.
+        Only the four lines going through the cell are walked.
+        """
+        cols: int = len(board)
+        rows: int = len(board[0])
+        reach: int = CONST.WIN_LENGTH - 1
+
+        for dy, dx in CONST.ALIGNMENT_DIRECTIONS:
+            length: int = 1
+            ny = y + dy
+            nx = x + dx
+            step: int = 0
+            while step < reach and 0 <= ny < cols and 0 <= nx < rows and board[ny][nx] == player:
+                length += 1
+                ny += dy
+                nx += dx
+                step += 1
+            ny = y - dy
+            nx = x - dx
+            step = 0
+            while step < reach and 0 <= ny < cols and 0 <= nx < rows and board[ny][nx] == player:
+                length += 1
+                ny -= dy
+                nx -= dx
+                step += 1
+            if length >= CONST.WIN_LENGTH:
+                return True
         return False
 
     def _simulate_random_game(self, board: List[List[int]], current_player: int, depth_total: int) -> int:
@@ -82,63 +344,339 @@ class AI:
         result: int = 0
 
         while depth < depth_total:
-            if move_stack and self._check_all_alignments(board, current_player):
-                if current_player == CONST.CELL_PLAYER :
-                    result = 1
-                else:
-                    result = -1
-                break
             if not moves:
-                result = 0
                 break
             move: Tuple[int, int] = random.choice(moves)
             board[move[0]][move[1]] = current_player
             move_stack.append(move)
             moves.remove(move)
-            current_player = 3 - current_player
             depth += 1
+            if self._check_win_from_move(board, move[0], move[1], current_player):
+                if current_player == CONST.CELL_PLAYER:
+                    result = 1
+                else:
+                    result = -1
+                break
+            current_player = 3 - current_player
         for y, x in reversed(move_stack):
             board[y][x] = CONST.CELL_EMPTY
-        if depth < depth_total:
-            return result
-        return 0
+        return result
+
+    def _generate_possible_moves_bitboard(self, bitboard: BitBoard, radius: int = 2) -> List[Tuple[int, int]]:
+        """
+        Generate possible moves around the stones using the bitboard masks
+        """
+        return bitboard.cells(bitboard.neighbours(radius))
 
-    def play_ai_turn(self, board: List[List[int]]) -> str:
+    def _simulate_random_game_bitboard(self, bitboard: BitBoard, current_player: int, depth_total: int, candidates: Optional[CandidateSet] = None) -> int:
         """
-        Play the ia turn using Monte Carlo algorithm
+        Simulate a random game with a limited depth directly on the bitboard
+        The moves are drawn from the candidate set when one is given,
+        the set itself is left untouched.
         """
-        start_time = time.time()
-        total_depth: int = 7
-        radius: int = 2
-        possible_ai_moves: List[Tuple[int, int]] = self._generate_possible_moves(board, radius)
-        scores: List[int] = [0] * len(possible_ai_moves)
-        simulations: List[int] = [0] * len(possible_ai_moves)
+        stones = bitboard.stones
+        moves: List[int]
+        if candidates is None:
+            stride: int = bitboard.stride
+            moves = [
+                1 << (y * stride + x) for y, x in bitboard.cells(bitboard.neighbours(2))
+            ]
+        else:
+            moves = [1 << index for index in candidates.moves]
+        move_stack: List[Tuple[int, int]] = []
+        depth: int = 0
         result: int = 0
-        ratio: float = -1.0
-        best_index: int = 0
-        best_ratio: float = -float('inf')
 
-        if not possible_ai_moves:
-            x: int = random.randint(0, len(board[0]))
-            y: int = random.randint(0, len(board))
-            return f"{x},{y}"
-        for idx, move in enumerate(possible_ai_moves):
-            if (time.time() - start_time) >= 4.8:
+        while depth < depth_total:
+            if not moves:
+                break
+            index: int = random.randrange(len(moves))
+            moves[index], moves[-1] = moves[-1], moves[index]
+            bit: int = moves.pop()
+            stones[current_player] |= bit
+            move_stack.append((current_player, bit))
+            depth += 1
+            if bitboard.has_five(current_player):
+                if current_player == CONST.CELL_PLAYER:
+                    result = 1
+                else:
+                    result = -1
                 break
-            for _ in range(CONST.MAX_SIMULATIONS):
-                if (time.time() - start_time) >= 4.8:
+            current_player = 3 - current_player
+        for player, bit in move_stack:
+            stones[player] &= ~bit
+        return result
+
+    def _simulate_root_move(self, bitboard: BitBoard, candidates: CandidateSet, move: Tuple[int, int]) -> int:
+        """
+        Play move for the AI, run one playout from there and take the move back
+        """
+        bit: int = 1 << bitboard.index(move[0], move[1])
+        bitboard.stones[CONST.CELL_PLAYER] |= bit
+        candidates.place(move[0], move[1])
+        result: int = self._simulate_random_game_bitboard(bitboard, CONST.CELL_ENEMY, CONST.PLAYOUT_DEPTH, candidates)
+        candidates.remove(move[0], move[1])
+        bitboard.stones[CONST.CELL_PLAYER] &= ~bit
+        return result
+
+    def _play_flat_monte_carlo(self, bitboard: BitBoard, candidates: CandidateSet, deadline: float) -> Tuple[int, int]:
+        """
+        Spread the root playouts with successive halving.
+        The budget (MAX_SIMULATIONS per candidate on average) is split in
+        equal rounds, every surviving candidate gets the same share of a round
+        (played round-robin so the deadline cuts them evenly) and the worst
+        half is dropped at the end of each round.
+        """
+        possible_ai_moves: List[Tuple[int, int]] = candidates.cells()
+        count: int = len(possible_ai_moves)
+        scores: List[int] = [0] * count
+        simulations: List[int] = [0] * count
+        alive: List[int] = list(range(count))
+        if count == 1:
+            return possible_ai_moves[0]
+        rounds: int = math.ceil(math.log2(count))
+        round_budget: int = count * CONST.MAX_SIMULATIONS // rounds
+        out_of_time: bool = False
+
+        while True:
+            for _ in range(max(1, round_budget // len(alive))):
+                for idx in alive:
+                    if time.time() >= deadline:
+                        out_of_time = True
+                        break
+                    scores[idx] += self._simulate_root_move(bitboard, candidates, possible_ai_moves[idx])
+                    simulations[idx] += 1
+                if out_of_time:
                     break
-                board[move[0]][move[1]] = CONST.CELL_PLAYER
-                result = self._simulate_random_game(board, CONST.CELL_ENEMY, total_depth)
-                scores[idx] += result
-                simulations[idx] += 1
-                board[move[0]][move[1]] = CONST.CELL_EMPTY
-            if simulations[idx] > 0:
-                ratio = scores[idx] / simulations[idx]
-            else:
-                ratio = 0
-            if ratio > best_ratio:
-                best_ratio = ratio
-                best_index = idx
-        best_move = possible_ai_moves[best_index]
-        return f"{best_move[1]},{best_move[0]}"
+            if out_of_time:
+                break
+            alive.sort(key=lambda idx: scores[idx] / simulations[idx], reverse=True)
+            alive = alive[:(len(alive) + 1) // 2]
+            if len(alive) == 1:
+                break
+        self.nodes = sum(simulations)
+        sampled: List[int] = [idx for idx in alive if simulations[idx] > 0]
+        if not sampled:
+            return possible_ai_moves[alive[0]]
+        best_index: int = max(sampled, key=lambda idx: scores[idx] / simulations[idx])
+        return possible_ai_moves[best_index]
+
+    def _play_batch_monte_carlo(self, bitboard: BitBoard, candidates: CandidateSet, deadline: float) -> Tuple[int, int]:
+        """
+        Run the root playouts by NumPy batches until the deadline, every
+        batch gives the same number of playouts to each candidate
+        """
+        board: List[List[int]] = bitboard.to_board()
+        possible_ai_moves: List[Tuple[int, int]] = candidates.cells()
+        count: int = len(possible_ai_moves)
+        scores: List[float] = [0.0] * count
+        simulations: List[int] = [0] * count
+        playouts_per_move: int = self.batch.batch_playouts(bitboard.size, count)
+
+        while time.time() < deadline:
+            batch_scores, batch_simulations = self.batch.run(board, possible_ai_moves, playouts_per_move)
+            for idx in range(count):
+                scores[idx] += float(batch_scores[idx])
+                simulations[idx] += int(batch_simulations[idx])
+        self.nodes = sum(simulations)
+        sampled: List[int] = [idx for idx in range(count) if simulations[idx] > 0]
+        if not sampled:
+            return possible_ai_moves[0]
+        best_index: int = max(sampled, key=lambda idx: scores[idx] / simulations[idx])
+        return possible_ai_moves[best_index]
+
+    def _search_mcts(self, bitboard: BitBoard, candidates: CandidateSet, deadline: float, evaluator: Optional[Evaluator] = None, key: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Run the tree search, on every worker process as well when they are started.
+        Each process grows its own tree from the position (root parallelism)
+        and the visits of the root moves are summed at the deadline.
+        """
+        if not self.parallel.active:
+            best: Optional[Tuple[int, int]] = self.mcts.search(bitboard, candidates, deadline, evaluator=evaluator, key=key)
+            self.nodes = self.mcts.iterations
+            return best if best is not None else candidates.cells()[0]
+        search_deadline: float = deadline - CONST.PARALLEL_MERGE_MARGIN
+        stones = bitboard.stones
+        tasks = self.parallel.submit(
+            _search_worker,
+            [
+                (
+                    bitboard.size, stones[CONST.CELL_PLAYER], stones[CONST.CELL_ENEMY],
+                    search_deadline, random.getrandbits(32),
+                    self.memory.max_memory, self.memory.processes
+                )
+                for _ in range(self.parallel.workers)
+            ]
+        )
+        self.mcts.search(bitboard, candidates, search_deadline, evaluator=evaluator, key=key)
+        statistics: List[RootStatistics] = [self.mcts.root_statistics()]
+        statistics.extend(self.parallel.collect(tasks, search_deadline))
+        merged: RootStatistics = merge_root_statistics(statistics)
+        self.nodes = sum(visits for visits, _ in merged.values())
+        if not merged:
+            return candidates.cells()[0]
+        best_move: int = max(merged, key=lambda move: merged[move][0])
+        return bitboard.coordinates(best_move)
+
+    def _search_alphabeta(self, bitboard: BitBoard, candidates: CandidateSet, deadline: float, evaluator: Evaluator, key: Optional[int] = None, hashes: Optional[List[int]] = None) -> Tuple[int, int]:
+        """
+        Run the iterative deepening alpha-beta search until the deadline
+        """
+        best: Optional[Tuple[int, int]] = self.alphabeta.search(bitboard, candidates, evaluator, deadline, key=key, hashes=hashes)
+        self.nodes = self.alphabeta.nodes
+        return best if best is not None else candidates.cells()[0]
+
+    def _position_criticality(self, bitboard: BitBoard, stones_count: int) -> float:
+        """
+        Tell how much thinking the position deserves compared with a quiet one
+        """
+        if stones_count < CONST.TIME_OPENING_STONES:
+            return CONST.TIME_OPENING_FACTOR
+        for player in (CONST.CELL_PLAYER, CONST.CELL_ENEMY):
+            if bitboard.has_alignment(player, CONST.TIME_THREAT_LENGTH):
+                return CONST.TIME_CRITICAL_FACTOR
+        return 1.0
+
+    def play_ai_turn(self, board: Union[List[List[int]], BitBoard], candidates: Optional[CandidateSet] = None, evaluator: Optional[Evaluator] = None, key: Optional[int] = None, hashes: Optional[List[int]] = None) -> str:
+        """
+        Play the ia turn using the selected engine (flat or batched Monte
+        Carlo, MCTS or alpha-beta)
+        The playouts run on a bitboard, a list based board is converted once.
+        The candidate set, the evaluator, the Zobrist key and the keys of the
+        eight images (see symmetry.py) of the game board are reused when they
+        are given. A position of the opening book is answered at once.
+        The thinking time is given by the time manager.
+        The figures of the turn are kept in turn_statistics (see turn_summary).
+        """
+        start: float = time.perf_counter()
+        table: Optional[TranspositionTable] = self.alphabeta.table if self.engine == CONST.ENGINE_ALPHABETA else self.table
+        lookups: int = table.lookups if table is not None else 0
+        hits: int = table.hits if table is not None else 0
+        self.turn_statistics = {
+            "engine": self.engine,
+            "source": CONST.TURN_SOURCE_SEARCH,
+            "ponder_nodes": 0,
+            "stones": 0,
+            "candidates": 0,
+            "budget": 0.0,
+            "setup_time": 0.0,
+            "win_check_time": 0.0
+        }
+        move: str = self._play_turn(board, candidates, evaluator, key, hashes)
+        statistics = self.turn_statistics
+        statistics.update(self.search_statistics())
+        statistics["turn_time"] = time.perf_counter() - start
+        lookups = table.lookups - lookups if table is not None else 0
+        statistics["table_hit_rate"] = (table.hits - hits) / lookups if lookups > 0 else 0.0
+        statistics["move"] = move
+        statistics["memory"] = sum(self.memory_usage().values())
+        return move
+
+    def turn_summary(self) -> str:
+        """
+        Return the figures of the last turn on one line (times in milliseconds)
+        """
+        statistics = self.turn_statistics
+        if not statistics:
+            return ""
+        return (
+            f"engine={statistics['engine']} source={statistics['source']} move={statistics['move']} "
+            f"stones={statistics['stones']} candidates={statistics['candidates']} "
+            f"nodes={statistics['nodes']} nps={statistics['nodes_per_second']:.0f} "
+            f"depth={statistics['depth']} reused={statistics['reused_visits']} "
+            f"ponder={statistics['ponder_nodes']} tt={statistics['table_hit_rate']:.1%} "
+            f"budget={1000 * statistics['budget']:.0f} setup={1000 * statistics['setup_time']:.2f} "
+            f"wincheck={1000 * statistics['win_check_time']:.2f} search={1000 * statistics['time']:.0f} "
+            f"turn={1000 * statistics['turn_time']:.0f} memory={statistics['memory'] / 1048576:.1f}MB"
+        )
+
+    def _play_turn(self, board: Union[List[List[int]], BitBoard], candidates: Optional[CandidateSet], evaluator: Optional[Evaluator], key: Optional[int] = None, hashes: Optional[List[int]] = None) -> str:
+        """
+        Body of play_ai_turn
+        """
+        statistics = self.turn_statistics
+        self.stop_pondering()
+        statistics["ponder_nodes"] = self.pondered_nodes
+        self.pondered_nodes = 0
+        self.nodes = 0
+        self.search_time = 0.0
+        setup_start: float = time.perf_counter()
+        if isinstance(board, BitBoard):
+            bitboard: BitBoard = board.copy()
+        else:
+            bitboard = BitBoard.from_board(board)
+        book_move: Optional[Tuple[int, int]] = self._book_move(bitboard, hashes)
+        if book_move is not None:
+            statistics["source"] = CONST.TURN_SOURCE_BOOK
+            return f"{book_move[0]},{book_move[1]}"
+        if candidates is None:
+            candidates = CandidateSet.from_board(bitboard.to_board())
+        else:
+            candidates = candidates.copy()
+        if evaluator is None:
+            evaluator = Evaluator.from_board(bitboard.to_board())
+        else:
+            evaluator = evaluator.copy()
+        stones_count: int = bitboard.count()
+        deadline: float = self.time_manager.deadline(
+            stones_count,
+            self._position_criticality(bitboard, stones_count)
+        )
+        possible_ai_moves: List[Tuple[int, int]] = candidates.cells()
+        win_check_start: float = time.perf_counter()
+        statistics["setup_time"] = win_check_start - setup_start
+        statistics["stones"] = stones_count
+        statistics["candidates"] = len(possible_ai_moves)
+        statistics["budget"] = deadline - time.time()
+
+        if not possible_ai_moves:
+            center: int = bitboard.size // 2
+            statistics["source"] = CONST.TURN_SOURCE_CENTER
+            return f"{center},{center}"
+        winning_moves: List[Tuple[int, int]] = self._five_cells(bitboard, candidates, CONST.CELL_PLAYER)
+        statistics["win_check_time"] = time.perf_counter() - win_check_start
+        if winning_moves:
+            statistics["source"] = CONST.TURN_SOURCE_WIN
+            return f"{winning_moves[0][0]},{winning_moves[0][1]}"
+        search_start: float = time.time()
+        if self.engine == CONST.ENGINE_MCTS:
+            best_move = self._search_mcts(bitboard, candidates, deadline, evaluator, key)
+        elif self.engine == CONST.ENGINE_ALPHABETA:
+            best_move = self._search_alphabeta(bitboard, candidates, deadline, evaluator, key, hashes)
+        elif self.engine == CONST.ENGINE_BATCH and self.batch.available:
+            best_move = self._play_batch_monte_carlo(bitboard, candidates, deadline)
+        else:
+            best_move = self._play_flat_monte_carlo(bitboard, candidates, deadline)
+        self.search_time = time.time() - search_start
+        return f"{best_move[0]},{best_move[1]}"
+
+
+# The AI of a worker process, kept between the turns with its transposition table
+_WORKER_AI: Optional[AI] = None
+
+
+def _init_worker() -> None:
+    """
+    Create the AI of a worker process when the process starts
+    """
+    global _WORKER_AI
+    _WORKER_AI = AI(CONST.ENGINE_MCTS, 0)
+
+
+def _search_worker(size: int, player_stones: int, enemy_stones: int, deadline: float, seed: int, max_memory: int = 0, processes: int = 1) -> RootStatistics:
+    """
+    Entry point of the worker processes: run an independent tree search on a
+    copy of the position, within its part of the memory budget, and return
+    its root statistics
+    """
+    random.seed(seed)
+    bitboard: BitBoard = BitBoard(size)
+    bitboard.stones[CONST.CELL_PLAYER] = player_stones
+    bitboard.stones[CONST.CELL_ENEMY] = enemy_stones
+    candidates: CandidateSet = CandidateSet.from_board(bitboard.to_board())
+    if _WORKER_AI is None:
+        _init_worker()
+    if (_WORKER_AI.memory.max_memory, _WORKER_AI.memory.processes) != (max_memory, processes):
+        _WORKER_AI.set_memory(max_memory, processes)
+    _WORKER_AI.mcts.search(bitboard, candidates, deadline, evaluator=Evaluator.from_board(bitboard.to_board()))
+    return _WORKER_AI.mcts.root_statistics()
@@ -0,0 +1,256 @@
+"""
+This file contains the alpha-beta engine (negamax with iterative deepening) of the AI.
+
+The leaves are scored by the pattern evaluator. The moves of a node are the
+candidate moves ordered by how much they build for the player and how much
+they break for the opponent, only the best ALPHABETA_WIDTH of them are
+searched. A node where the opponent threatens five only searches the cells
+blocking it. The best move of every searched position is kept in a
+transposition table and tried first by the next iteration. When a symmetry
+is given, the table is keyed by canonical keys and its moves are stored in
+the canonical frame, so the symmetric images of a position share an entry.
+The search is anytime: the clock is read at every node and between the
+candidates being ordered, and the move returned is the best move found
+before the deadline.
+"""
+
+import time
+from typing import List, Optional, Tuple
+from . import constants as CONST
+from .bitboard import BitBoard
+from .candidates import CandidateSet
+from .evaluator import Evaluator
+from .symmetry import Symmetry
+from .zobrist import TranspositionTable, Zobrist
+
+
+class AlphaBeta:
+    """
+    The class in charge of the depth first search of the positions.
+    Moves are bitboard indices, scores are given from the point of view of
+    the player to move.
+    """
+
+    def __init__(self, width: int = CONST.ALPHABETA_WIDTH, max_depth: int = CONST.ALPHABETA_MAX_DEPTH, table: Optional[TranspositionTable] = None, symmetry: Optional[Symmetry] = None):
+        self.width: int = width
+        self.max_depth: int = max_depth
+        self.table: Optional[TranspositionTable] = table
+        self.symmetry: Optional[Symmetry] = symmetry
+        self.hashes: List[int] = [0] * CONST.SYMMETRIES
+        self.zobrist: Zobrist = Zobrist()
+        self.nodes: int = 0
+        self.depth: int = 0
+        self.score: int = 0
+        self.stopped: bool = False
+        self.stop_requested: bool = False
+        self.deadline: float = 0.0
+        self.key: int = 0
+        self.bitboard: BitBoard = BitBoard()
+        self.candidates: CandidateSet = CandidateSet()
+        self.evaluator: Evaluator = Evaluator()
+
+    def _play(self, move: int, player: int) -> None:
+        """
+        Put a stone of player on the cell of index move.
+        """
+        self.bitboard.stones[player] |= 1 << move
+        self.candidates.place(*divmod(move, self.candidates.stride))
+        self.evaluator.set_index(move, player)
+        self.key ^= self.zobrist.keys[player][move]
+        if self.symmetry is not None:
+            self.symmetry.toggle(self.hashes, move, player)
+
+    def _undo(self, move: int, player: int) -> None:
+        """
+        Remove the stone of player from the cell of index move.
+        """
+        self.bitboard.stones[player] &= ~(1 << move)
+        self.candidates.remove(*divmod(move, self.candidates.stride))
+        self.evaluator.set_index(move, CONST.CELL_EMPTY)
+        self.key ^= self.zobrist.keys[player][move]
+        if self.symmetry is not None:
+            self.symmetry.toggle(self.hashes, move, player)
+
+    def _probe_move(self) -> int:
+        """
+        Return the best move stored in the table for the position, -1 if none.
+        """
+        if self.symmetry is None:
+            entry = self.table.probe(self.key)
+            return -1 if entry is None else entry[2]
+        key, transform = Symmetry.select(self.hashes)
+        entry = self.table.probe(key)
+        return -1 if entry is None else self.symmetry.from_canonical(entry[2], transform)
+
+    def _store_move(self, move: int, score: int, depth: int) -> None:
+        """
+        Store the best move and score of the position in the table.
+        """
+        if self.symmetry is None:
+            self.table.store(self.key, 0, score, move, depth)
+            return
+        key, transform = Symmetry.select(self.hashes)
+        self.table.store(key, 0, score, self.symmetry.to_canonical(move, transform), depth)
+
+    def _out_of_time(self) -> bool:
+        """
+        Tell if the search has to stop (deadline passed or stop requested).
+        """
+        if not self.stopped and (self.stop_requested or time.time() >= self.deadline):
+            self.stopped = True
+        return self.stopped
+
+    def _five_points(self, player: int) -> List[int]:
+        """
+        Return the candidate cells where player would make five.
+        """
+        stones = self.bitboard.stones
+        points: List[int] = []
+        for move in self.candidates.moves:
+            stones[player] |= 1 << move
+            if self.bitboard.has_five(player):
+                points.append(move)
+            stones[player] &= ~(1 << move)
+        return points
+
+    def _ordered_moves(self, player: int, width: int) -> List[int]:
+        """
+        Return the moves worth searching for player, the best ones first.
+        A move is worth the score it gives to player plus the score it takes
+        from the opponent when the opponent would play there.
+        When the search has to stop, only the moves scored so far are given.
+        """
+        opponent: int = 3 - player
+        evaluator: Evaluator = self.evaluator
+        if evaluator.has_four(opponent):
+            return self._five_points(opponent)
+        totals: List[int] = evaluator.totals
+        base_player: int = totals[player]
+        base_opponent: int = totals[opponent]
+        scored: List[Tuple[int, int]] = []
+        for move in self.candidates.moves:
+            if self._out_of_time():
+                break
+            evaluator.set_index(move, player)
+            gain: int = totals[player] - base_player
+            evaluator.set_index(move, opponent)
+            gain += totals[opponent] - base_opponent
+            evaluator.set_index(move, CONST.CELL_EMPTY)
+            scored.append((gain, move))
+        scored.sort(reverse=True)
+        moves: List[int] = [move for _, move in scored[:width]]
+        if self.table is not None:
+            best: int = self._probe_move()
+            if best in moves:
+                moves.remove(best)
+                moves.insert(0, best)
+        return moves
+
+    def _negamax(self, depth: int, alpha: int, beta: int, player: int, ply: int) -> int:
+        """
+        Return the score of the position for player, searched depth moves deep.
+        """
+        self.nodes += 1
+        if self._out_of_time():
+            return 0
+        evaluator: Evaluator = self.evaluator
+        opponent: int = 3 - player
+        if evaluator.count(opponent, CONST.SHAPE_FIVE) > 0:
+            return ply - CONST.ALPHABETA_WIN
+        if evaluator.has_four(player):
+            return CONST.ALPHABETA_WIN - ply - 1
+        if depth == 0:
+            return evaluator.evaluate(player)
+        moves: List[int] = self._ordered_moves(player, self.width)
+        if not moves:
+            return 0
+        best_score: int = -CONST.ALPHABETA_INFINITY
+        best_move: int = moves[0]
+        for move in moves:
+            self._play(move, player)
+            score: int = -self._negamax(depth - 1, -beta, -alpha, opponent, ply + 1)
+            self._undo(move, player)
+            if self.stopped:
+                return 0
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+        if self.table is not None:
+            self._store_move(best_move, best_score, depth)
+        return best_score
+
+    def _search_root(self, moves: List[int], depth: int, player: int) -> Tuple[int, int, List[int]]:
+        """
+        Search every root move depth moves deep and return the best move,
+        its score and the root moves sorted by score for the next iteration.
+        When the search stops, the best move is the best of the root moves
+        searched so far (the first one, the best of the previous iteration,
+        when none was).
+        """
+        alpha: int = -CONST.ALPHABETA_INFINITY
+        scored: List[Tuple[int, int]] = []
+        for move in moves:
+            self._play(move, player)
+            score: int = -self._negamax(depth - 1, -CONST.ALPHABETA_INFINITY, -alpha, 3 - player, 1)
+            self._undo(move, player)
+            if self.stopped:
+                break
+            scored.append((score, move))
+            if score > alpha:
+                alpha = score
+        ordered: List[int] = [move for _, move in sorted(scored, key=lambda item: item[0], reverse=True)]
+        ordered.extend(move for move in moves if move not in ordered)
+        if not scored:
+            return moves[0], alpha, ordered
+        best_score, best_move = max(scored, key=lambda item: item[0])
+        return best_move, best_score, ordered
+
+    def search(self, bitboard: BitBoard, candidates: CandidateSet, evaluator: Evaluator, deadline: float, max_depth: Optional[int] = None, player: int = CONST.CELL_PLAYER, key: Optional[int] = None, hashes: Optional[List[int]] = None) -> Optional[Tuple[int, int]]:
+        """
+        Deepen the search of the position one move at a time until the
+        deadline (time.time() based), max_depth or until stop_requested is
+        set (from another thread) and return the best move found for player,
+        the player to move. key is the Zobrist key of the position and hashes
+        the keys of its eight images when the caller keeps them, they are
+        computed from the stones otherwise.
+        The position structures are restored before returning.
+        """
+        self.bitboard = bitboard
+        self.candidates = candidates
+        self.evaluator = evaluator
+        self.deadline = deadline
+        self.nodes = 0
+        self.depth = 0
+        self.score = 0
+        self.stopped = False
+        if self.zobrist.size != bitboard.size:
+            self.zobrist.create(bitboard.size)
+        self.key = self.zobrist.hash_stones(bitboard.stones) if key is None else key
+        if self.symmetry is not None:
+            if self.symmetry.size != bitboard.size:
+                self.symmetry.create(bitboard.size)
+            self.hashes = self.symmetry.hashes(bitboard.stones) if hashes is None else hashes[:]
+        moves: List[int] = self._ordered_moves(player, CONST.ALPHABETA_ROOT_WIDTH)
+        if not moves:
+            if self.stopped and candidates.moves:
+                return divmod(candidates.moves[0], candidates.stride)
+            return None
+        best_move: int = moves[0]
+        if len(moves) == 1:
+            return divmod(best_move, candidates.stride)
+        limit: int = self.max_depth if max_depth is None else max_depth
+        for depth in range(1, limit + 1):
+            if self._out_of_time():
+                break
+            move, score, ordered = self._search_root(moves, depth, player)
+            if self.stopped:
+                best_move = move
+                break
+            best_move, self.score, self.depth, moves = move, score, depth, ordered
+            if abs(score) >= CONST.ALPHABETA_WIN - limit:
+                break
+        return divmod(best_move, candidates.stride)
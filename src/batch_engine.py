@@ -0,0 +1,136 @@
+"""
+This file contains the batched playout engine of the AI.
+
+Thousands of random playouts are run at once on a stack of boards of shape
+(N, size, size): the random moves are drawn for every board in one
+operation from the candidate masks, and the win check compares the cells of
+the four lines through the last stones with shifted coordinates.
+Like the python playouts, a playout draws its moves from the candidates of
+the position after the AI move, so the masks only span those cells.
+NumPy is optional, the engine reports itself as unavailable without it.
+"""
+
+from typing import List, Tuple, Union
+from . import constants as CONST
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+
+class BatchPlayouts:
+    """
+    The class in charge of running the random playouts by batches.
+    """
+
+    def __init__(self, seed: Union[int, None] = None, depth: int = CONST.PLAYOUT_DEPTH, radius: int = CONST.CANDIDATE_RADIUS):
+        self.depth: int = depth
+        self.radius: int = radius
+        self.rng = None
+        if np is not None:
+            self.rng = np.random.default_rng(seed)
+        self.offsets: List[Tuple[int, int]] = [
+            (dy, dx)
+            for dy in range(-radius, radius + 1)
+            for dx in range(-radius, radius + 1)
+            if dy != 0 or dx != 0
+        ]
+
+    @property
+    def available(self) -> bool:
+        """
+        Tell if NumPy could be imported.
+        """
+        return np is not None
+
+    def batch_playouts(self, size: int, candidates: int) -> int:
+        """
+        Number of playouts per candidate so that a batch stays within BATCH_CELLS.
+        """
+        boards: int = max(1, CONST.BATCH_CELLS // (size * size))
+        return max(1, boards // max(1, candidates))
+
+    def _near_stones(self, occupied: "np.ndarray") -> "np.ndarray":
+        """
+        Mark the cells within radius of a stone, on one board or on a stack of boards.
+        """
+        size: int = occupied.shape[-1]
+        near = occupied.copy()
+        for dy, dx in self.offsets:
+            near[..., max(0, dy):size + min(0, dy), max(0, dx):size + min(0, dx)] |= \
+                occupied[..., max(0, -dy):size + min(0, -dy), max(0, -dx):size + min(0, -dx)]
+        return near
+
+    def _wins(self, stack: "np.ndarray", positions: "np.ndarray", width: int, player: int) -> "np.ndarray":
+        """
+        Tell, for each given stone (flat position in the padded stack of
+        boards), if it makes a five with the stones of its four lines.
+        The padding is wider than a line so no bound check is needed.
+        """
+        won = np.zeros(positions.shape[0], dtype=bool)
+        for dy, dx in CONST.ALIGNMENT_DIRECTIONS:
+            step_offset: int = dy * width + dx
+            length = np.ones(positions.shape[0], dtype=np.int8)
+            for sign in (1, -1):
+                aligned = np.ones(positions.shape[0], dtype=bool)
+                for step in range(1, CONST.WIN_LENGTH):
+                    aligned &= stack[positions + sign * step * step_offset] == player
+                    length += aligned
+            won |= length >= CONST.WIN_LENGTH
+        return won
+
+    def run(self, board: List[List[int]], moves: List[Tuple[int, int]], playouts_per_move: int) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Play playouts_per_move random games after each of the AI moves and
+        return the summed results (+1 AI win, -1 enemy win, 0 otherwise) and
+        the number of playouts of every move.
+        """
+        size: int = len(board)
+        count: int = len(moves)
+        roots = np.repeat(np.arange(count), playouts_per_move)
+        total: int = roots.shape[0]
+        everyone = np.arange(total)
+        root_moves = np.array(moves, dtype=np.intp).reshape(count, 2)
+        base = np.array(board, dtype=np.int8)
+        empty = base == CONST.CELL_EMPTY
+        base_candidates = self._near_stones(~empty) & empty
+        root_area = np.zeros((count, size, size), dtype=bool)
+        root_area[np.arange(count), root_moves[:, 0], root_moves[:, 1]] = True
+        root_area = self._near_stones(root_area) & empty
+        root_area[np.arange(count), root_moves[:, 0], root_moves[:, 1]] = False
+        # The playouts only ever draw from these cells, the columns of the masks
+        columns = np.flatnonzero(base_candidates | root_area.any(axis=0))
+        root_masks = (root_area.reshape(count, -1) | base_candidates.reshape(-1))[:, columns]
+        root_masks[np.arange(count), np.searchsorted(columns, root_moves[:, 0] * size + root_moves[:, 1])] = False
+        mask = root_masks[roots]
+        padding: int = CONST.WIN_LENGTH - 1
+        width: int = size + 2 * padding
+        boards = np.zeros((total, width, width), dtype=np.int8)
+        boards[:, padding:padding + size, padding:padding + size] = base
+        stack = boards.reshape(-1)
+        board_starts = everyone * (width * width) + padding * width + padding
+        stack[board_starts + root_moves[roots, 0] * width + root_moves[roots, 1]] = CONST.CELL_PLAYER
+        results = np.zeros(total, dtype=np.int8)
+        active = np.ones(total, dtype=bool)
+        player: int = CONST.CELL_ENEMY
+
+        for _ in range(self.depth):
+            active &= mask.any(axis=1)
+            rows = np.nonzero(active)[0]
+            if rows.shape[0] == 0:
+                break
+            keys = self.rng.random((rows.shape[0], columns.shape[0]), dtype=np.float32)
+            keys *= mask[rows]
+            picked = keys.argmax(axis=1)
+            cells = columns[picked]
+            positions = board_starts[rows] + (cells // size) * width + cells % size
+            stack[positions] = player
+            mask[rows, picked] = False
+            won = self._wins(stack, positions, width, player)
+            results[rows[won]] = 1 if player == CONST.CELL_PLAYER else -1
+            active[rows[won]] = False
+            player = 3 - player
+        scores = np.bincount(roots, weights=results, minlength=count)
+        simulations = np.bincount(roots, minlength=count)
+        return scores, simulations
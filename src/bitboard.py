@@ -0,0 +1,181 @@
+"""
+This file contains the bitboard representation of the game board.
+
+Every player owns a python big integer in which the bit of index
+(y * stride + x) is set when the player has a stone on the cell (y, x).
+A padding column is kept at the end of each row (stride = size + 1) so that
+shifting a row never spills onto the next one: the padding bits are always 0.
+"""
+
+from typing import Dict, List, Tuple
+from . import constants as CONST
+
+
+class BitBoard:
+    """
+    The class in charge of storing the board as one bitboard per player.
+    """
+
+    def __init__(self, size: int = 0):
+        self.size: int = 0
+        self.stride: int = 1
+        self.valid_mask: int = 0
+        self.shifts: Tuple[int, ...] = ()
+        self.stones: Dict[int, int] = {
+            CONST.CELL_PLAYER: 0,
+            CONST.CELL_ENEMY: 0
+        }
+        self.create(size)
+
+    def create(self, size: int = 0) -> None:
+        """
+        Create an empty bitboard and precompute the masks for the given size.
+        """
+        self.size = size
+        self.stride = size + 1
+        row_mask: int = (1 << size) - 1
+        self.valid_mask = 0
+        for y in range(size):
+            self.valid_mask |= row_mask << (y * self.stride)
+        self.shifts = tuple(
+            dy * self.stride + dx for dy, dx in CONST.ALIGNMENT_DIRECTIONS
+        )
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Remove every stone from the bitboard.
+        """
+        self.stones[CONST.CELL_PLAYER] = 0
+        self.stones[CONST.CELL_ENEMY] = 0
+
+    @classmethod
+    def from_board(cls, board: List[List[int]]) -> "BitBoard":
+        """
+        Build a bitboard from a list based board.
+        """
+        bitboard = cls(len(board))
+        for y, row in enumerate(board):
+            for x, cell in enumerate(row):
+                if cell in bitboard.stones:
+                    bitboard.stones[cell] |= 1 << (y * bitboard.stride + x)
+        return bitboard
+
+    def copy(self) -> "BitBoard":
+        """
+        Return an independent copy of the bitboard.
+        """
+        other = BitBoard.__new__(BitBoard)
+        other.size = self.size
+        other.stride = self.stride
+        other.valid_mask = self.valid_mask
+        other.shifts = self.shifts
+        other.stones = dict(self.stones)
+        return other
+
+    def index(self, y: int, x: int) -> int:
+        """
+        Convert the coordinates of a cell to its bit index.
+        """
+        return y * self.stride + x
+
+    def coordinates(self, index: int) -> Tuple[int, int]:
+        """
+        Convert a bit index back to the (y, x) coordinates of the cell.
+        """
+        return divmod(index, self.stride)
+
+    def get_cell(self, y: int, x: int) -> int:
+        """
+        Return the content of the cell (y, x).
+        """
+        bit: int = 1 << (y * self.stride + x)
+        if self.stones[CONST.CELL_PLAYER] & bit:
+            return CONST.CELL_PLAYER
+        if self.stones[CONST.CELL_ENEMY] & bit:
+            return CONST.CELL_ENEMY
+        return CONST.CELL_EMPTY
+
+    def set_cell(self, y: int, x: int, value: int) -> None:
+        """
+        Set the content of the cell (y, x), CELL_EMPTY removes the stone.
+        """
+        bit: int = 1 << (y * self.stride + x)
+        self.stones[CONST.CELL_PLAYER] &= ~bit
+        self.stones[CONST.CELL_ENEMY] &= ~bit
+        if value in self.stones:
+            self.stones[value] |= bit
+
+    def count(self) -> int:
+        """
+        Return the number of stones on the board.
+        """
+        return bin(self.occupied()).count("1")
+
+    def occupied(self) -> int:
+        """
+        Return the mask of every occupied cell.
+        """
+        return self.stones[CONST.CELL_PLAYER] | self.stones[CONST.CELL_ENEMY]
+
+    def empty(self) -> int:
+        """
+        Return the mask of every empty cell.
+        """
+        return self.valid_mask & ~self.occupied()
+
+    def has_alignment(self, player: int, length: int) -> bool:
+        """
+        Check if the player has length aligned stones.
+        """
+        stones: int = self.stones[player]
+        for shift in self.shifts:
+            line: int = stones
+            for _ in range(length - 1):
+                line &= line >> shift
+                if not line:
+                    break
+            if line:
+                return True
+        return False
+
+    def has_five(self, player: int) -> bool:
+        """
+        Check if the player has an alignment of WIN_LENGTH stones.
+        """
+        return self.has_alignment(player, CONST.WIN_LENGTH)
+
+    def neighbours(self, radius: int = 2) -> int:
+        """
+        Return the mask of the empty cells within radius of any stone.
+        """
+        area: int = self.occupied()
+        if not area:
+            return 0
+        valid: int = self.valid_mask
+        for _ in range(radius):
+            area = (area | (area << 1) | (area >> 1)) & valid
+        for _ in range(radius):
+            area = (area | (area << self.stride) | (area >> self.stride)) & valid
+        return area & ~self.occupied()
+
+    def cells(self, mask: int) -> List[Tuple[int, int]]:
+        """
+        Convert a mask to the list of the (y, x) coordinates it contains.
+        """
+        result: List[Tuple[int, int]] = []
+        stride: int = self.stride
+        while mask:
+            low: int = mask & -mask
+            result.append(divmod(low.bit_length() - 1, stride))
+            mask ^= low
+        return result
+
+    def to_board(self) -> List[List[int]]:
+        """
+        Convert the bitboard back to a list based board.
+        """
+        return [
+            [self.get_cell(y, x) for x in range(self.size)]
+            for y in range(self.size)
+        ]
@@ -0,0 +1,171 @@
+"""
+This file contains the incrementally maintained set of candidate moves.
+
+A candidate is an empty cell that has at least one stone within radius.
+Each cell keeps the number of stones around it, so placing or removing a
+stone only touches the cells of its neighbourhood instead of rescanning the
+whole board. Cells are indexed like the bitboard (y * (size + 1) + x) so that
+a candidate index can be turned into a bitboard bit with (1 << index).
+"""
+
+from typing import Iterable, List, Tuple
+from . import constants as CONST
+
+
+class CandidateSet:
+    """
+    The class in charge of tracking the empty cells close to the stones.
+    """
+
+    def __init__(self, size: int = 0, radius: int = CONST.CANDIDATE_RADIUS):
+        self.size: int = 0
+        self.stride: int = 1
+        self.radius: int = radius
+        self.neighbours: List[Tuple[int, ...]] = []
+        self.counts: List[int] = []
+        self.occupied: List[bool] = []
+        self.position: List[int] = []
+        self.moves: List[int] = []
+        self.create(size)
+
+    def create(self, size: int = 0) -> None:
+        """
+        Create an empty set and precompute the neighbourhood of every cell.
+        """
+        self.size = size
+        self.stride = size + 1
+        radius: int = self.radius
+        self.neighbours = [() for _ in range(size * self.stride)]
+        for y in range(size):
+            for x in range(size):
+                around: List[int] = []
+                for ny in range(max(0, y - radius), min(size, y + radius + 1)):
+                    for nx in range(max(0, x - radius), min(size, x + radius + 1)):
+                        if ny != y or nx != x:
+                            around.append(ny * self.stride + nx)
+                self.neighbours[y * self.stride + x] = tuple(around)
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Forget every stone.
+        """
+        length: int = self.size * self.stride
+        self.counts = [0] * length
+        self.occupied = [False] * length
+        self.position = [-1] * length
+        self.moves = []
+
+    def load(self, stones: Iterable[int]) -> None:
+        """
+        Replace the content of the set by the stones of the given indices,
+        counting the neighbourhoods first and listing the candidates once.
+        """
+        self.clear()
+        counts = self.counts
+        occupied = self.occupied
+        neighbours = self.neighbours
+        for index in stones:
+            if occupied[index]:
+                continue
+            occupied[index] = True
+            for around in neighbours[index]:
+                counts[around] += 1
+        self.moves = [
+            index for index, count in enumerate(counts) if count and not occupied[index]
+        ]
+        for position, index in enumerate(self.moves):
+            self.position[index] = position
+
+    @classmethod
+    def from_board(cls, board: List[List[int]], radius: int = CONST.CANDIDATE_RADIUS) -> "CandidateSet":
+        """
+        Build the candidate set of a list based board.
+        """
+        candidates = cls(len(board), radius)
+        for y, row in enumerate(board):
+            for x, cell in enumerate(row):
+                if cell != CONST.CELL_EMPTY:
+                    candidates.place(y, x)
+        return candidates
+
+    def copy(self) -> "CandidateSet":
+        """
+        Return an independent copy (the neighbourhood table is shared).
+        """
+        other = CandidateSet.__new__(CandidateSet)
+        other.size = self.size
+        other.stride = self.stride
+        other.radius = self.radius
+        other.neighbours = self.neighbours
+        other.counts = self.counts[:]
+        other.occupied = self.occupied[:]
+        other.position = self.position[:]
+        other.moves = self.moves[:]
+        return other
+
+    def _add(self, index: int) -> None:
+        """
+        Add a cell to the candidate list.
+        """
+        if self.position[index] == -1:
+            self.position[index] = len(self.moves)
+            self.moves.append(index)
+
+    def _discard(self, index: int) -> None:
+        """
+        Remove a cell from the candidate list by swapping it with the last one.
+        """
+        position: int = self.position[index]
+        if position == -1:
+            return
+        last: int = self.moves.pop()
+        if last != index:
+            self.moves[position] = last
+            self.position[last] = position
+        self.position[index] = -1
+
+    def place(self, y: int, x: int) -> None:
+        """
+        Register a stone on the cell (y, x).
+        """
+        index: int = y * self.stride + x
+        if self.occupied[index]:
+            return
+        self.occupied[index] = True
+        self._discard(index)
+        counts = self.counts
+        occupied = self.occupied
+        for around in self.neighbours[index]:
+            counts[around] += 1
+            if counts[around] == 1 and not occupied[around]:
+                self._add(around)
+
+    def remove(self, y: int, x: int) -> None:
+        """
+        Unregister the stone of the cell (y, x).
+        """
+        index: int = y * self.stride + x
+        if not self.occupied[index]:
+            return
+        self.occupied[index] = False
+        counts = self.counts
+        for around in self.neighbours[index]:
+            counts[around] -= 1
+            if counts[around] == 0:
+                self._discard(around)
+        if counts[index] > 0:
+            self._add(index)
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def __contains__(self, cell: Tuple[int, int]) -> bool:
+        return self.position[cell[0] * self.stride + cell[1]] != -1
+
+    def cells(self) -> List[Tuple[int, int]]:
+        """
+        Return the candidates as (y, x) coordinates.
+        """
+        stride: int = self.stride
+        return [divmod(index, stride) for index in self.moves]
@@ -25,6 +25,15 @@ CMD_SWAP2BOARD = "SWAP2BOARD"
 # Special case
 CMD_INFO = "INFO"
 
+# INFO keys
+INFO_TIMEOUT_TURN = "timeout_turn"
+INFO_TIMEOUT_MATCH = "timeout_match"
+INFO_TIME_LEFT = "time_left"
+INFO_ENGINE = "engine"
+INFO_PONDER = "ponder"
+INFO_FOLDER = "folder"
+INFO_MAX_MEMORY = "max_memory"
+
 COMMANDS = [
     CMD_START,
     CMD_TURN,
@@ -40,6 +49,9 @@ COMMANDS = [
     CMD_SWAP2BOARD
 ]
 
+# Commands starting a turn of the AI (the time of the turn starts with them)
+TIMED_COMMANDS = (CMD_BEGIN, CMD_TURN, CMD_BOARD)
+
 CELL_EMPTY = 0
 CELL_PLAYER = 1
 CELL_ENEMY = 2
@@ -52,7 +64,225 @@ BOARD_EQUIVALENCE = {
 
 MAX_SIMULATIONS = 50
 
+# Number of random moves played by a playout
+PLAYOUT_DEPTH = 7
+
+# Time management (limits in milliseconds, durations in seconds)
+DEFAULT_TIMEOUT_TURN = 5000
+DEFAULT_TIMEOUT_MATCH = 0
+TIME_LEFT_UNLIMITED = 2147483647
+# Part of a limit kept for the process and I/O overhead
+TIME_MARGIN_MIN = 0.15
+TIME_MARGIN_RATIO = 0.04
+# Thinking time when the manager asks to play as fast as possible
+TIME_FAST_MOVE = 0.05
+# Guess of the number of moves left, used to share the match time
+TIME_EXPECTED_MOVES = 40
+TIME_MIN_MOVES_TO_GO = 10
+# Largest part of the match time a single move may use
+TIME_MAX_SHARE = 0.3
+# Criticality of a position: opening (few stones), quiet, or with a threat
+TIME_OPENING_STONES = 4
+TIME_OPENING_FACTOR = 0.3
+TIME_THREAT_LENGTH = 3
+TIME_CRITICAL_FACTOR = 1.5
+
+# Search engines available behind AI.play_ai_turn
+ENGINE_FLAT = "flat"
+ENGINE_MCTS = "mcts"
+ENGINE_BATCH = "batch"
+ENGINE_ALPHABETA = "alphabeta"
+
+ENGINES = [
+    ENGINE_FLAT,
+    ENGINE_MCTS,
+    ENGINE_BATCH,
+    ENGINE_ALPHABETA
+]
+
+DEFAULT_ENGINE = ENGINE_MCTS
+ENV_ENGINE = "PBRAIN_ENGINE"
+
+# Root parallel search: number of worker processes (0 runs the search in
+# the brain process only), the environment variable overriding it and the
+# time kept at the end of the turn to gather the results of the workers
+DEFAULT_WORKERS = 0
+ENV_WORKERS = "PBRAIN_WORKERS"
+PARALLEL_MERGE_MARGIN = 0.05
+
+# Pondering: search the position during the turn of the opponent (off by
+# default, the environment variable or "INFO ponder 1" enable it) for at
+# most PONDER_TURNS times the time of a turn
+DEFAULT_PONDER = False
+ENV_PONDER = "PBRAIN_PONDER"
+PONDER_TURNS = 2
+
+# Per turn instrumentation: where the move of a turn came from, and the
+# trace of the turns ("INFO trace <mode>" or the environment variable):
+# off, a MESSAGE or DEBUG line before every move, or a JSONL file in the
+# INFO folder (the temporary folder without one)
+TURN_SOURCE_SEARCH = "search"
+TURN_SOURCE_BOOK = "book"
+TURN_SOURCE_WIN = "win"
+TURN_SOURCE_CENTER = "center"
+INFO_TRACE = "trace"
+ENV_TRACE = "PBRAIN_TRACE"
+TRACE_OFF = "off"
+TRACE_MESSAGE = "message"
+TRACE_DEBUG = "debug"
+TRACE_FILE = "file"
+TRACE_MODES = (TRACE_OFF, TRACE_MESSAGE, TRACE_DEBUG, TRACE_FILE)
+TRACE_FILE_NAME = "pbrain-gomoku-ai.trace.jsonl"
+
+# Profiling of the turns ("INFO profile <mode>" or the environment variable):
+# off, cProfile (.pstats and collapsed stacks) or a sampling profiler reading
+# the stack of the playing thread every PROFILE_INTERVAL seconds (collapsed
+# stacks), the files are written in the temporary folder
+INFO_PROFILE = "profile"
+ENV_PROFILE = "PBRAIN_PROFILE"
+PROFILE_OFF = "off"
+PROFILE_CPROFILE = "cprofile"
+PROFILE_SAMPLE = "sample"
+PROFILE_MODES = (PROFILE_OFF, PROFILE_CPROFILE, PROFILE_SAMPLE)
+PROFILE_INTERVAL = 0.001
+PROFILE_FILE_PREFIX = "pbrain-gomoku-ai.turn"
+PROFILE_PSTATS = ".pstats"
+PROFILE_COLLAPSED = ".collapsed"
+
+# Opening book: file of the INFO folder, its format and the number of
+# stones up to which the book building tool records the moves
+OPENING_BOOK_FILE = "pbrain-gomoku-ai.book"
+OPENING_BOOK_MAGIC = b"GMKB"
+OPENING_BOOK_VERSION = 2
+OPENING_BOOK_STONES = 8
+
+# Batched playouts (NumPy): number of board cells processed by a batch
+BATCH_CELLS = 1600000
+
+# Zobrist hashing: seed of the random keys (the same keys in every process)
+ZOBRIST_SEED = 0x5EED
+
+# Symmetries of a square board (rotations and reflections), the canonical key
+# of a position is the smallest key of its images
+SYMMETRIES = 8
+
+# Transposition table: number of buckets (two entries each) and the largest
+# number of visits a stored result brings to a new node of the tree search
+TT_BUCKETS = 1 << 16
+TT_MIN_BUCKETS = 1 << 8
+TT_MAX_PRIOR_VISITS = 32
+
+# Shapes recognised by the evaluator on every line, from the strongest one
+SHAPE_FIVE = 0
+SHAPE_OPEN_FOUR = 1
+SHAPE_FOUR = 2
+SHAPE_OPEN_THREE = 3
+SHAPE_BROKEN_THREE = 4
+SHAPE_TWO = 5
+SHAPES = 6
+
+# Score of each shape (same order as the shapes above)
+SHAPE_SCORES = (
+    1000000,
+    100000,
+    5000,
+    4000,
+    3000,
+    100
+)
+
+# Number of line contents whose shapes are remembered by the evaluator (when
+# no memory budget is applied), the least recently used one is forgotten
+# when the cache is full
+EVALUATOR_CACHE_SIZE = 1 << 16
+
+# Evaluation difference worth an 88% winning chance in the tree search leaves
+EVALUATION_SCALE = 3000
+
+# Alpha-beta search: moves searched per node (and at the root), deepest
+# iteration, score of a won position and bound of the scores
+ALPHABETA_WIDTH = 8
+ALPHABETA_ROOT_WIDTH = 16
+ALPHABETA_MAX_DEPTH = 12
+ALPHABETA_WIN = 100000000
+ALPHABETA_INFINITY = 1000000000
+
+# Exploration constant of the UCB1 formula used by the tree search
+UCT_EXPLORATION = 0.5
+
+# Storage of the tree nodes: index of a missing node (no child, no sibling,
+# no tree) and number of nodes of the first allocation of the columns,
+# doubled whenever they are full
+MCTS_NO_NODE = -1
+MCTS_INITIAL_NODES = 1 << 12
+
+# Distance around the stones in which the candidate moves are searched
+CANDIDATE_RADIUS = 2
+
+# Number of aligned stones required to win the game
+WIN_LENGTH = 5
+
+# The four line directions (dy, dx): horizontal, vertical, diagonal, anti-diagonal
+ALIGNMENT_DIRECTIONS = (
+    (0, 1),
+    (1, 0),
+    (1, 1),
+    (1, -1)
+)
+
 THREAD_NODE_KEY = "thread"
 CLASS_NODE_KEY = "node"
 
 DEBUG = False
+
+# Debug log: levels (a message is written when its level is at most the level
+# of the log), file written in the temporary folder of the brain, and the
+# environment variables choosing the level and the folder (DEBUG = True
+# selects the debug level)
+LOG_OFF = 0
+LOG_INFO = 1
+LOG_DEBUG = 2
+LOG_TRACE = 3
+LOG_LEVELS = {
+    "off": LOG_OFF,
+    "info": LOG_INFO,
+    "debug": LOG_DEBUG,
+    "trace": LOG_TRACE
+}
+LOG_FILE = "pbrain-gomoku-ai.log"
+ENV_LOG = "PBRAIN_LOG"
+TEMP_FOLDER = "pbrain-gomoku-ai"
+ENV_TEMP_FOLDER = "PBRAIN_TEMP"
+
+# Memory budget of the search structures: the budget applied when the
+# manager gives no limit (INFO max_memory 0), the part of the limit kept for
+# the allocator and the temporary objects, the memory of the interpreter and
+# of the code when it cannot be measured, and the smallest budget of a process
+DEFAULT_MAX_MEMORY = 128 << 20
+MEMORY_MARGIN = 0.2
+MEMORY_BASE = 32 << 20
+MEMORY_MINIMUM = 1 << 20
+
+# Estimated cost in bytes of the items of the structures (CPython 64 bits):
+# a transposition table slot (five references) and the objects of a filled
+# slot, an entry of the line cache of the evaluator, and a value of a list
+# column of the tree (its reference and a number object; the other columns
+# are typed arrays, counted at their item size)
+TT_SLOT_BYTES = 40
+TT_ENTRY_BYTES = 80
+EVALUATOR_ENTRY_BYTES = 300
+MCTS_LIST_ITEM_BYTES = 36
+
+# Share of the budget of each structure, by engine; the tree drops its least
+# visited subtrees down to MCTS_PRUNE_TARGET of its share when it is full
+MEMORY_TREE = "tree"
+MEMORY_TABLE = "table"
+MEMORY_ALPHABETA_TABLE = "alphabeta_table"
+MEMORY_LINES = "lines"
+MEMORY_SHARES = {
+    ENGINE_MCTS: {MEMORY_TREE: 0.3, MEMORY_TABLE: 0.6, MEMORY_ALPHABETA_TABLE: 0.0, MEMORY_LINES: 0.1},
+    ENGINE_ALPHABETA: {MEMORY_TREE: 0.0, MEMORY_TABLE: 0.0, MEMORY_ALPHABETA_TABLE: 0.85, MEMORY_LINES: 0.15},
+    ENGINE_FLAT: {MEMORY_TREE: 0.0, MEMORY_TABLE: 0.0, MEMORY_ALPHABETA_TABLE: 0.0, MEMORY_LINES: 0.1},
+    ENGINE_BATCH: {MEMORY_TREE: 0.0, MEMORY_TABLE: 0.0, MEMORY_ALPHABETA_TABLE: 0.0, MEMORY_LINES: 0.1}
+}
+MCTS_PRUNE_TARGET = 0.75
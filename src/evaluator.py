@@ -0,0 +1,281 @@
+"""
+This file contains the pattern based evaluation of the positions.
+
+Every line of the board (rows, columns and both diagonals, at least
+WIN_LENGTH cells long) is kept as a string of cells. The shapes of a line
+(five, open four, four, open three, broken three, two) are found once per
+distinct line content and remembered, and the evaluator keeps the sum of the
+scores and shape counts of all the lines. Placing or removing a stone only
+rescores the four lines through the cell.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+from . import constants as CONST
+
+# Shapes of a line content: (score of CELL_PLAYER, score of CELL_ENEMY,
+# shape counts of CELL_PLAYER followed by the ones of CELL_ENEMY)
+LineEntry = Tuple[int, int, Tuple[int, ...]]
+
+_CELL_CODE: int = ord("0")
+_VIEWS: Dict[int, Dict[int, int]] = {
+    CONST.CELL_PLAYER: str.maketrans("012", ".xo"),
+    CONST.CELL_ENEMY: str.maketrans("021", ".xo")
+}
+_LINE_CACHE: "OrderedDict[bytes, LineEntry]" = OrderedDict()
+_LINE_CACHE_LIMIT: int = CONST.EVALUATOR_CACHE_SIZE
+
+
+def set_line_cache_limit(entries: int) -> None:
+    """
+    Change the number of line contents remembered, forgetting the least
+    recently used ones when the cache is already larger.
+    """
+    global _LINE_CACHE_LIMIT
+    _LINE_CACHE_LIMIT = max(1, entries)
+    while len(_LINE_CACHE) > _LINE_CACHE_LIMIT:
+        _LINE_CACHE.popitem(last=False)
+
+
+def line_cache_memory() -> int:
+    """
+    Return the estimated size in bytes of the remembered line contents.
+    """
+    return len(_LINE_CACHE) * CONST.EVALUATOR_ENTRY_BYTES
+
+
+def line_shapes(line: str) -> Tuple[int, ...]:
+    """
+    Count the shapes of the stones 'x' in a line, the cells out of the line
+    and the stones of the other player being 'o' and the empty cells '.'.
+    """
+    cells: str = "o" + line + "o"
+    counts: List[int] = [0] * CONST.SHAPES
+    counts[CONST.SHAPE_FIVE] = cells.count("xxxxx")
+    open_fours: int = cells.count(".xxxx.")
+    counts[CONST.SHAPE_OPEN_FOUR] = open_fours
+    five_points: int = 0
+    solid_threes = set()
+    broken_threes = set()
+    for index, cell in enumerate(cells):
+        if cell != ".":
+            continue
+        start: int = index
+        while cells[start - 1] == "x":
+            start -= 1
+        end: int = index
+        while cells[end + 1] == "x":
+            end += 1
+        length: int = end - start + 1
+        if length >= CONST.WIN_LENGTH:
+            five_points += 1
+        elif length == 4 and cells[start - 1] == "." and cells[end + 1] == ".":
+            if index == start:
+                solid_threes.add(start + 1)
+            elif index == end:
+                solid_threes.add(start)
+            else:
+                broken_threes.add(start)
+    counts[CONST.SHAPE_FOUR] = max(0, five_points - 2 * open_fours)
+    counts[CONST.SHAPE_OPEN_THREE] = len(solid_threes)
+    counts[CONST.SHAPE_BROKEN_THREE] = len(broken_threes)
+    twos: int = 0
+    for start in range(len(cells) - 5):
+        window: str = cells[start:start + 6]
+        if window[0] == "." and window[5] == "." and "o" not in window and window.count("x") == 2:
+            twos += 1
+    counts[CONST.SHAPE_TWO] = twos
+    return tuple(counts)
+
+
+def _line_entry(line: bytes) -> LineEntry:
+    """
+    Return the scores and shapes of both players on a line ('0', '1', '2' cells).
+    """
+    # The cache is kept in the order of use: a hit moves the content to the end
+    entry = _LINE_CACHE.get(line)
+    if entry is not None:
+        _LINE_CACHE.move_to_end(line)
+        return entry
+    # A line read backwards has the same shapes: both directions share an entry
+    reversed_line: bytes = line[::-1]
+    entry = _LINE_CACHE.get(reversed_line)
+    if entry is not None:
+        _LINE_CACHE.move_to_end(reversed_line)
+        return entry
+    text: str = line.decode()
+    player: Tuple[int, ...] = line_shapes(text.translate(_VIEWS[CONST.CELL_PLAYER]))
+    enemy: Tuple[int, ...] = line_shapes(text.translate(_VIEWS[CONST.CELL_ENEMY]))
+    scores = CONST.SHAPE_SCORES
+    entry = (
+        sum(count * score for count, score in zip(player, scores)),
+        sum(count * score for count, score in zip(enemy, scores)),
+        player + enemy
+    )
+    if len(_LINE_CACHE) >= _LINE_CACHE_LIMIT:
+        _LINE_CACHE.popitem(last=False)
+    _LINE_CACHE[line] = entry
+    return entry
+
+
+class Evaluator:
+    """
+    The class in charge of the incremental line scores of a position.
+    Cells are indexed like the bitboard (y * (size + 1) + x).
+    """
+
+    def __init__(self, size: int = 0):
+        self.size: int = 0
+        self.stride: int = 1
+        self.cell_lines: List[Tuple[Tuple[int, int], ...]] = []
+        self.line_lengths: List[int] = []
+        self.lines: List[bytearray] = []
+        self.entries: List[LineEntry] = []
+        self.totals: List[int] = [0, 0, 0]
+        self.shapes: List[int] = []
+        self.create(size)
+
+    def create(self, size: int = 0) -> None:
+        """
+        Create an empty position and precompute the lines of every cell.
+        """
+        self.size = size
+        self.stride = size + 1
+        cell_lines: List[List[Tuple[int, int]]] = [[] for _ in range(size * self.stride)]
+        self.line_lengths = []
+        for dy, dx in CONST.ALIGNMENT_DIRECTIONS:
+            for y in range(size):
+                for x in range(size):
+                    if 0 <= y - dy < size and 0 <= x - dx < size:
+                        continue
+                    cells: List[int] = []
+                    row, col = y, x
+                    while 0 <= row < size and 0 <= col < size:
+                        cells.append(row * self.stride + col)
+                        row += dy
+                        col += dx
+                    if len(cells) < CONST.WIN_LENGTH:
+                        continue
+                    line: int = len(self.line_lengths)
+                    self.line_lengths.append(len(cells))
+                    for position, index in enumerate(cells):
+                        cell_lines[index].append((line, position))
+        self.cell_lines = [tuple(lines) for lines in cell_lines]
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Remove every stone.
+        """
+        self.lines = [bytearray(b"0" * length) for length in self.line_lengths]
+        self.entries = [_line_entry(bytes(line)) for line in self.lines]
+        self.totals = [0, 0, 0]
+        self.shapes = [0] * (2 * CONST.SHAPES)
+        for entry in self.entries:
+            self._account(entry, 1)
+
+    def load(self, cells: Dict[int, int]) -> None:
+        """
+        Replace the position by the given stones ({index: player}), writing
+        every stone first and scoring each line once.
+        """
+        lines = [bytearray(b"0" * length) for length in self.line_lengths]
+        cell_lines = self.cell_lines
+        for index, value in cells.items():
+            code: int = _CELL_CODE + value
+            for line, position in cell_lines[index]:
+                lines[line][position] = code
+        self.lines = lines
+        self.entries = [_line_entry(bytes(line)) for line in lines]
+        self.totals = [0, 0, 0]
+        self.shapes = [0] * (2 * CONST.SHAPES)
+        for entry in self.entries:
+            self._account(entry, 1)
+
+    @classmethod
+    def from_board(cls, board: List[List[int]]) -> "Evaluator":
+        """
+        Build the evaluator of a list based board.
+        """
+        evaluator = cls(len(board))
+        for y, row in enumerate(board):
+            for x, cell in enumerate(row):
+                if cell != CONST.CELL_EMPTY:
+                    evaluator.set_cell(y, x, cell)
+        return evaluator
+
+    def copy(self) -> "Evaluator":
+        """
+        Return an independent copy (the line tables are shared).
+        """
+        other = Evaluator.__new__(Evaluator)
+        other.size = self.size
+        other.stride = self.stride
+        other.cell_lines = self.cell_lines
+        other.line_lengths = self.line_lengths
+        other.lines = [bytearray(line) for line in self.lines]
+        other.entries = self.entries[:]
+        other.totals = self.totals[:]
+        other.shapes = self.shapes[:]
+        return other
+
+    def _account(self, entry: LineEntry, sign: int) -> None:
+        """
+        Add (sign 1) or remove (sign -1) the scores and shapes of a line.
+        """
+        self.totals[CONST.CELL_PLAYER] += sign * entry[0]
+        self.totals[CONST.CELL_ENEMY] += sign * entry[1]
+        shapes: List[int] = self.shapes
+        for shape, count in enumerate(entry[2]):
+            if count:
+                shapes[shape] += sign * count
+
+    def set_index(self, index: int, value: int) -> None:
+        """
+        Set the content of the cell of index index and rescore its lines.
+        """
+        lines = self.lines
+        entries = self.entries
+        totals: List[int] = self.totals
+        shapes: List[int] = self.shapes
+        code: int = _CELL_CODE + value
+        for line, position in self.cell_lines[index]:
+            cells: bytearray = lines[line]
+            if cells[position] == code:
+                continue
+            cells[position] = code
+            entry: LineEntry = _line_entry(bytes(cells))
+            previous: LineEntry = entries[line]
+            if entry is previous:
+                continue
+            totals[CONST.CELL_PLAYER] += entry[0] - previous[0]
+            totals[CONST.CELL_ENEMY] += entry[1] - previous[1]
+            for shape, (count, old) in enumerate(zip(entry[2], previous[2])):
+                if count != old:
+                    shapes[shape] += count - old
+            entries[line] = entry
+
+    def set_cell(self, y: int, x: int, value: int) -> None:
+        """
+        Set the content of the cell (y, x), CELL_EMPTY removes the stone.
+        """
+        self.set_index(y * self.stride + x, value)
+
+    def evaluate(self, player: int) -> int:
+        """
+        Return the score of the position from the point of view of player.
+        """
+        return self.totals[player] - self.totals[3 - player]
+
+    def count(self, player: int, shape: int) -> int:
+        """
+        Return the number of shapes of the given kind owned by player.
+        """
+        return self.shapes[(player - 1) * CONST.SHAPES + shape]
+
+    def has_four(self, player: int) -> bool:
+        """
+        Tell if player can make five with one more stone.
+        """
+        offset: int = (player - 1) * CONST.SHAPES
+        return self.shapes[offset + CONST.SHAPE_FOUR] > 0 or self.shapes[offset + CONST.SHAPE_OPEN_FOUR] > 0
@@ -0,0 +1,149 @@
+"""
+This file contains the debug log of the brain.
+
+A message has a level and is only formatted when the log is at least that
+verbose: the arguments are given apart from the message ("%s" style) so a
+disabled message costs a comparison, and hot paths can test enabled() before
+gathering costly arguments. The formatted lines are queued and written to a
+file of the temporary folder by a background thread, so logging never
+waits for the disk and never touches the protocol streams.
+"""
+
+import os
+import queue
+import tempfile
+import threading
+import time
+from typing import Optional, TextIO
+from . import constants as CONST
+
+
+def temp_folder() -> str:
+    """
+    Return the temporary folder of the brain (created when missing).
+    """
+    folder: str = os.environ.get(CONST.ENV_TEMP_FOLDER, "")
+    if not folder:
+        folder = os.path.join(tempfile.gettempdir(), CONST.TEMP_FOLDER)
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def parse_level(name: str) -> Optional[int]:
+    """
+    Convert a level name ("off", "info", "debug", "trace") or number, None when unknown.
+    """
+    name = name.strip().lower()
+    if name.isdigit():
+        return min(int(name), CONST.LOG_TRACE)
+    return CONST.LOG_LEVELS.get(name)
+
+
+class Logger:
+    """
+    The class in charge of the level filter and of the writing thread.
+    """
+
+    def __init__(self, level: Optional[int] = None, path: Optional[str] = None):
+        if level is None:
+            level = parse_level(os.environ.get(CONST.ENV_LOG, ""))
+        if level is None:
+            level = CONST.LOG_DEBUG if CONST.DEBUG else CONST.LOG_OFF
+        self.level: int = level
+        self.path: Optional[str] = path
+        self.queue: "queue.SimpleQueue[Optional[str]]" = queue.SimpleQueue()
+        self.thread: Optional[threading.Thread] = None
+        self.lock: threading.Lock = threading.Lock()
+
+    def enabled(self, level: int) -> bool:
+        """
+        Tell if the messages of the given level are written.
+        """
+        return level <= self.level
+
+    def set_level(self, level: int) -> None:
+        """
+        Change the level of the log (LOG_OFF disables it).
+        """
+        self.level = level
+
+    def log(self, level: int, message: str, *args) -> None:
+        """
+        Format and queue the message when its level is enabled.
+        """
+        if level > self.level:
+            return
+        if args:
+            message = message % args
+        self.write(f"{time.time():.6f} {level} {message}\n")
+
+    def write(self, text: str) -> None:
+        """
+        Queue text as it is, whatever the level (used by the trace files).
+        """
+        if self.thread is None:
+            self._start()
+        self.queue.put(text)
+
+    def info(self, message: str, *args) -> None:
+        """
+        Log a message of the info level.
+        """
+        if CONST.LOG_INFO <= self.level:
+            self.log(CONST.LOG_INFO, message, *args)
+
+    def debug(self, message: str, *args) -> None:
+        """
+        Log a message of the debug level.
+        """
+        if CONST.LOG_DEBUG <= self.level:
+            self.log(CONST.LOG_DEBUG, message, *args)
+
+    def trace(self, message: str, *args) -> None:
+        """
+        Log a message of the trace level.
+        """
+        if CONST.LOG_TRACE <= self.level:
+            self.log(CONST.LOG_TRACE, message, *args)
+
+    def _start(self) -> None:
+        """
+        Start the writing thread (on the first message).
+        """
+        with self.lock:
+            if self.thread is not None:
+                return
+            if self.path is None:
+                self.path = os.path.join(temp_folder(), CONST.LOG_FILE)
+            self.thread = threading.Thread(target=self._write, daemon=True)
+            self.thread.start()
+
+    def _write(self) -> None:
+        """
+        Body of the writing thread: write the queued lines, flushing the file
+        whenever the queue is empty, until close.
+        """
+        log_file: TextIO
+        with open(self.path, "a", encoding="utf-8") as log_file:
+            while True:
+                line: Optional[str] = self.queue.get()
+                if line is None:
+                    break
+                log_file.write(line)
+                if self.queue.empty():
+                    log_file.flush()
+
+    def close(self) -> None:
+        """
+        Write the queued lines and stop the writing thread.
+        """
+        with self.lock:
+            thread: Optional[threading.Thread] = self.thread
+            self.thread = None
+        if thread is None:
+            return
+        self.queue.put(None)
+        thread.join()
+
+
+LOGGER: Logger = Logger()
@@ -0,0 +1,572 @@
+"""
+This file contains the Monte Carlo Tree Search engine (UCT) of the AI.
+
+The nodes are not Python objects: a node is an index in the columns of a
+NodeStore (one array per field), its children are linked through the first
+child and next sibling columns. There is no object per node for the garbage
+collector to track, and a node costs about 180 bytes instead of the
+several hundreds of an object with its list of untried moves. The untried
+moves of a node are not stored either: they are the candidates of its
+position that are not children yet.
+When a transposition table is given, the statistics of every node are stored
+under the Zobrist key of its position, and a node created for a position
+already seen (through another move order or during a previous turn) starts
+with the stored statistics.
+The tree is kept between the searches: a new search starts from the node of
+the previous tree reached by the stones added since (our move and the reply
+of the opponent), the rest of the tree is dropped.
+When an evaluator is given, it follows the moves of the tree and replaces
+the playouts: a leaf whose outcome is forced (a four for the player to move,
+an open four for the other one) is a win or a loss, any other leaf is worth
+its static evaluation squashed into [0, 1].
+The number of nodes is bounded by the memory limit: when the tree is full,
+the least visited subtrees are dropped (their moves can be expanded again)
+until the tree is back to MCTS_PRUNE_TARGET of the limit, and their nodes go
+to a free list for the next expansions.
+"""
+
+import math
+import random
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+from . import constants as CONST
+from .bitboard import BitBoard
+from .candidates import CandidateSet
+from .evaluator import Evaluator
+from .zobrist import TranspositionTable, Zobrist
+
+PlayoutFunction = Callable[[BitBoard, int, int, Optional[CandidateSet]], int]
+
+NO_NODE = CONST.MCTS_NO_NODE
+
+
+class NodeStore:
+    """
+    The nodes of the search tree, stored by columns: the move that leads to
+    the node, the player who played it, its visits and wins, its first child,
+    its next sibling, its number of children, whether the move won and the
+    Zobrist key of its position.
+    The columns are typed arrays, but the three ones read for every child by
+    the selection (visits, wins, next sibling) are lists: an array creates a
+    new number object on each read, which made the search 15% slower.
+    The columns grow by doubling up to max_nodes (0 for no limit), the
+    released nodes are kept in a free list and used again first.
+    """
+
+    # Name and type code of the columns, "" for a list
+    COLUMNS: Tuple[Tuple[str, str], ...] = (
+        ("moves", "i"),
+        ("players", "b"),
+        ("visits", ""),
+        ("wins", ""),
+        ("first_child", "i"),
+        ("sibling", ""),
+        ("child_count", "i"),
+        ("terminal", "b"),
+        ("keys", "Q")
+    )
+    # Bytes of a node: its columns, its place in the free list and what
+    # compact needs for it (its new place, its renumbering and the copy of
+    # the column being moved)
+    NODE_BYTES: int = sum(
+        array(code).itemsize if code else CONST.MCTS_LIST_ITEM_BYTES for _, code in COLUMNS
+    ) + 3 * array("i").itemsize + CONST.MCTS_LIST_ITEM_BYTES
+
+    def __init__(self, max_nodes: int = 0):
+        self.max_nodes: int = max_nodes
+        self.capacity: int = 0
+        self.used: int = 0
+        self.count: int = 0
+        self.moves: array = array("i")
+        self.players: array = array("b")
+        self.visits: List[int] = []
+        self.wins: List[float] = []
+        self.first_child: array = array("i")
+        self.sibling: List[int] = []
+        self.child_count: array = array("i")
+        self.terminal: array = array("b")
+        self.keys: array = array("Q")
+        self.free: array = array("i")
+
+    def clear(self) -> None:
+        """
+        Release every node, the columns are kept for the next tree.
+        """
+        self.used = 0
+        self.count = 0
+        self.free = array("i")
+
+    def _grow(self) -> bool:
+        """
+        Double the columns (within max_nodes), return False when they cannot grow.
+        """
+        capacity: int = max(CONST.MCTS_INITIAL_NODES, 2 * self.capacity)
+        if self.max_nodes > 0:
+            capacity = min(capacity, self.max_nodes)
+        if capacity <= self.capacity:
+            return False
+        extra: int = capacity - self.capacity
+        for name, code in self.COLUMNS:
+            if code:
+                column: array = getattr(self, name)
+                column.frombytes(bytes(extra * column.itemsize))
+            else:
+                getattr(self, name).extend([0] * extra)
+        self.capacity = capacity
+        return True
+
+    def full(self) -> bool:
+        """
+        Tell if a node can no longer be allocated.
+        """
+        return not self.free and self.used >= self.capacity and 0 < self.max_nodes <= self.capacity
+
+    def allocate(self, move: int, player: int, key: int) -> int:
+        """
+        Create a node without statistics nor children, return NO_NODE when the store is full.
+        """
+        if self.free:
+            node: int = self.free.pop()
+        else:
+            if self.used >= self.capacity and not self._grow():
+                return NO_NODE
+            node = self.used
+            self.used += 1
+        self.moves[node] = move
+        self.players[node] = player
+        self.visits[node] = 0
+        self.wins[node] = 0.0
+        self.first_child[node] = NO_NODE
+        self.sibling[node] = NO_NODE
+        self.child_count[node] = 0
+        self.terminal[node] = 0
+        self.keys[node] = key
+        self.count += 1
+        return node
+
+    def add_child(self, parent: int, child: int) -> None:
+        """
+        Link child at the head of the children of parent.
+        """
+        self.sibling[child] = self.first_child[parent]
+        self.first_child[parent] = child
+        self.child_count[parent] += 1
+
+    def children(self, node: int) -> List[int]:
+        """
+        Return the children of a node.
+        """
+        children: List[int] = []
+        child: int = self.first_child[node]
+        while child != NO_NODE:
+            children.append(child)
+            child = self.sibling[child]
+        return children
+
+    def subtree(self, node: int) -> array:
+        """
+        Return the nodes of the subtree of node, parents before their children.
+        """
+        nodes: array = array("i", [node])
+        first_child: array = self.first_child
+        sibling: List[int] = self.sibling
+        index: int = 0
+        while index < len(nodes):
+            child: int = first_child[nodes[index]]
+            while child != NO_NODE:
+                nodes.append(child)
+                child = sibling[child]
+            index += 1
+        return nodes
+
+    def release(self, node: int) -> None:
+        """
+        Put the nodes of the subtree of node in the free list (the caller
+        unlinks node from its parent).
+        """
+        nodes: array = self.subtree(node)
+        self.free.extend(nodes)
+        self.count -= len(nodes)
+
+    def compact(self, root: int) -> int:
+        """
+        Keep only the subtree of root, moved to the first indices (root
+        first) with the free list emptied, and return the new index of root.
+        The new order and the renumbering are typed arrays and the columns
+        are moved one at a time, their size is part of NODE_BYTES.
+        """
+        self.sibling[root] = NO_NODE
+        order: array = self.subtree(root)
+        # One more item than the nodes: renumber[NO_NODE] reads the last one
+        renumber: array = array("i", [NO_NODE]) * (self.used + 1)
+        for index, node in enumerate(order):
+            renumber[node] = index
+        count: int = len(order)
+        for name, code in self.COLUMNS:
+            column = getattr(self, name)
+            if name in ("first_child", "sibling"):
+                values = (renumber[column[node]] for node in order)
+            else:
+                values = (column[node] for node in order)
+            column[0:count] = array(code, values) if code else list(values)
+        self.used = count
+        self.count = count
+        self.free = array("i")
+        return 0
+
+    def set_max_nodes(self, max_nodes: int) -> None:
+        """
+        Change the limit of nodes, the columns are cut down to it (the nodes
+        beyond the limit must have been released and the tree compacted).
+        """
+        self.max_nodes = max_nodes
+        if 0 < max_nodes < self.capacity:
+            for name, _ in self.COLUMNS:
+                del getattr(self, name)[max_nodes:]
+            self.capacity = max_nodes
+            self.used = min(self.used, max_nodes)
+            self.free = array("i", [node for node in self.free if node < max_nodes])
+
+    def memory(self) -> int:
+        """
+        Return the size of the columns in bytes.
+        """
+        return self.capacity * self.NODE_BYTES
+
+
+class MCTS:
+    """
+    The class in charge of running the selection, expansion, playout and
+    backpropagation steps of the search.
+    Moves are bitboard indices, rewards are counted from the point of view
+    of the player who played the move of the node.
+    """
+
+    def __init__(self, playout: PlayoutFunction, exploration: float = CONST.UCT_EXPLORATION, playout_depth: int = CONST.PLAYOUT_DEPTH, table: Optional[TranspositionTable] = None):
+        self.playout: PlayoutFunction = playout
+        self.exploration: float = exploration
+        self.playout_depth: int = playout_depth
+        self.table: Optional[TranspositionTable] = table
+        self.zobrist: Zobrist = Zobrist()
+        self.evaluator: Optional[Evaluator] = None
+        self.iterations: int = 0
+        self.tree: NodeStore = NodeStore()
+        self.root: int = NO_NODE
+        self.root_stones: Dict[int, int] = {}
+        self.reused_visits: int = 0
+        self.stop_requested: bool = False
+        self.memory_limit: int = 0
+        self.prunes: int = 0
+        self.marks: List[int] = []
+        self.stamp: int = 0
+
+    def _select_child(self, node: int) -> int:
+        """
+        Pick the child with the best UCB1 score, wins / visits +
+        exploration * sqrt(log(parent visits) / visits), written with the
+        square of the exploration term worked out once per node.
+        """
+        tree: NodeStore = self.tree
+        visits: List[int] = tree.visits
+        wins: List[float] = tree.wins
+        sibling: List[int] = tree.sibling
+        sqrt = math.sqrt
+        spread: float = self.exploration * self.exploration * math.log(visits[node])
+        child: int = tree.first_child[node]
+        best_child: int = child
+        best_score: float = -float('inf')
+        while child >= 0:
+            child_visits: int = visits[child]
+            score: float = wins[child] / child_visits + sqrt(spread / child_visits)
+            if score > best_score:
+                best_score = score
+                best_child = child
+            child = sibling[child]
+        return best_child
+
+    def _untried_move(self, node: int, moves: List[int]) -> int:
+        """
+        Draw one of the candidate moves that are not children of node yet.
+        """
+        tree: NodeStore = self.tree
+        marks: List[int] = self.marks
+        self.stamp += 1
+        stamp: int = self.stamp
+        child: int = tree.first_child[node]
+        while child != NO_NODE:
+            marks[tree.moves[child]] = stamp
+            child = tree.sibling[child]
+        count: int = len(moves)
+        while True:
+            move: int = moves[int(random.random() * count)]
+            if marks[move] != stamp:
+                return move
+
+    def _play(self, bitboard: BitBoard, candidates: CandidateSet, move: int, player: int) -> None:
+        """
+        Put a stone of player on the cell of index move.
+        """
+        bitboard.stones[player] |= 1 << move
+        candidates.place(*divmod(move, candidates.stride))
+        if self.evaluator is not None:
+            self.evaluator.set_index(move, player)
+
+    def _undo(self, bitboard: BitBoard, candidates: CandidateSet, move: int, player: int) -> None:
+        """
+        Remove the stone of player from the cell of index move.
+        """
+        bitboard.stones[player] &= ~(1 << move)
+        candidates.remove(*divmod(move, candidates.stride))
+        if self.evaluator is not None:
+            self.evaluator.set_index(move, CONST.CELL_EMPTY)
+
+    def _seed_from_table(self, node: int) -> None:
+        """
+        Give the node the statistics stored for its position, scaled down
+        to at most TT_MAX_PRIOR_VISITS visits.
+        """
+        entry = self.table.probe(self.tree.keys[node])
+        if entry is None:
+            return
+        visits, wins = entry[0], entry[1]
+        if visits > CONST.TT_MAX_PRIOR_VISITS:
+            wins = wins * CONST.TT_MAX_PRIOR_VISITS / visits
+            visits = CONST.TT_MAX_PRIOR_VISITS
+        self.tree.visits[node] = visits
+        self.tree.wins[node] = wins
+
+    def _leaf_reward(self, node: int, bitboard: BitBoard, candidates: CandidateSet) -> float:
+        """
+        Return the value of the position of node (1 win, 0.5 draw, 0 loss)
+        for the player who played its move.
+        """
+        if self.tree.terminal[node]:
+            return 1.0
+        player: int = self.tree.players[node]
+        evaluator: Optional[Evaluator] = self.evaluator
+        if evaluator is None:
+            result: int = self.playout(bitboard, 3 - player, self.playout_depth, candidates)
+            if result == 0:
+                return 0.5
+            return 1.0 if (result > 0) == (player == CONST.CELL_PLAYER) else 0.0
+        if evaluator.has_four(3 - player):
+            return 0.0
+        if evaluator.count(player, CONST.SHAPE_OPEN_FOUR) > 0:
+            return 1.0
+        return 0.5 + 0.5 * math.tanh(evaluator.evaluate(player) / CONST.EVALUATION_SCALE)
+
+    def _iterate(self, root: int, bitboard: BitBoard, candidates: CandidateSet) -> None:
+        """
+        Run one selection, expansion, evaluation (playout) and backpropagation pass.
+        """
+        tree: NodeStore = self.tree
+        terminal: array = tree.terminal
+        child_count: array = tree.child_count
+        players: array = tree.players
+        moves: array = tree.moves
+        visits: List[int] = tree.visits
+        wins: List[float] = tree.wins
+        node: int = root
+        path: List[int] = [root]
+
+        while not terminal[node] and child_count[node] and child_count[node] >= len(candidates.moves):
+            node = self._select_child(node)
+            self._play(bitboard, candidates, moves[node], players[node])
+            path.append(node)
+        if not terminal[node] and child_count[node] < len(candidates.moves):
+            move: int = self._untried_move(node, candidates.moves)
+            player: int = 3 - players[node]
+            child: int = tree.allocate(move, player, tree.keys[node] ^ self.zobrist.keys[player][move])
+            if child != NO_NODE:
+                self._play(bitboard, candidates, move, player)
+                terminal[child] = bitboard.has_five(player)
+                if self.table is not None:
+                    self._seed_from_table(child)
+                tree.add_child(node, child)
+                node = child
+                path.append(node)
+        reward: float = self._leaf_reward(node, bitboard, candidates)
+        leaf_player: int = players[node]
+        for visited in path:
+            visits[visited] += 1
+            wins[visited] += reward if players[visited] == leaf_player else 1.0 - reward
+        if self.table is not None:
+            keys: array = tree.keys
+            for visited in path[1:]:
+                self.table.store(keys[visited], visits[visited], wins[visited], -1, visits[visited])
+        for visited in reversed(path[1:]):
+            self._undo(bitboard, candidates, moves[visited], players[visited])
+
+    def reset(self) -> None:
+        """
+        Drop the tree kept from the previous searches.
+        """
+        self.tree.clear()
+        self.root = NO_NODE
+        self.root_stones = {}
+
+    def take_back(self, move: int, player: int) -> None:
+        """
+        Follow the removal of the stone of player on move (TAKEBACK). When it
+        is a stone of the player who moved into the root, a node is added
+        above the root for the position without it, the root becoming its
+        only child, so the tree is still used when the stone is played again.
+        Otherwise (or when the tree is full) the tree is dropped.
+        """
+        root: int = self.root
+        if root == NO_NODE or not (self.root_stones.get(player, 0) >> move) & 1:
+            return
+        tree: NodeStore = self.tree
+        parent: int = NO_NODE
+        if tree.players[root] == player:
+            parent = tree.allocate(-1, 3 - player, tree.keys[root] ^ self.zobrist.keys[player][move])
+        if parent == NO_NODE:
+            self.reset()
+            return
+        tree.moves[root] = move
+        tree.visits[parent] = tree.visits[root]
+        tree.wins[parent] = tree.visits[root] - tree.wins[root]
+        tree.add_child(parent, root)
+        self.root = parent
+        self.root_stones[player] &= ~(1 << move)
+
+    def memory(self) -> int:
+        """
+        Return the size of the tree in bytes.
+        """
+        return self.tree.memory()
+
+    def set_memory_limit(self, limit: int) -> None:
+        """
+        Bound the tree to limit bytes (0 for no limit), the least visited
+        subtrees are dropped when the tree is already larger.
+        """
+        self.memory_limit = limit
+        max_nodes: int = limit // NodeStore.NODE_BYTES if limit > 0 else 0
+        if 0 < max_nodes < self.tree.capacity:
+            if self.root != NO_NODE:
+                self.prune(int(max_nodes * CONST.MCTS_PRUNE_TARGET))
+                self.root = self.tree.compact(self.root)
+            else:
+                self.tree.clear()
+        self.tree.set_max_nodes(max_nodes)
+
+    def prune(self, target: int) -> None:
+        """
+        Drop the least visited subtrees until the tree holds at most target
+        nodes: the nodes are kept from the most visited one while they fit,
+        the dropped ones go to the free list and their moves can be tried again.
+        """
+        root: int = self.root
+        tree: NodeStore = self.tree
+        if root == NO_NODE or tree.count <= target:
+            return
+        visits: List[int] = tree.visits
+        ranked: List[int] = sorted((visits[node] for node in tree.subtree(root)[1:]), reverse=True)
+        threshold: int = ranked[max(1, target) - 1]
+        self.prunes += 1
+        first_child: array = tree.first_child
+        sibling: List[int] = tree.sibling
+        stack: List[int] = [root]
+        while stack:
+            node: int = stack.pop()
+            previous: int = NO_NODE
+            child: int = first_child[node]
+            while child != NO_NODE:
+                following: int = sibling[child]
+                if visits[child] > threshold:
+                    stack.append(child)
+                    previous = child
+                else:
+                    if previous == NO_NODE:
+                        first_child[node] = following
+                    else:
+                        sibling[previous] = following
+                    tree.child_count[node] -= 1
+                    tree.release(child)
+                child = following
+
+    def _reuse_root(self, bitboard: BitBoard, player: int) -> int:
+        """
+        Find the node of the previous tree matching the position, reached
+        by playing the stones added since the previous search in turn.
+        Return NO_NODE when the position does not follow the previous one.
+        """
+        root: int = self.root
+        if root == NO_NODE or self.zobrist.size != bitboard.size:
+            return NO_NODE
+        added: Dict[int, int] = {}
+        for owner, stones in bitboard.stones.items():
+            previous: int = self.root_stones.get(owner, 0)
+            if previous & ~stones:
+                return NO_NODE
+            added[owner] = stones & ~previous
+        tree: NodeStore = self.tree
+        node: int = root
+        while added[CONST.CELL_PLAYER] or added[CONST.CELL_ENEMY]:
+            to_move: int = 3 - tree.players[node]
+            mask: int = added[to_move]
+            child: int = tree.first_child[node]
+            while child != NO_NODE and not (mask >> tree.moves[child]) & 1:
+                child = tree.sibling[child]
+            if child == NO_NODE:
+                return NO_NODE
+            added[to_move] &= ~(1 << tree.moves[child])
+            node = child
+        if tree.players[node] != 3 - player:
+            return NO_NODE
+        return node
+
+    def search(self, bitboard: BitBoard, candidates: CandidateSet, deadline: float, max_iterations: Optional[int] = None, evaluator: Optional[Evaluator] = None, player: int = CONST.CELL_PLAYER, key: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """
+        Search the position until the deadline (time.time() based), until
+        max_iterations or until stop_requested is set (from another thread)
+        and return the most visited move for player, the player to move.
+        key is the Zobrist key of the position when the caller keeps it,
+        it is computed from the stones otherwise.
+        The bitboard, the candidates and the evaluator are restored before returning.
+        """
+        self.evaluator = evaluator
+        tree: NodeStore = self.tree
+        root: int = self._reuse_root(bitboard, player)
+        if root != NO_NODE:
+            root = tree.compact(root)
+        else:
+            if self.zobrist.size != bitboard.size:
+                self.zobrist.create(bitboard.size)
+            tree.clear()
+            if key is None:
+                key = self.zobrist.hash_stones(bitboard.stones)
+            root = tree.allocate(-1, 3 - player, key)
+        if len(self.marks) != bitboard.size * (bitboard.size + 1):
+            self.marks = [0] * (bitboard.size * (bitboard.size + 1))
+        self.root = root
+        self.root_stones = dict(bitboard.stones)
+        self.reused_visits = tree.visits[root]
+        self.iterations = 0
+        if not candidates.moves and not tree.child_count[root]:
+            return None
+        target: int = int(tree.max_nodes * CONST.MCTS_PRUNE_TARGET)
+        while time.time() < deadline and not self.stop_requested:
+            if max_iterations is not None and self.iterations >= max_iterations:
+                break
+            if tree.full():
+                self.prune(target)
+            self._iterate(root, bitboard, candidates)
+            self.iterations += 1
+        if not tree.child_count[root]:
+            return divmod(candidates.moves[0], candidates.stride)
+        best: int = max(tree.children(root), key=lambda child: tree.visits[child])
+        return divmod(tree.moves[best], candidates.stride)
+
+    def root_statistics(self) -> Dict[int, Tuple[int, float]]:
+        """
+        Return the visits and wins of every root move of the last search.
+        """
+        if self.root == NO_NODE:
+            return {}
+        tree: NodeStore = self.tree
+        return {
+            tree.moves[child]: (tree.visits[child], tree.wins[child]) for child in tree.children(self.root)
+        }
@@ -0,0 +1,74 @@
+"""
+This file contains the memory budget of the search structures.
+
+The manager gives the memory the brain may use (INFO max_memory, in bytes,
+0 for no limit). The interpreter and the code take a part of it (the memory
+of the process when the budget is first needed) and a margin is kept for
+the allocator and the temporary objects; the rest is divided among the
+processes of the search and, in each one, shared by the growable structures
+of the AI (tree, transposition tables, line cache) according to the engine.
+Each structure accounts for its own size with the costs per item of the
+constants and keeps within its share by evicting entries.
+"""
+
+import os
+from typing import Optional
+from . import constants as CONST
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+_BASE_MEMORY: Optional[int] = None
+
+
+def process_memory() -> int:
+    """
+    Return the resident memory of the process in bytes, 0 when unknown.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return 0
+
+
+def base_memory() -> int:
+    """
+    Return the memory of the process without the search structures, measured
+    on the first call (CONST.MEMORY_BASE when it cannot be measured).
+    """
+    global _BASE_MEMORY
+    if _BASE_MEMORY is None:
+        _BASE_MEMORY = process_memory() or CONST.MEMORY_BASE
+    return _BASE_MEMORY
+
+
+class MemoryBudget:
+    """
+    The class in charge of sharing the memory limit among the structures.
+    """
+
+    def __init__(self, max_memory: int = 0, processes: int = 1):
+        self.max_memory: int = max_memory
+        self.processes: int = max(1, processes)
+        base_memory()
+
+    def total(self) -> int:
+        """
+        Return the bytes the structures of one process may use.
+        """
+        limit: int = self.max_memory if self.max_memory > 0 else CONST.DEFAULT_MAX_MEMORY
+        usable: float = limit * (1 - CONST.MEMORY_MARGIN) - base_memory() * self.processes
+        return max(CONST.MEMORY_MINIMUM, int(usable / self.processes))
+
+    def share(self, engine: str, structure: str) -> int:
+        """
+        Return the bytes given to a structure (CONST.MEMORY_SHARES) when the engine plays.
+        """
+        shares = CONST.MEMORY_SHARES.get(engine, CONST.MEMORY_SHARES[CONST.ENGINE_MCTS])
+        return int(self.total() * shares[structure])
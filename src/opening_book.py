@@ -0,0 +1,160 @@
+"""
+This file contains the opening book of the AI.
+
+The book is a binary file of the folder given by "INFO folder": a header
+followed by fixed size records (position key, row, column, weight) sorted by
+key. The position key is the canonical key (see symmetry.py) of the position
+seen by the player to move (its stones are CELL_PLAYER) and the moves are
+given in the canonical frame, so the eight images of a position share their
+records. The file is memory mapped, so opening it costs nothing and a lookup
+is a binary search reading a few records.
+"""
+
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+from . import constants as CONST
+
+HEADER = struct.Struct("<4sHI")
+RECORD = struct.Struct("<QBBH")
+
+BookEntries = Dict[int, Dict[Tuple[int, int], int]]
+
+
+class OpeningBook:
+    """
+    The class in charge of looking up the moves of the opening book.
+    """
+
+    def __init__(self):
+        self.path: str = ""
+        self.file = None
+        self.map: Optional[mmap.mmap] = None
+        self.count: int = 0
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Tell if a book is opened.
+        """
+        return self.map is not None
+
+    def open(self, folder: str) -> bool:
+        """
+        Open the book of the given folder, a missing, unreadable or invalid
+        file leaves the AI without book.
+        """
+        self.close()
+        path: str = os.path.join(folder, CONST.OPENING_BOOK_FILE)
+        if not os.path.isfile(path) or os.path.getsize(path) < HEADER.size:
+            return False
+        book_file = None
+        try:
+            book_file = open(path, "rb")
+            book_map = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            if book_file is not None:
+                book_file.close()
+            return False
+        magic, version, count = HEADER.unpack_from(book_map, 0)
+        if magic != CONST.OPENING_BOOK_MAGIC or version != CONST.OPENING_BOOK_VERSION \
+                or len(book_map) != HEADER.size + count * RECORD.size:
+            book_map.close()
+            book_file.close()
+            return False
+        self.path = path
+        self.file = book_file
+        self.map = book_map
+        self.count = count
+        return True
+
+    def close(self) -> None:
+        """
+        Release the mapping and the file.
+        """
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.count = 0
+
+    def _record(self, position: int) -> Tuple[int, int, int, int]:
+        """
+        Read the record of the given position.
+        """
+        return RECORD.unpack_from(self.map, HEADER.size + position * RECORD.size)
+
+    def moves(self, key: int) -> List[Tuple[int, int, int]]:
+        """
+        Return the (row, column, weight) moves stored for a position key.
+        """
+        if self.map is None:
+            return []
+        low: int = 0
+        high: int = self.count
+        while low < high:
+            middle: int = (low + high) // 2
+            if self._record(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        result: List[Tuple[int, int, int]] = []
+        while low < self.count:
+            record_key, row, col, weight = self._record(low)
+            if record_key != key:
+                break
+            result.append((row, col, weight))
+            low += 1
+        return result
+
+    def lookup(self, key: int) -> Optional[Tuple[int, int]]:
+        """
+        Return the move of greatest weight for a position key, if any.
+        """
+        moves = self.moves(key)
+        if not moves:
+            return None
+        row, col, _ = max(moves, key=lambda move: move[2])
+        return (row, col)
+
+
+def read_book(path: str) -> BookEntries:
+    """
+    Read every entry of a book file ({key: {(row, col): weight}}).
+    """
+    entries: BookEntries = {}
+    if not os.path.isfile(path):
+        return entries
+    with open(path, "rb") as book_file:
+        data: bytes = book_file.read()
+    if len(data) < HEADER.size:
+        return entries
+    magic, version, count = HEADER.unpack_from(data, 0)
+    if magic != CONST.OPENING_BOOK_MAGIC or version != CONST.OPENING_BOOK_VERSION:
+        return entries
+    for position in range(count):
+        key, row, col, weight = RECORD.unpack_from(data, HEADER.size + position * RECORD.size)
+        entries.setdefault(key, {})[(row, col)] = weight
+    return entries
+
+
+def write_book(path: str, entries: BookEntries) -> int:
+    """
+    Write the entries as a sorted book file (replaced atomically) and
+    return the number of records.
+    """
+    records: List[Tuple[int, int, int, int]] = sorted(
+        (key, row, col, min(weight, 0xFFFF))
+        for key, moves in entries.items()
+        for (row, col), weight in moves.items()
+    )
+    temporary: str = path + ".tmp"
+    with open(temporary, "wb") as book_file:
+        book_file.write(HEADER.pack(CONST.OPENING_BOOK_MAGIC, CONST.OPENING_BOOK_VERSION, len(records)))
+        for record in records:
+            book_file.write(RECORD.pack(*record))
+    os.replace(temporary, path)
+    return len(records)
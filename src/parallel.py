@@ -0,0 +1,87 @@
+"""
+This file contains the process pool used to run the searches on every core.
+
+The pool is created once (at START) and kept for the whole session, every
+task receives its own copy of the position so the processes never share
+any state. The results are root statistics that are summed at the deadline.
+"""
+
+import multiprocessing
+import time
+from multiprocessing.pool import AsyncResult, Pool
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+from . import constants as CONST
+
+RootStatistics = Dict[int, Tuple[int, float]]
+
+
+class ParallelSearch:
+    """
+    The class in charge of the persistent worker processes.
+    """
+
+    def __init__(self, workers: int = CONST.DEFAULT_WORKERS, initializer: Union[Callable[[], None], None] = None):
+        self.workers: int = max(0, workers)
+        self.initializer: Union[Callable[[], None], None] = initializer
+        self.pool: Union[Pool, None] = None
+
+    @property
+    def active(self) -> bool:
+        """
+        Tell if the worker processes are running.
+        """
+        return self.pool is not None
+
+    def start(self) -> bool:
+        """
+        Start the worker processes if workers were requested and none are
+        running, the initializer (if any) runs once in every process.
+        """
+        if self.pool is not None or self.workers == 0:
+            return self.pool is not None
+        self.pool = multiprocessing.Pool(self.workers, self.initializer)
+        return True
+
+    def stop(self) -> None:
+        """
+        Kill the worker processes.
+        """
+        if self.pool is None:
+            return
+        self.pool.terminate()
+        self.pool.join()
+        self.pool = None
+
+    def submit(self, function: Callable[..., Any], arguments: Sequence[Tuple[Any, ...]]) -> List[AsyncResult]:
+        """
+        Send one task per argument tuple to the workers.
+        """
+        if self.pool is None:
+            return []
+        return [self.pool.apply_async(function, args) for args in arguments]
+
+    def collect(self, results: List[AsyncResult], deadline: float) -> List[Any]:
+        """
+        Gather the results that are ready at the deadline (plus a small grace
+        period), the late or failed tasks are dropped.
+        """
+        collected: List[Any] = []
+        for result in results:
+            timeout: float = max(0.0, deadline - time.time()) + CONST.PARALLEL_MERGE_MARGIN
+            try:
+                collected.append(result.get(timeout))
+            except Exception:  # pylint: disable=broad-except
+                continue
+        return collected
+
+
+def merge_root_statistics(statistics: List[RootStatistics]) -> RootStatistics:
+    """
+    Sum the visits and wins of every root move over the independent searches.
+    """
+    merged: Dict[int, Tuple[int, float]] = {}
+    for stats in statistics:
+        for move, (visits, wins) in stats.items():
+            previous_visits, previous_wins = merged.get(move, (0, 0.0))
+            merged[move] = (previous_visits + visits, previous_wins + wins)
+    return merged
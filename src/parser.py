@@ -2,32 +2,27 @@
 This module contains the parser for the command line arguments.
 """
 
+import os
 import sys
-from typing import List, Union, TextIO
+import json
+from typing import BinaryIO, Callable, Dict, List, Tuple, Union, TextIO
 from . import constants as CONST
 from .ai import AI
+from .bitboard import BitBoard
+from .candidates import CandidateSet
+from .evaluator import Evaluator
+from .logger import LOGGER, Logger, temp_folder
+from .profiler import TurnProfiler
+from .symmetry import Symmetry
+from .zobrist import Zobrist
 
 
-def my_print(string: str, file: Union[TextIO, None] = None) -> None:
+def pdebug(string: str, *args) -> None:
     """
-        Print the string to the specified file.
-
-    Args:
-        string (str): The string to be displayed.
-        file (Union[TextIO, None], optional): The stream to which to output the content. Defaults to None.
-    """
-    if file is None:
-        print(string, flush=True, file=sys.stdout)
-    else:
-        print(string, flush=True, file=file)
-
-
-def pdebug(string: str) -> None:
+    Log a debug message, formatted with args ("%s" style) only when the
+    debug level is enabled.
     """
-    Print the debug message.
-    """
-    if CONST.DEBUG:
-        my_print(string, sys.stderr)
+    LOGGER.debug(string, *args)
 
 
 class SystemBoard:
@@ -38,6 +33,13 @@ class SystemBoard:
     def __init__(self):
         self.board: List[List[int]] = []
         self.board_size: int = 0
+        self.bitboard: BitBoard = BitBoard()
+        self.candidates: CandidateSet = CandidateSet()
+        self.evaluator: Evaluator = Evaluator()
+        self.zobrist: Zobrist = Zobrist()
+        self.hash: int = 0
+        self.symmetry: Symmetry = Symmetry()
+        self.hashes: List[int] = [0] * CONST.SYMMETRIES
 
     def create_board(self, size: int = 0) -> None:
         """
@@ -48,7 +50,14 @@ class SystemBoard:
             [CONST.CELL_EMPTY for _ in range(self.board_size)]
             for _ in range(self.board_size)
         ]
-        pdebug(f"Board created: {self.board}")
+        self.bitboard.create(self.board_size)
+        self.candidates.create(self.board_size)
+        self.evaluator.create(self.board_size)
+        self.zobrist.create(self.board_size)
+        self.hash = 0
+        self.symmetry.create(self.board_size)
+        self.hashes = [0] * CONST.SYMMETRIES
+        pdebug("Board created: %s", self.board)
 
     def clear_board(self) -> None:
         """
@@ -57,7 +66,12 @@ class SystemBoard:
         for coli, col in enumerate(self.board):
             for index in range(len(col)):
                 self.board[coli][index] = CONST.CELL_EMPTY
-        pdebug(f"Board cleared: {self.board}")
+        self.bitboard.clear()
+        self.candidates.clear()
+        self.evaluator.clear()
+        self.hash = 0
+        self.hashes = [0] * CONST.SYMMETRIES
+        pdebug("Board cleared: %s", self.board)
 
     def recreate_board(self, size: Union[int, None] = None) -> None:
         """
@@ -67,25 +81,144 @@ class SystemBoard:
             self.create_board(size)
         self.clear_board()
 
+    def get_cell(self, row: int, col: int) -> int:
+        """
+        Get the content of a cell of the board.
+        """
+        return self.board[row][col]
+
+    def set_cell(self, row: int, col: int, value: int) -> None:
+        """
+        Set the content of a cell, keeping the bitboard, candidates, evaluator
+        and hash in sync.
+        """
+        previous: int = self.board[row][col]
+        self.board[row][col] = value
+        self.bitboard.set_cell(row, col, value)
+        self.evaluator.set_cell(row, col, value)
+        index: int = self.bitboard.index(row, col)
+        if previous != CONST.CELL_EMPTY:
+            self.hash = self.zobrist.toggle(self.hash, index, previous)
+            self.symmetry.toggle(self.hashes, index, previous)
+        if value != CONST.CELL_EMPTY:
+            self.hash = self.zobrist.toggle(self.hash, index, value)
+            self.symmetry.toggle(self.hashes, index, value)
+        if previous == CONST.CELL_EMPTY and value != CONST.CELL_EMPTY:
+            self.candidates.place(row, col)
+        elif previous != CONST.CELL_EMPTY and value == CONST.CELL_EMPTY:
+            self.candidates.remove(row, col)
+
+    def take_back(self, row: int, col: int) -> int:
+        """
+        Remove the stone of a cell and return its owner (CELL_EMPTY when
+        there was none). Every structure is updated for this cell only, as
+        set_cell does, so the position is not rebuilt.
+        """
+        previous: int = self.board[row][col]
+        if previous != CONST.CELL_EMPTY:
+            self.set_cell(row, col, CONST.CELL_EMPTY)
+        return previous
+
+    def load(self, stones: Dict[Tuple[int, int], int]) -> None:
+        """
+        Replace the position by the given stones ({(row, col): value}),
+        building the board, bitboard, candidates, evaluator and hashes in a
+        single pass instead of one cell at a time.
+        """
+        size: int = self.board_size
+        stride: int = size + 1
+        board: List[List[int]] = [[CONST.CELL_EMPTY] * size for _ in range(size)]
+        masks: Dict[int, int] = {CONST.CELL_PLAYER: 0, CONST.CELL_ENEMY: 0}
+        cells: Dict[int, int] = {}
+        for (row, col), value in stones.items():
+            if value == CONST.CELL_EMPTY:
+                continue
+            board[row][col] = value
+            index: int = row * stride + col
+            masks[value] |= 1 << index
+            cells[index] = value
+        self.board = board
+        self.bitboard.stones[CONST.CELL_PLAYER] = masks[CONST.CELL_PLAYER]
+        self.bitboard.stones[CONST.CELL_ENEMY] = masks[CONST.CELL_ENEMY]
+        self.candidates.load(cells)
+        self.evaluator.load(cells)
+        self.hashes = self.symmetry.hashes(masks)
+        self.hash = self.hashes[0]
+
+    def canonical(self) -> Tuple[int, int]:
+        """
+        Return the canonical key of the position (the smallest key of its
+        eight symmetric images) and the transform giving it.
+        """
+        return Symmetry.select(self.hashes)
+
+
+class ProtocolWriter:
+    """
+    The class in charge of the answers sent to the manager.
+    The lines are kept until flush, which sends them in a single write at
+    the end of a reply.
+    """
+
+    def __init__(self, stream: Union[TextIO, None] = None):
+        self.stream: Union[TextIO, None] = stream
+        self.pending: List[str] = []
+
+    def write(self, string: str) -> None:
+        """
+        Queue a line of the reply.
+        """
+        self.pending.append(string)
+
+    def flush(self) -> None:
+        """
+        Send the queued lines (to stdout when no stream is given).
+        """
+        if not self.pending:
+            return
+        stream = sys.stdout if self.stream is None else self.stream
+        stream.write("\n".join(self.pending) + "\n")
+        stream.flush()
+        self.pending.clear()
+
 
 class ParserThread:
     """
-        The class in charge of parsing the command line arguments while running in a thread.
+        The class in charge of processing the commands of the manager.
+        A single instance lives for the whole session, the commands are
+        dispatched through a table of handlers.
 
     Args:
-        Thread (_type_): _description_
-
-    Returns:
-        _type_: _description_
+        game_board (SystemBoard): The board of the game.
+        ai (AI): The AI answering the turns, None to only track the board.
+        output (ProtocolWriter, optional): The writer of the answers.
     """
 
-    def __init__(self, game_board: SystemBoard, ai: AI):
+    def __init__(self, game_board: SystemBoard, ai: AI, output: Union[ProtocolWriter, None] = None):
         self.ai: AI = ai
         self.completed: bool = False
         self.global_status = CONST.SUCCESS
         self.game_board: SystemBoard = game_board
+        self.output: ProtocolWriter = ProtocolWriter() if output is None else output
         self.board_mode: bool = False
         self.board_index: int = 0
+        self.board_lines: List[str] = []
+        self.ended: bool = False
+        self.folder: str = ""
+        self.trace: str = CONST.TRACE_OFF
+        self.trace_sink: Union[Logger, None] = None
+        self.set_trace(os.environ.get(CONST.ENV_TRACE, CONST.TRACE_OFF))
+        self.profiler: TurnProfiler = TurnProfiler()
+        self.handlers: Dict[str, Callable[[List[str]], int]] = {
+            CONST.CMD_START: self.process_start_command,
+            CONST.CMD_BEGIN: self.process_begin_command,
+            CONST.CMD_TURN: self.process_turn_command,
+            CONST.CMD_BOARD: self.process_board_start_command,
+            CONST.CMD_RESTART: self.process_restart_command,
+            CONST.CMD_TAKEBACK: self.process_takeback_command,
+            CONST.CMD_INFO: self.process_info_command,
+            CONST.CMD_END: self.process_end_command
+        }
 
     def update_global_status(self, status: bool) -> None:
         """
@@ -96,6 +229,29 @@ class ParserThread:
         if status != CONST.SUCCESS:
             self.global_status = status
 
+    def dispatch(self, line: str) -> int:
+        """
+        Process a line sent by the manager and send the reply.
+
+        Args:
+            line (str): The line, without its end of line.
+
+        Returns:
+            int: The status of the line.
+        """
+        cmd = line.split(" ")
+        command = cmd[0].upper()
+        if self.board_mode and command != CONST.CMD_END:
+            status = self.process_board_command(cmd)
+        elif command in CONST.COMMANDS:
+            status = self.process_command(cmd)
+        else:
+            self.output.write("UNKNOWN")
+            status = CONST.ERROR
+        self.update_global_status(status)
+        self.output.flush()
+        return status
+
     def process_command(self, cmd: List[str]) -> int:
         """
         Process the command given in the command line.
@@ -106,85 +262,111 @@ class ParserThread:
             int: _description_
         """
         command = cmd[0].upper()
-        # cmd_args = cmd[1:]
-        cmd_args = cmd
-        pdebug(f"Command: {command}, board_mode = {self.board_mode}")
-        if command == CONST.CMD_START:
-            pdebug("Processing start command")
-            status = self.process_start_command(cmd_args)
-            self.update_global_status(status)
-            self.completed = True
-            return status
-        if command == CONST.CMD_BEGIN:
-            pdebug("Processing begin command")
-            status = self.process_begin_command(cmd_args)
-            self.update_global_status(status)
-            self.completed = True
-            return status
-        if command == CONST.CMD_TURN:
-            pdebug("Processing turn command")
-            status = self.process_turn_command(cmd_args)
-            self.update_global_status(status)
-            self.completed = True
-            return status
-        if command == CONST.CMD_BOARD:
-            pdebug("Processing board command")
-            self.board_mode = True
-            self.board_index = 0
-            status = CONST.SUCCESS
-            self.update_global_status(status)
-            return status
-        if command == CONST.CMD_RESTART:
-            pdebug("Processing restart command")
-            status = self.process_restart_command(cmd_args)
-            self.update_global_status(status)
+        pdebug("Command: %s, board_mode = %s", command, self.board_mode)
+        handler = self.handlers.get(command)
+        if handler is None:
             self.completed = True
-            return status
-        self.completed = True
-        return CONST.SUCCESS
+            return CONST.SUCCESS
+        if command in CONST.TIMED_COMMANDS and self.ai is not None:
+            self.ai.time_manager.begin_turn()
+        status = handler(cmd)
+        self.update_global_status(status)
+        self.completed = command != CONST.CMD_BOARD
+        return status
 
     def process_ai_call(self) -> int:
         """
-        Process the result returned by the ai.
+        Process the result returned by the ai, under the profiler of the
+        turns when one is selected.
 
         Returns:
             int: _description_
         """
+        if self.profiler.mode != CONST.PROFILE_OFF:
+            return self.profiler.run(self._process_ai_call)
+        return self._process_ai_call()
+
+    def _process_ai_call(self) -> int:
+        """
+        Body of process_ai_call
+        """
         if self.ai is None:
             return CONST.SUCCESS
         if self.game_board.board == [] or self.game_board.board is None:
-            my_print("ERROR Board not created or empty")
+            self.output.write("ERROR Board not created or empty")
             return CONST.ERROR
-        response = self.ai.play_ai_turn(self.game_board.board)
+        response = self.ai.play_ai_turn(
+            self.game_board.bitboard,
+            self.game_board.candidates,
+            self.game_board.evaluator,
+            self.game_board.hash,
+            self.game_board.hashes
+        )
+        if self.trace != CONST.TRACE_OFF:
+            self.report_turn()
         x, y = response.split(",")
         if not x.isdigit() and not y.isdigit():
-            my_print(f"ERROR Invalid AI response: {response}")
+            self.output.write(f"ERROR Invalid AI response: {response}")
             self.update_global_status(CONST.ERROR)
             return CONST.ERROR
         x = int(x)
         y = int(y)
         if x < 0 or x >= self.game_board.board_size:
-            my_print(f"ERROR Invalid AI response: {x}")
+            self.output.write(f"ERROR Invalid AI response: {x}")
             self.update_global_status(CONST.ERROR)
             return CONST.ERROR
         if y < 0 or y >= self.game_board.board_size:
-            my_print(f"ERROR Invalid AI response: {y}")
+            self.output.write(f"ERROR Invalid AI response: {y}")
             self.update_global_status(CONST.ERROR)
             return CONST.ERROR
         if self.game_board.board[x][y] != CONST.CELL_EMPTY:
-            my_print(f"ERROR Invalid AI response: {response}")
+            self.output.write(f"ERROR Invalid AI response: {response}")
             self.update_global_status(CONST.ERROR)
             return CONST.ERROR
-        self.game_board.board[x][y] = CONST.CELL_PLAYER
-        my_print(response)
+        self.game_board.set_cell(x, y, CONST.CELL_PLAYER)
+        self.output.write(response)
+        self.output.flush()
+        self.ai.start_pondering(
+            self.game_board.bitboard,
+            self.game_board.candidates,
+            self.game_board.evaluator
+        )
         self.update_global_status(CONST.SUCCESS)
         return CONST.SUCCESS
 
+    def set_trace(self, mode: str) -> bool:
+        """
+        Select how the figures of the turns are reported (CONST.TRACE_MODES),
+        unknown modes are refused.
+        """
+        mode = mode.strip().lower()
+        if mode not in CONST.TRACE_MODES:
+            return False
+        if self.trace_sink is not None and mode != CONST.TRACE_FILE:
+            self.trace_sink.close()
+            self.trace_sink = None
+        self.trace = mode
+        return True
+
+    def report_turn(self) -> None:
+        """
+        Report the figures of the turn just played, before its move.
+        """
+        if self.trace == CONST.TRACE_MESSAGE:
+            self.output.write(f"MESSAGE {self.ai.turn_summary()}")
+        elif self.trace == CONST.TRACE_DEBUG:
+            self.output.write(f"DEBUG {self.ai.turn_summary()}")
+        elif self.trace == CONST.TRACE_FILE:
+            if self.trace_sink is None:
+                folder: str = self.folder if self.folder else temp_folder()
+                self.trace_sink = Logger(CONST.LOG_INFO, os.path.join(folder, CONST.TRACE_FILE_NAME))
+            self.trace_sink.write(json.dumps(self.ai.turn_statistics) + "\n")
+
     def print_success(self) -> None:
         """
         Print the success message.
         """
-        my_print("OK")
+        self.output.write("OK")
 
     def process_start_command(self, cmd: List[str]) -> int:
         """
@@ -197,16 +379,20 @@ class ParserThread:
             int: _description_
         """
         if len(cmd) != 2:
-            my_print(f"ERROR Unsupported number of arguments: {len(cmd)}")
+            self.output.write(f"ERROR Unsupported number of arguments: {len(cmd)}")
             return CONST.ERROR
         if not cmd[1].isdigit():
-            my_print(f"ERROR Invalid board size: {cmd[1]}")
+            self.output.write(f"ERROR Invalid board size: {cmd[1]}")
             return CONST.ERROR
         size = int(cmd[1])
         if size < 5:
-            my_print(f"ERROR Invalid board size: {cmd[1]}")
+            self.output.write(f"ERROR Invalid board size: {cmd[1]}")
             return CONST.ERROR
         self.game_board.create_board(size)
+        if self.ai is not None:
+            self.ai.reset()
+            self.ai.time_manager.reset()
+            self.ai.start_workers()
         self.print_success()
         return CONST.SUCCESS
 
@@ -221,51 +407,110 @@ class ParserThread:
             int: _description_
         """
         if len(cmd) != 1:
-            my_print(f"ERROR Unsupported number of arguments: {len(cmd)}")
+            self.output.write(f"ERROR Unsupported number of arguments: {len(cmd)}")
             return CONST.ERROR
         return self.process_ai_call()
 
-    def process_turn_command(self, cmd: List[str]) -> int:
+    def parse_cell(self, cmd: List[str]) -> Union[Tuple[int, int], None]:
         """
-        Process the turn command.
+        Read the cell of a TURN or TAKEBACK command ("x,y" or "x y"), the
+        errors are reported to the manager.
 
         Args:
             cmd (List[str]): _description_
 
         Returns:
-            int: _description_
+            Union[Tuple[int, int], None]: The row and column, None when invalid.
         """
         cmd_length = len(cmd)
         if cmd_length not in (2, 3):
-            my_print(f"ERROR Unsupported number of arguments: {len(cmd)}")
-            return CONST.ERROR
+            self.output.write(f"ERROR Unsupported number of arguments: {len(cmd)}")
+            return None
         if cmd_length == 2:
             turn_params = cmd[1].split(",")
             if len(turn_params) != 2:
-                my_print(f"ERROR Invalid turn parameters: {cmd[1]}")
-                return CONST.ERROR
+                self.output.write(f"ERROR Invalid turn parameters: {cmd[1]}")
+                return None
         else:
             turn_params = [cmd[1], cmd[2]]
         if not turn_params[0].isdigit() or not turn_params[1].isdigit():
-            my_print(f"ERROR Invalid turn parameters: {cmd[1]}")
-            return CONST.ERROR
+            self.output.write(f"ERROR Invalid turn parameters: {cmd[1]}")
+            return None
         row = int(turn_params[0])
         col = int(turn_params[1])
         if row < 0 or row >= self.game_board.board_size:
-            my_print(f"ERROR Invalid turn parameters: {row}")
-            return CONST.ERROR
+            self.output.write(f"ERROR Invalid turn parameters: {row}")
+            return None
         if col < 0 or col >= self.game_board.board_size:
-            my_print(f"ERROR Invalid turn parameters: {col}")
+            self.output.write(f"ERROR Invalid turn parameters: {col}")
+            return None
+        return row, col
+
+    def process_turn_command(self, cmd: List[str]) -> int:
+        """
+        Process the turn command.
+
+        Args:
+            cmd (List[str]): _description_
+
+        Returns:
+            int: _description_
+        """
+        cell = self.parse_cell(cmd)
+        if cell is None:
             return CONST.ERROR
+        row, col = cell
         if self.game_board.board[row][col] != CONST.CELL_EMPTY:
-            my_print(f"ERROR Invalid board cell: {row},{col}")
+            self.output.write(f"ERROR Invalid board cell: {row},{col}")
             return CONST.ERROR
-        self.game_board.board[row][col] = CONST.CELL_ENEMY
+        self.game_board.set_cell(row, col, CONST.CELL_ENEMY)
         return self.process_ai_call()
 
+    def process_takeback_command(self, cmd: List[str]) -> int:
+        """
+        Process the takeback command: remove the stone of the cell, undoing
+        it in every structure of the board and in the tree of the AI
+        instead of rebuilding them.
+
+        Args:
+            cmd (List[str]): _description_
+
+        Returns:
+            int: _description_
+        """
+        cell = self.parse_cell(cmd)
+        if cell is None:
+            return CONST.ERROR
+        row, col = cell
+        player = self.game_board.get_cell(row, col)
+        if player == CONST.CELL_EMPTY:
+            self.output.write(f"ERROR Invalid board cell: {row},{col}")
+            return CONST.ERROR
+        if self.ai is not None:
+            self.ai.take_back(self.game_board.bitboard.index(row, col), player)
+        self.game_board.take_back(row, col)
+        self.print_success()
+        return CONST.SUCCESS
+
+    def process_board_start_command(self, cmd: List[str]) -> int:
+        """
+        Process the board command: the next lines are cells, up to DONE.
+
+        Args:
+            cmd (List[str]): _description_
+
+        Returns:
+            int: _description_
+        """
+        self.board_mode = True
+        self.board_index = 0
+        self.board_lines = []
+        return CONST.SUCCESS
+
     def process_board_command(self, cmd: List[str]) -> int:
         """
-        Process the board command.
+        Process a line of the board command. The cells are collected until
+        DONE, then the whole position is loaded at once and the AI plays.
 
         Args:
             cmd (List[str]): _description_
@@ -276,38 +521,96 @@ class ParserThread:
         if cmd[0] == "":
             return CONST.SUCCESS
         if self.game_board.board == [] or self.game_board.board is None:
-            my_print("ERROR Board not created or empty")
+            self.output.write("ERROR Board not created or empty")
             return CONST.ERROR
         if cmd[0].upper() == "DONE":
             self.board_mode = False
-            return self.process_ai_call()
-        board_line = cmd[0].split(",")
-        if len(board_line) != 3:
-            my_print(f"ERROR Invalid board line: {cmd[0]}")
-            return CONST.ERROR
-        if not board_line[0].isdigit() or not board_line[1].isdigit():
-            my_print(f"ERROR Invalid board line: {cmd[0]}")
-            return CONST.ERROR
-        row = int(board_line[0])
-        col = int(board_line[1])
-        value = CONST.BOARD_EQUIVALENCE.get(board_line[2])
-        pdebug(
-            f"Board line: {board_line}, value: {value}," +
-            f" row: {row}, col: {col}"
-        )
-        if value is None:
-            my_print(f"ERROR Invalid board value: {board_line[2]}")
-            return CONST.ERROR
-        if row < 0 or row >= self.game_board.board_size:
-            my_print(f"ERROR Invalid board row: {row}")
-            return CONST.ERROR
-        if col < 0 or col >= self.game_board.board_size:
-            my_print(f"ERROR Invalid board col: {col}")
-            return CONST.ERROR
-        if self.game_board.board[row] == []:
-            my_print(f"ERROR Board row not created: {row}")
-            return CONST.ERROR
-        self.game_board.board[row][col] = value
+            status = self.load_board_lines()
+            ai_status = self.process_ai_call()
+            return ai_status if status == CONST.SUCCESS else status
+        self.board_lines.append(cmd[0])
+        return CONST.SUCCESS
+
+    def load_board_lines(self) -> int:
+        """
+        Validate the collected board lines in one pass and load the valid
+        cells into the board, the invalid ones are reported and skipped.
+
+        Returns:
+            int: CONST.ERROR if a line was invalid.
+        """
+        size: int = self.game_board.board_size
+        stones: Dict[Tuple[int, int], int] = {}
+        status: int = CONST.SUCCESS
+        for line in self.board_lines:
+            board_line = line.split(",")
+            if len(board_line) != 3 or not board_line[0].isdigit() or not board_line[1].isdigit():
+                self.output.write(f"ERROR Invalid board line: {line}")
+                status = CONST.ERROR
+                continue
+            row = int(board_line[0])
+            col = int(board_line[1])
+            value = CONST.BOARD_EQUIVALENCE.get(board_line[2])
+            if value is None:
+                self.output.write(f"ERROR Invalid board value: {board_line[2]}")
+                status = CONST.ERROR
+            elif row >= size:
+                self.output.write(f"ERROR Invalid board row: {row}")
+                status = CONST.ERROR
+            elif col >= size:
+                self.output.write(f"ERROR Invalid board col: {col}")
+                status = CONST.ERROR
+            else:
+                stones[(row, col)] = value
+        self.board_lines = []
+        self.game_board.load(stones)
+        pdebug("Board loaded: %d cells", len(stones))
+        return status
+
+    def process_info_command(self, cmd: List[str]) -> int:
+        """
+        Process the info command.
+        The manager does not read any answer to INFO, unusable keys are ignored.
+
+        Args:
+            cmd (List[str]): _description_
+
+        Returns:
+            int: _description_
+        """
+        if len(cmd) < 3 or self.ai is None:
+            return CONST.SUCCESS
+        key = cmd[1].lower()
+        value = cmd[2]
+        if key == CONST.INFO_FOLDER:
+            folder = " ".join(cmd[2:])
+            self.folder = folder
+            if self.ai.book.open(folder):
+                pdebug("Opening book loaded from %s", folder)
+            return CONST.SUCCESS
+        if key == CONST.INFO_PONDER:
+            self.ai.ponder = value != "0"
+            pdebug("Pondering set to %s", self.ai.ponder)
+            return CONST.SUCCESS
+        if key == CONST.INFO_PROFILE:
+            if self.profiler.set_mode(value):
+                pdebug("Profiler set to %s", value)
+            return CONST.SUCCESS
+        if key == CONST.INFO_TRACE:
+            if self.set_trace(value):
+                pdebug("Trace set to %s", value)
+            return CONST.SUCCESS
+        if key == CONST.INFO_MAX_MEMORY:
+            if value.isdigit():
+                self.ai.set_memory(int(value))
+                pdebug("Memory budget set to %d bytes per process", self.ai.memory.total())
+            return CONST.SUCCESS
+        if key == CONST.INFO_ENGINE:
+            if self.ai.set_engine(value):
+                pdebug("Engine set to %s", value)
+            return CONST.SUCCESS
+        if self.ai.time_manager.update(key, value):
+            pdebug("Info %s set to %s", key, value)
         return CONST.SUCCESS
 
     def process_restart_command(self, cmd: List[str]) -> int:
@@ -321,26 +624,62 @@ class ParserThread:
             int: _description_
         """
         if len(cmd) != 1:
-            my_print(f"ERROR Invalid restart command: {cmd}")
+            self.output.write(f"ERROR Invalid restart command: {cmd}")
             return CONST.ERROR
         self.game_board.recreate_board()
+        if self.ai is not None:
+            self.ai.reset()
+            self.ai.time_manager.reset()
         self.print_success()
         return CONST.SUCCESS
 
+    def process_end_command(self, cmd: List[str]) -> int:
+        """
+        Process the end command: release the workers and the book.
+
+        Args:
+            cmd (List[str]): _description_
+
+        Returns:
+            int: _description_
+        """
+        if self.ai is not None:
+            self.ai.stop_workers()
+            self.ai.book.close()
+        LOGGER.close()
+        if self.trace_sink is not None:
+            self.trace_sink.close()
+        self.ended = True
+        return CONST.SUCCESS
+
 
 class Parser:
     """
     This class is the parser for the command line arguments.
+    It reads the lines of the manager from the binary standard input and
+    hands them to a single command processor.
     """
 
-    def __init__(self):
+    def __init__(self, stdin: Union[BinaryIO, None] = None):
         self.thread_timeout: int = 2
         self.global_status = CONST.SUCCESS
         self.continue_running: bool = True
-        self.board_mode: bool = False
+        self.stdin: Union[BinaryIO, None] = stdin
         self.board: List[List[int]]
         self.game_board = SystemBoard()
-        self.ai: AI = AI()
+        self.output: ProtocolWriter = ProtocolWriter()
+        self.processor: ParserThread = ParserThread(self.game_board, AI(), self.output)
+
+    @property
+    def ai(self) -> AI:
+        """
+        The AI answering the turns.
+        """
+        return self.processor.ai
+
+    @ai.setter
+    def ai(self, ai: AI) -> None:
+        self.processor.ai = ai
 
     def update_global_status(self, status: bool) -> None:
         """
@@ -354,32 +693,27 @@ class Parser:
     def __call__(self, single_turn: bool = False) -> int:
         """_summary_
             The function in charge of processing the incoming commands.
+            The end of the input ends the session like END.
 
         Returns:
             int: _description_
         """
-        node = ParserThread(self.game_board, self.ai)
+        stream = sys.stdin.buffer if self.stdin is None else self.stdin
+        readline = stream.readline
+        processor = self.processor
         while self.continue_running or single_turn:
-            data = input()
-            cmd_line = data.split(" ")
-            cmd_bin = cmd_line[0].upper()
-            if cmd_bin == CONST.CMD_END:
+            data = readline()
+            if self.ai is not None:
+                self.ai.stop_pondering()
+            if not data:
+                processor.process_end_command([CONST.CMD_END])
+                self.continue_running = False
+                break
+            status = processor.dispatch(data.decode("utf-8", "replace").rstrip("\r\n"))
+            self.update_global_status(status)
+            if processor.ended:
+                processor.ended = False
                 self.continue_running = False
-                self.update_global_status(CONST.SUCCESS)
-                continue
-            if self.board_mode is True:
-                node.board_mode = True
-                status = node.process_board_command(cmd_line)
-                node.update_global_status(status)
-                self.update_global_status(status)
                 continue
-            if cmd_bin in CONST.COMMANDS:
-                node = ParserThread(self.game_board, self.ai)
-                node.process_command(cmd_line)
-                if node.board_mode is True:
-                    self.board_mode = True
-            else:
-                my_print("UNKNOWN")
-                self.update_global_status(CONST.ERROR)
             single_turn = False
         return self.global_status
@@ -0,0 +1,175 @@
+"""
+This file contains the profiler of the turns of the brain.
+
+When enabled ("INFO profile <mode>" or the environment variable), every turn
+played for the manager runs under a profiler and leaves its files in the
+temporary folder, named after the process and the number of the turn:
+- cprofile: the deterministic profile of the turn (.pstats, to read with
+  pstats or snakeviz) and its calls as collapsed stacks (.collapsed), built
+  from the call graph of the profile;
+- sample: a thread records the stack of the playing thread every
+  PROFILE_INTERVAL seconds, written as collapsed stacks (.collapsed), one
+  "frame;frame;frame count" line per stack, ready for flamegraph.pl or
+  speedscope. It costs much less than cProfile and keeps the real times,
+  but it can only read the stack when the playing thread releases the GIL
+  (every 5 ms by default), which bounds its resolution.
+
+Only the thread playing the turn is profiled: the pondering thread and the
+worker processes are not.
+"""
+
+import os
+import sys
+import pstats
+import cProfile
+import threading
+from types import FrameType
+from typing import Callable, Dict, List, Optional, Tuple
+from . import constants as CONST
+from .logger import temp_folder
+
+Function = Tuple[str, int, str]
+
+
+def frame_name(filename: str, line: int, name: str) -> str:
+    """
+    Return the name of a function in the collapsed stacks.
+    """
+    if filename == "~":
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def collapse_profile(profile: cProfile.Profile) -> Dict[str, float]:
+    """
+    Turn the call graph of a profile into collapsed stacks weighted by the
+    own time (microseconds) of their last function. cProfile only knows the
+    direct callers of a function, so its time is shared among its callers in
+    proportion to the cumulative time it spent for each of them.
+    """
+    stats: Dict[Function, tuple] = pstats.Stats(profile).stats
+    callees: Dict[Function, List[Tuple[Function, float]]] = {function: [] for function in stats}
+    for function, (_, _, _, cumulative, callers) in stats.items():
+        for caller, (calls, _, _, caller_cumulative) in callers.items():
+            if caller not in callees:
+                continue
+            if cumulative > 0:
+                share: float = caller_cumulative / cumulative
+            else:
+                share = calls / max(1, stats[function][1])
+            callees[caller].append((function, share))
+    stacks: Dict[str, float] = {}
+
+    def walk(function: Function, stack: str, share: float, seen: Tuple[Function, ...]) -> None:
+        own_time: float = share * stats[function][2]
+        if own_time > 0:
+            stacks[stack] = stacks.get(stack, 0.0) + own_time * 1e6
+        for callee, callee_share in callees[function]:
+            if callee not in seen and callee_share > 0:
+                walk(callee, f"{stack};{frame_name(*callee)}", share * callee_share, seen + (callee,))
+
+    for function, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            walk(function, frame_name(*function), 1.0, (function,))
+    return stacks
+
+
+class TurnProfiler:
+    """
+    The class in charge of running the turns under the selected profiler
+    and of writing their files (files holds the ones of the last turn).
+    """
+
+    def __init__(self, mode: Optional[str] = None, folder: Optional[str] = None):
+        self.mode: str = CONST.PROFILE_OFF
+        self.folder: Optional[str] = folder
+        self.interval: float = CONST.PROFILE_INTERVAL
+        self.turn: int = 0
+        self.files: List[str] = []
+        self.set_mode(os.environ.get(CONST.ENV_PROFILE, CONST.PROFILE_OFF) if mode is None else mode)
+
+    def set_mode(self, mode: str) -> bool:
+        """
+        Select the profiler (CONST.PROFILE_MODES), unknown modes are refused.
+        """
+        mode = mode.strip().lower()
+        if mode not in CONST.PROFILE_MODES:
+            return False
+        self.mode = mode
+        return True
+
+    def _path(self, extension: str) -> str:
+        """
+        Return the path of a file of the current turn.
+        """
+        folder: str = self.folder if self.folder is not None else temp_folder()
+        path: str = os.path.join(folder, f"{CONST.PROFILE_FILE_PREFIX}-{os.getpid()}-{self.turn:04d}{extension}")
+        self.files.append(path)
+        return path
+
+    def run(self, function: Callable[[], int]) -> int:
+        """
+        Call function under the selected profiler and write the files of the turn.
+        """
+        if self.mode == CONST.PROFILE_OFF:
+            return function()
+        self.turn += 1
+        self.files = []
+        if self.mode == CONST.PROFILE_CPROFILE:
+            return self._run_cprofile(function)
+        return self._run_sampling(function)
+
+    def _run_cprofile(self, function: Callable[[], int]) -> int:
+        """
+        Call function under cProfile.
+        """
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(function)
+        finally:
+            profile.dump_stats(self._path(CONST.PROFILE_PSTATS))
+            self._write_stacks({stack: round(weight) for stack, weight in collapse_profile(profile).items()})
+
+    def _run_sampling(self, function: Callable[[], int]) -> int:
+        """
+        Call function while a thread samples the stack of the calling thread.
+        """
+        stacks: Dict[str, int] = {}
+        done = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample,
+            args=(threading.get_ident(), sys._getframe(), stacks, done),
+            daemon=True
+        )
+        sampler.start()
+        try:
+            return function()
+        finally:
+            done.set()
+            sampler.join()
+            self._write_stacks(stacks)
+
+    def _sample(self, thread_id: int, root: FrameType, stacks: Dict[str, int], done: threading.Event) -> None:
+        """
+        Body of the sampling thread: count the stacks of the profiled thread
+        (the frames below root) until done.
+        """
+        while not done.wait(self.interval):
+            frame: Optional[FrameType] = sys._current_frames().get(thread_id)
+            names: List[str] = []
+            while frame is not None and frame is not root:
+                code = frame.f_code
+                names.append(frame_name(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if names and not done.is_set():
+                stack: str = ";".join(reversed(names))
+                stacks[stack] = stacks.get(stack, 0) + 1
+
+    def _write_stacks(self, stacks: Dict[str, int]) -> None:
+        """
+        Write the collapsed stacks of the turn, heaviest first.
+        """
+        with open(self._path(CONST.PROFILE_COLLAPSED), "w", encoding="utf-8") as output:
+            for stack, count in sorted(stacks.items(), key=lambda item: -item[1]):
+                if count > 0:
+                    output.write(f"{stack} {count}\n")
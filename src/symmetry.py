@@ -0,0 +1,139 @@
+"""
+This file contains the canonical keys of the positions.
+
+A square board has 8 symmetries (the rotations and the reflections), and the
+eight images of a position are worth the same. The canonical key of a
+position is the smallest of the Zobrist keys of its eight images, together
+with the transform giving it: a structure keyed by canonical keys stores a
+position once for its eight images, and the moves it stores are mapped into
+the canonical frame (to_canonical) and back onto the board (from_canonical).
+Transform 0 is the identity, so its key is the plain Zobrist key.
+The maps and keys of a size are computed once and shared by every instance.
+"""
+
+from typing import Dict, List, Tuple
+from . import constants as CONST
+from .zobrist import Zobrist
+
+# Maps, inverse transforms and keys computed for each board size
+_TABLES: Dict[int, Tuple[List[List[int]], List[int], List[List[List[int]]]]] = {}
+
+
+class Symmetry:
+    """
+    The class in charge of the eight transforms of a board size.
+    Cells are indexed like the bitboard (y * (size + 1) + x).
+    """
+
+    def __init__(self, size: int = 0):
+        self.size: int = 0
+        self.stride: int = 1
+        self.maps: List[List[int]] = []
+        self.inverse: List[int] = []
+        self.keys: List[List[List[int]]] = []
+        self.create(size)
+
+    def create(self, size: int = 0) -> None:
+        """
+        Precompute the cell maps and the keys of every transform, or take
+        them from a previous instance of the same size.
+        Transform t swaps the axes when bit 0 is set, then flips the rows
+        (bit 1) and the columns (bit 2).
+        """
+        self.size = size
+        self.stride = size + 1
+        tables = _TABLES.get(size)
+        if tables is not None:
+            self.maps, self.inverse, self.keys = tables
+            return
+        length: int = size * self.stride
+        last: int = size - 1
+        self.maps = []
+        for transform in range(CONST.SYMMETRIES):
+            cells: List[int] = list(range(length))
+            for y in range(size):
+                for x in range(size):
+                    row, col = (x, y) if transform & 1 else (y, x)
+                    if transform & 2:
+                        row = last - row
+                    if transform & 4:
+                        col = last - col
+                    cells[y * self.stride + x] = row * self.stride + col
+            self.maps.append(cells)
+        self.inverse = [
+            next(
+                other for other in range(CONST.SYMMETRIES)
+                if all(self.maps[other][self.maps[transform][index]] == index for index in range(length))
+            )
+            for transform in range(CONST.SYMMETRIES)
+        ]
+        zobrist = Zobrist(size)
+        self.keys = [
+            [[keys[cell] for cell in cells] for keys in zobrist.keys]
+            for cells in self.maps
+        ]
+        _TABLES[size] = (self.maps, self.inverse, self.keys)
+
+    def hashes(self, stones: Dict[int, int]) -> List[int]:
+        """
+        Return the Zobrist keys of the eight images of the stones ({player: mask}).
+        """
+        result: List[int] = [0] * CONST.SYMMETRIES
+        for player, mask in stones.items():
+            keys: List[List[int]] = [self.keys[transform][player] for transform in range(CONST.SYMMETRIES)]
+            while mask:
+                low: int = mask & -mask
+                index: int = low.bit_length() - 1
+                for transform in range(CONST.SYMMETRIES):
+                    result[transform] ^= keys[transform][index]
+                mask ^= low
+        return result
+
+    def toggle(self, hashes: List[int], index: int, player: int) -> None:
+        """
+        Add or remove the stone of player on the cell of index index in the
+        eight keys given by hashes (updated in place).
+        """
+        keys = self.keys
+        for transform in range(CONST.SYMMETRIES):
+            hashes[transform] ^= keys[transform][player][index]
+
+    @staticmethod
+    def select(hashes: List[int]) -> Tuple[int, int]:
+        """
+        Return the canonical key among the eight keys and its transform.
+        """
+        key: int = min(hashes)
+        return key, hashes.index(key)
+
+    def canonical(self, stones: Dict[int, int]) -> Tuple[int, int]:
+        """
+        Return the canonical key of the stones ({player: mask}) and the
+        transform mapping the board onto the canonical frame.
+        """
+        return self.select(self.hashes(stones))
+
+    def to_canonical(self, index: int, transform: int) -> int:
+        """
+        Map a cell of the board into the canonical frame.
+        """
+        return self.maps[transform][index]
+
+    def from_canonical(self, index: int, transform: int) -> int:
+        """
+        Map a cell of the canonical frame back onto the board.
+        """
+        return self.maps[self.inverse[transform]][index]
+
+    def cell_to_canonical(self, row: int, col: int, transform: int) -> Tuple[int, int]:
+        """
+        Map a (row, column) cell of the board into the canonical frame.
+        """
+        return divmod(self.maps[transform][row * self.stride + col], self.stride)
+
+    def cell_from_canonical(self, row: int, col: int, transform: int) -> Tuple[int, int]:
+        """
+        Map a (row, column) cell of the canonical frame back onto the board.
+        """
+        return divmod(self.from_canonical(row * self.stride + col, transform), self.stride)
+
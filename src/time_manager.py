@@ -0,0 +1,106 @@
+"""
+This file contains the time manager in charge of the thinking time of the AI.
+
+The limits are the ones sent by the manager through the INFO command
+(in milliseconds), the budgets and deadlines it gives are in seconds.
+"""
+
+import time
+from typing import Union
+from . import constants as CONST
+
+
+class TimeManager:
+    """
+    The class in charge of turning the INFO time limits into a deadline for the turn.
+    """
+
+    def __init__(self):
+        self.timeout_turn: int = CONST.DEFAULT_TIMEOUT_TURN
+        self.timeout_match: int = CONST.DEFAULT_TIMEOUT_MATCH
+        self.time_left: Union[int, None] = None
+        self.turn_start: Union[float, None] = None
+
+    def reset(self) -> None:
+        """
+        Go back to the default limits.
+        """
+        self.timeout_turn = CONST.DEFAULT_TIMEOUT_TURN
+        self.timeout_match = CONST.DEFAULT_TIMEOUT_MATCH
+        self.time_left = None
+        self.turn_start = None
+
+    def update(self, key: str, value: str) -> bool:
+        """
+        Update a limit from an INFO key, return False if the key or the value is not usable.
+        """
+        if key not in (CONST.INFO_TIMEOUT_TURN, CONST.INFO_TIMEOUT_MATCH, CONST.INFO_TIME_LEFT):
+            return False
+        try:
+            milliseconds = int(value)
+        except ValueError:
+            return False
+        if key == CONST.INFO_TIMEOUT_TURN:
+            self.timeout_turn = max(0, milliseconds)
+        elif key == CONST.INFO_TIMEOUT_MATCH:
+            self.timeout_match = max(0, milliseconds)
+        else:
+            self.time_left = milliseconds
+        return True
+
+    def begin_turn(self, start: Union[float, None] = None) -> None:
+        """
+        Mark the moment the manager started counting the time of the turn.
+        """
+        if start is None:
+            start = time.time()
+        self.turn_start = start
+
+    def _margin(self, seconds: float) -> float:
+        """
+        The part of a time limit kept for the process and I/O overhead.
+        """
+        return max(CONST.TIME_MARGIN_MIN, seconds * CONST.TIME_MARGIN_RATIO)
+
+    def match_limited(self) -> bool:
+        """
+        Tell if the remaining time of the match has to be shared between the moves.
+        """
+        if self.time_left is None:
+            return False
+        return self.time_left != CONST.TIME_LEFT_UNLIMITED
+
+    def turn_budget(self, stones: int = 0, criticality: float = 1.0) -> float:
+        """
+        Compute the thinking time (seconds) of the turn.
+        stones is the number of stones on the board, used to guess how many
+        moves are left, criticality stretches (> 1) or shrinks (< 1) the share
+        of the match time given to this move.
+        """
+        if self.timeout_turn == 0:
+            return CONST.TIME_FAST_MOVE
+        turn_seconds: float = self.timeout_turn / 1000
+        budget: float = turn_seconds - self._margin(turn_seconds)
+        if self.match_limited():
+            left_seconds: float = self.time_left / 1000
+            if left_seconds <= 0:
+                return CONST.TIME_FAST_MOVE
+            moves_to_go: int = max(
+                CONST.TIME_MIN_MOVES_TO_GO,
+                CONST.TIME_EXPECTED_MOVES - stones // 2
+            )
+            share: float = left_seconds / moves_to_go * criticality
+            reserve: float = left_seconds * CONST.TIME_MAX_SHARE - self._margin(left_seconds)
+            budget = min(budget, share, reserve)
+        elif criticality < 1.0:
+            budget *= criticality
+        return max(CONST.TIME_FAST_MOVE, budget)
+
+    def deadline(self, stones: int = 0, criticality: float = 1.0) -> float:
+        """
+        Give the time.time() based deadline of the turn and close the turn.
+        The turn starts at the last begin_turn call, or now if there was none.
+        """
+        start: float = self.turn_start if self.turn_start is not None else time.time()
+        self.turn_start = None
+        return start + self.turn_budget(stones, criticality)
@@ -0,0 +1,187 @@
+"""
+This file contains the Zobrist hashing of the positions and the
+transposition table storing search results by position.
+
+The key of a position is the xor of one random 64 bit number per stone
+(player and cell), so placing or removing a stone is a single xor. The keys
+are drawn from a seeded generator: every table created for the same board
+size gives the same keys, whatever the process.
+"""
+
+import random
+from typing import List, Tuple, Union
+from . import constants as CONST
+
+
+class Zobrist:
+    """
+    The class in charge of the random keys of every (player, cell) pair.
+    Cells are indexed like the bitboard (y * (size + 1) + x).
+    """
+
+    def __init__(self, size: int = 0):
+        self.size: int = 0
+        self.stride: int = 1
+        self.keys: List[List[int]] = [[], [], []]
+        self.create(size)
+
+    def create(self, size: int = 0) -> None:
+        """
+        Draw the keys for a board of the given size.
+        """
+        self.size = size
+        self.stride = size + 1
+        generator = random.Random(CONST.ZOBRIST_SEED)
+        length: int = size * self.stride
+        self.keys = [[0] * length]
+        for _ in (CONST.CELL_PLAYER, CONST.CELL_ENEMY):
+            self.keys.append([generator.getrandbits(64) for _ in range(length)])
+
+    def toggle(self, key: int, index: int, player: int) -> int:
+        """
+        Add or remove the stone of player on the cell of index index.
+        """
+        return key ^ self.keys[player][index]
+
+    def hash_board(self, board: List[List[int]]) -> int:
+        """
+        Compute the key of a list based board.
+        """
+        key: int = 0
+        for y, row in enumerate(board):
+            for x, cell in enumerate(row):
+                if cell != CONST.CELL_EMPTY:
+                    key ^= self.keys[cell][y * self.stride + x]
+        return key
+
+    def hash_stones(self, stones: dict) -> int:
+        """
+        Compute the key of the stones of a bitboard ({player: mask}).
+        """
+        key: int = 0
+        for player, mask in stones.items():
+            keys = self.keys[player]
+            while mask:
+                low: int = mask & -mask
+                key ^= keys[low.bit_length() - 1]
+                mask ^= low
+        return key
+
+
+class TranspositionTable:
+    """
+    The class in charge of a fixed size table of search results.
+    Each bucket holds two entries: the first one is only replaced by a
+    result of greater or equal depth (depth-preferred), the second one is
+    always replaced. For the tree search the depth is the number of visits.
+    The number of filled slots is counted to estimate the size of the table.
+    """
+
+    def __init__(self, buckets: int = CONST.TT_BUCKETS):
+        self.buckets: int = 1
+        while self.buckets < buckets:
+            self.buckets <<= 1
+        self.mask: int = self.buckets - 1
+        self.keys: List[int] = []
+        self.depths: List[int] = []
+        self.visits: List[int] = []
+        self.values: List[float] = []
+        self.moves: List[int] = []
+        self.used: int = 0
+        self.lookups: int = 0
+        self.hits: int = 0
+        self.clear()
+
+    @staticmethod
+    def buckets_for(memory: int) -> int:
+        """
+        Return the most buckets (a power of two) a full table can have in memory bytes.
+        """
+        buckets: int = CONST.TT_MIN_BUCKETS
+        while 2 * buckets * 2 * (CONST.TT_SLOT_BYTES + CONST.TT_ENTRY_BYTES) <= memory:
+            buckets <<= 1
+        return buckets
+
+    def clear(self) -> None:
+        """
+        Forget every entry and the statistics.
+        """
+        length: int = self.buckets * 2
+        self.keys = [0] * length
+        self.depths = [-1] * length
+        self.visits = [0] * length
+        self.values = [0.0] * length
+        self.moves = [-1] * length
+        self.used = 0
+        self.lookups = 0
+        self.hits = 0
+
+    def resize(self, buckets: int) -> None:
+        """
+        Change the number of buckets (rounded up to a power of two), the
+        entries are forgotten when it changes.
+        """
+        size: int = 1
+        while size < buckets:
+            size <<= 1
+        if size == self.buckets:
+            return
+        self.buckets = size
+        self.mask = size - 1
+        self.clear()
+
+    def memory(self) -> int:
+        """
+        Return the estimated size of the table in bytes.
+        """
+        return 2 * self.buckets * CONST.TT_SLOT_BYTES + self.used * CONST.TT_ENTRY_BYTES
+
+    def _slot(self, key: int) -> int:
+        """
+        Find the slot holding key, -1 if the key is not stored.
+        """
+        slot: int = (key & self.mask) << 1
+        if self.depths[slot] >= 0 and self.keys[slot] == key:
+            return slot
+        if self.depths[slot + 1] >= 0 and self.keys[slot + 1] == key:
+            return slot + 1
+        return -1
+
+    def probe(self, key: int) -> Union[Tuple[int, float, int, int], None]:
+        """
+        Return (visits, value, best move, depth) stored for key, or None.
+        """
+        self.lookups += 1
+        slot: int = self._slot(key)
+        if slot == -1:
+            return None
+        self.hits += 1
+        return (self.visits[slot], self.values[slot], self.moves[slot], self.depths[slot])
+
+    def store(self, key: int, visits: int, value: float, move: int, depth: int) -> None:
+        """
+        Store a result, following the replacement policy of the buckets.
+        """
+        slot: int = self._slot(key)
+        if slot == -1:
+            slot = (key & self.mask) << 1
+            if depth < self.depths[slot]:
+                slot += 1
+            if self.depths[slot] < 0:
+                self.used += 1
+        self.keys[slot] = key
+        self.depths[slot] = depth
+        self.visits[slot] = visits
+        self.values[slot] = value
+        self.moves[slot] = move
+
+    def hit_rate(self) -> float:
+        """
+        Return the part of the lookups that found their key.
+        """
+        if self.lookups == 0:
+            return 0.0
+        return self.hits / self.lookups
+
+    def __len__(self) -> int:
+        return self.used
@@ -0,0 +1,111 @@
+"""
+    File in charge of testing the alignment (win) checkers of the AI.
+"""
+
+import os
+import sys
+import random
+from typing import List
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+AII: AI = AI()
+
+SEED = 42
+GAMES_PER_SIZE = 30
+
+
+def empty_board(size: int) -> List[List[int]]:
+    """
+    Create an empty square board.
+    """
+    return [[CONST.CELL_EMPTY for _ in range(size)] for _ in range(size)]
+
+
+def test_check_all_alignments_directions():
+    """
+    Test that the full scan finds five stones in every direction.
+    """
+    for dy, dx in CONST.ALIGNMENT_DIRECTIONS:
+        board = empty_board(20)
+        start_x = 10 if dx < 0 else 3
+        for step in range(CONST.WIN_LENGTH):
+            board[4 + step * dy][start_x + step * dx] = CONST.CELL_PLAYER
+        assert AII._check_all_alignments(board, CONST.CELL_PLAYER) is True
+        assert AII._check_all_alignments(board, CONST.CELL_ENEMY) is False
+
+
+def test_check_all_alignments_four_is_not_a_win():
+    """
+    Test that four stones, even at the edge of the board, do not win.
+    """
+    board = empty_board(20)
+    for x in range(1, 5):
+        board[0][x] = CONST.CELL_PLAYER
+    assert AII._check_all_alignments(board, CONST.CELL_PLAYER) is False
+
+
+def test_check_all_alignments_no_row_wrap():
+    """
+    Test that a line split across the end of a row is not a win.
+    """
+    board = empty_board(20)
+    for x in range(17, 20):
+        board[2][x] = CONST.CELL_PLAYER
+    for x in range(0, 2):
+        board[3][x] = CONST.CELL_PLAYER
+    assert AII._check_all_alignments(board, CONST.CELL_PLAYER) is False
+
+
+def test_check_win_from_move_gap_filled():
+    """
+    Test that filling the middle of a broken line is detected.
+    """
+    board = empty_board(15)
+    for x in (5, 6, 8, 9):
+        board[7][x] = CONST.CELL_ENEMY
+    assert AII._check_win_from_move(board, 7, 6, CONST.CELL_ENEMY) is False
+    board[7][7] = CONST.CELL_ENEMY
+    assert AII._check_win_from_move(board, 7, 7, CONST.CELL_ENEMY) is True
+
+
+def test_check_win_from_move_matches_full_scan():
+    """
+    Test that the last move checker agrees with the full scan on random games.
+    """
+    rng = random.Random(SEED)
+    for size in (5, 15, 20):
+        for _ in range(GAMES_PER_SIZE):
+            board = empty_board(size)
+            cells = [(y, x) for y in range(size) for x in range(size)]
+            rng.shuffle(cells)
+            player = CONST.CELL_PLAYER
+            for y, x in cells:
+                board[y][x] = player
+                incremental = AII._check_win_from_move(board, y, x, player)
+                full = AII._check_all_alignments(board, player)
+                assert incremental == full
+                if full:
+                    break
+                player = 3 - player
+
+
+def test_simulate_random_game_restores_board():
+    """
+    Test that a playout leaves the board untouched.
+    """
+    random.seed(SEED)
+    board = empty_board(20)
+    board[10][10] = CONST.CELL_PLAYER
+    board[10][11] = CONST.CELL_ENEMY
+    snapshot = [list(row) for row in board]
+    for _ in range(20):
+        result = AII._simulate_random_game(board, CONST.CELL_PLAYER, 7)
+        assert result in (-1, 0, 1)
+        assert board == snapshot
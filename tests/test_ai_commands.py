@@ -6,13 +6,13 @@ import os
 import sys
 import unittest.mock
 from typing import List
-from io import StringIO
+from io import BytesIO, StringIO, TextIOWrapper
 from pytest import CaptureFixture
 
 sys.path.append(os.getcwd())
 sys.path.append(os.path.join("..", os.getcwd()))
 try:
-    from src.parser import Parser, my_print, ParserThread
+    from src.parser import Parser, ProtocolWriter, ParserThread
     from src import constants as CONST
 except ImportError as e:
     raise ImportError("The module is not found") from e
@@ -28,6 +28,13 @@ PIT: ParserThread = ParserThread(PI.game_board, PI.ai)
 CMD = CONST.COMMANDS
 
 
+def manager_input(*lines: str) -> TextIOWrapper:
+    """
+    Create a standard input holding the given lines.
+    """
+    return TextIOWrapper(BytesIO("".join(f"{line}\n" for line in lines).encode()))
+
+
 def override_outputs():
     """
     Override the output of the function.
@@ -54,20 +61,7 @@ def reset_redirects():
     sys.stderr = sys.__stderr__
 
 
-def test_my_print():
-    """
-    Test the process_command function with a BEGIN command.
-    """
-    test_string = "test"
-    output, output_err = override_outputs()
-    my_print(test_string)
-    stream, stream_err = get_outputs(output, output_err)
-    reset_redirects()
-    assert stream == f"{test_string}\n"
-    assert stream_err == ""
-
-
-@unittest.mock.patch('builtins.input', side_effect=[f"{CONST.CMD_START} 20"])
+@unittest.mock.patch('sys.stdin', new_callable=lambda: manager_input(f"{CONST.CMD_START} 20"))
 def test_process_command_start(mock_input):
     """
     Test the process_command function with a START command.
@@ -81,7 +75,7 @@ def test_process_command_start(mock_input):
     assert stream_err == ""
 
 
-@unittest.mock.patch('builtins.input', side_effect=[f"{CONST.CMD_TURN} 0 0"])
+@unittest.mock.patch('sys.stdin', new_callable=lambda: manager_input(f"{CONST.CMD_TURN} 0 0"))
 def test_process_command_turn(mock_input):
     """
     Test the process_command function with a TURN command.
@@ -96,7 +90,7 @@ def test_process_command_turn(mock_input):
     assert stream_err == ""
 
 
-@unittest.mock.patch('builtins.input', side_effect=[CONST.CMD_BEGIN])
+@unittest.mock.patch('sys.stdin', new_callable=lambda: manager_input(CONST.CMD_BEGIN))
 def test_process_command_begin(mock_input):
     """
     Test the process_command function with a BEGIN command.
@@ -124,7 +118,7 @@ def test_process_command_board(capsys: CaptureFixture):
     assert stream.err == ""
 
 
-@unittest.mock.patch('builtins.input', side_effect=[CONST.CMD_INFO])
+@unittest.mock.patch('sys.stdin', new_callable=lambda: manager_input(CONST.CMD_INFO))
 def test_process_command_info(mock_input):
     """
     Test the process_command function with a INFO command.
@@ -138,7 +132,7 @@ def test_process_command_info(mock_input):
     assert stream_err == ""
 
 
-@unittest.mock.patch('builtins.input', side_effect=[CONST.CMD_END])
+@unittest.mock.patch('sys.stdin', new_callable=lambda: manager_input(CONST.CMD_END))
 def test_process_command_end(mock_input):
     """
     Test the process_command function with a END command.
@@ -151,3 +145,38 @@ def test_process_command_end(mock_input):
     assert status == CONST.SUCCESS
     assert stream == ""
     assert stream_err == ""
+
+
+def test_session_replies_in_order():
+    """
+    Test a whole session read from the binary standard input: a BOARD block
+    is followed by normal commands, unknown commands get UNKNOWN and the end
+    of the input ends the session.
+    """
+    parser = Parser(BytesIO(b"START 20\r\nBOARD\n1,1,1\n2,2,2\nDONE\nTURN 3,3\nHELLO\nRESTART\n"))
+    parser.ai = None
+    output, output_err = override_outputs()
+    status = parser()
+    stream, stream_err = get_outputs(output, output_err)
+    reset_redirects()
+    assert status == CONST.ERROR
+    assert stream == "OK\nUNKNOWN\nOK\n"
+    assert stream_err == ""
+    assert parser.continue_running is False
+    assert parser.processor.board_mode is False
+    assert parser.game_board.board_size == 20
+
+
+def test_protocol_writer_sends_a_reply_at_once():
+    """
+    Test that the writer keeps the lines of a reply until it is flushed.
+    """
+    stream = StringIO()
+    writer = ProtocolWriter(stream)
+    writer.write("MESSAGE thinking")
+    writer.write("10,10")
+    assert stream.getvalue() == ""
+    writer.flush()
+    assert stream.getvalue() == "MESSAGE thinking\n10,10\n"
+    writer.flush()
+    assert stream.getvalue() == "MESSAGE thinking\n10,10\n"
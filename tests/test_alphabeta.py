@@ -0,0 +1,131 @@
+"""
+    File in charge of testing the alpha-beta engine and the engine switch.
+"""
+
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.alphabeta import AlphaBeta
+    from src.bitboard import BitBoard
+    from src.candidates import CandidateSet
+    from src.evaluator import Evaluator
+    from src.parser import SystemBoard, ParserThread
+    from src.zobrist import TranspositionTable
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+
+def empty_board(size: int) -> List[List[int]]:
+    """
+    Create an empty square board.
+    """
+    return [[CONST.CELL_EMPTY for _ in range(size)] for _ in range(size)]
+
+
+def search(board: List[List[int]], deadline: float, max_depth: int = 4) -> tuple:
+    """
+    Run the alpha-beta engine on a list based board.
+    """
+    engine = AlphaBeta(table=TranspositionTable(1 << 10))
+    bitboard = BitBoard.from_board(board)
+    evaluator = Evaluator.from_board(board)
+    move = engine.search(bitboard, CandidateSet.from_board(board), evaluator, deadline, max_depth)
+    assert bitboard.stones == BitBoard.from_board(board).stones
+    assert evaluator.totals == Evaluator.from_board(board).totals
+    return move, engine
+
+
+def test_alphabeta_makes_an_open_four() -> None:
+    """
+    Test that the engine turns an open three into an open four.
+    """
+    board = empty_board(15)
+    for x in range(5, 8):
+        board[7][x] = CONST.CELL_PLAYER
+    board[3][3] = CONST.CELL_ENEMY
+    board[11][11] = CONST.CELL_ENEMY
+    move, engine = search(board, float("inf"))
+    assert move in ((7, 4), (7, 8))
+    assert engine.score >= CONST.ALPHABETA_WIN - CONST.ALPHABETA_MAX_DEPTH
+
+
+def test_alphabeta_blocks_a_four() -> None:
+    """
+    Test that the engine blocks the only winning cell of the enemy.
+    """
+    board = empty_board(15)
+    for x in range(3, 7):
+        board[7][x] = CONST.CELL_ENEMY
+    board[7][2] = CONST.CELL_PLAYER
+    board[6][6] = CONST.CELL_PLAYER
+    move, _ = search(board, float("inf"))
+    assert move == (7, 7)
+
+
+def test_alphabeta_answers_after_the_deadline() -> None:
+    """
+    Test that an expired deadline still gives a legal move.
+    """
+    board = empty_board(15)
+    board[7][7] = CONST.CELL_ENEMY
+    board[8][8] = CONST.CELL_PLAYER
+    move, engine = search(board, time.time() - 1.0)
+    assert board[move[0]][move[1]] == CONST.CELL_EMPTY
+    assert engine.depth == 0
+
+
+def test_engine_switch_at_runtime() -> None:
+    """
+    Test that the engine is switched by INFO and that unknown names are refused.
+    """
+    ai = AI(CONST.ENGINE_MCTS, 0)
+    game_board = SystemBoard()
+    game_board.create_board(15)
+    node = ParserThread(game_board, ai)
+    node.process_command(["INFO", "engine", "AlphaBeta"])
+    assert ai.engine == CONST.ENGINE_ALPHABETA
+    node.process_command(["INFO", "engine", "unknown"])
+    assert ai.engine == CONST.ENGINE_ALPHABETA
+    assert not ai.set_engine("unknown")
+
+
+def test_search_statistics_of_the_alphabeta_engine() -> None:
+    """
+    Test that a turn of the alpha-beta engine reports its nodes and depth.
+    """
+    ai = AI(CONST.ENGINE_ALPHABETA, 0)
+    ai.time_manager.timeout_turn = 300
+    board = empty_board(15)
+    board[7][7] = CONST.CELL_ENEMY
+    board[7][8] = CONST.CELL_PLAYER
+    y, x = map(int, ai.play_ai_turn(board).split(","))
+    assert board[y][x] == CONST.CELL_EMPTY
+    statistics = ai.search_statistics()
+    assert statistics["engine"] == CONST.ENGINE_ALPHABETA
+    assert statistics["nodes"] > 0
+    assert statistics["depth"] >= 1
+
+
+def test_alphabeta_turn_stays_within_timeout_turn() -> None:
+    """
+    Test that a turn on a large board with scattered stones, where a node
+    costs milliseconds, is answered within timeout_turn.
+    """
+    ai = AI(CONST.ENGINE_ALPHABETA, 0)
+    ai.time_manager.timeout_turn = 1000
+    board = empty_board(20)
+    cells = random.Random(3).sample(range(20 * 20), 30)
+    for number, cell in enumerate(cells):
+        board[cell // 20][cell % 20] = CONST.CELL_PLAYER if number % 2 == 0 else CONST.CELL_ENEMY
+    start = time.time()
+    y, x = map(int, ai.play_ai_turn(board).split(","))
+    assert time.time() - start < ai.time_manager.timeout_turn / 1000
+    assert board[y][x] == CONST.CELL_EMPTY
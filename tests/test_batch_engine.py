@@ -0,0 +1,113 @@
+"""
+    File in charge of testing the NumPy batched playout engine.
+"""
+
+import os
+import sys
+import random
+import unittest.mock
+from typing import List
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.batch_engine import BatchPlayouts
+    from src.candidates import CandidateSet
+    from src import batch_engine
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SEED = 5
+
+
+def random_board(rng: random.Random, size: int, stones: int) -> List[List[int]]:
+    """
+    Create a board filled with a given number of random stones.
+    """
+    board = [[CONST.CELL_EMPTY for _ in range(size)] for _ in range(size)]
+    cells = [(y, x) for y in range(size) for x in range(size)]
+    rng.shuffle(cells)
+    for y, x in cells[:stones]:
+        board[y][x] = rng.choice((CONST.CELL_PLAYER, CONST.CELL_ENEMY))
+    return board
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+def test_wins_match_last_move_checker():
+    """
+    Test the vectorised win check against the last move checker of the AI.
+    """
+    rng = random.Random(SEED)
+    ai = AI()
+    engine = BatchPlayouts(SEED)
+    size = 12
+    padding = CONST.WIN_LENGTH - 1
+    width = size + 2 * padding
+    boards = [random_board(rng, size, 90) for _ in range(40)]
+    stack = np.zeros((len(boards), width, width), dtype=np.int8)
+    stack[:, padding:padding + size, padding:padding + size] = np.array(boards)
+    flat = stack.reshape(-1)
+    for player in (CONST.CELL_PLAYER, CONST.CELL_ENEMY):
+        cells = [(y, x) for y in range(size) for x in range(size)]
+        for y, x in cells:
+            positions = np.arange(len(boards)) * width * width + (y + padding) * width + x + padding
+            owned = flat[positions] == player
+            won = engine._wins(flat, positions, width, player)
+            for index, board in enumerate(boards):
+                if owned[index]:
+                    assert won[index] == ai._check_win_from_move(board, y, x, player)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+def test_run_counts_every_move():
+    """
+    Test that every AI move gets the requested number of playouts.
+    """
+    rng = random.Random(SEED)
+    board = random_board(rng, 20, 30)
+    moves = CandidateSet.from_board(board).cells()
+    engine = BatchPlayouts(SEED)
+    scores, simulations = engine.run(board, moves, 8)
+    assert simulations.tolist() == [8] * len(moves)
+    assert all(-8 <= score <= 8 for score in scores.tolist())
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+def test_run_punishes_missing_block():
+    """
+    Test that leaving an enemy four open loses more playouts than blocking it.
+    """
+    size = 15
+    board = [[CONST.CELL_EMPTY for _ in range(size)] for _ in range(size)]
+    for x in (4, 5, 6, 7):
+        board[7][x] = CONST.CELL_ENEMY
+    board[7][3] = CONST.CELL_PLAYER
+    moves = [(7, 8), (3, 3)]
+    engine = BatchPlayouts(SEED)
+    scores, simulations = engine.run(board, moves, 2000)
+    assert scores[0] / simulations[0] > scores[1] / simulations[1]
+
+
+def test_batch_engine_turn_and_fallback():
+    """
+    Test a batch engine turn, and the flat engine fallback without NumPy.
+    """
+    rng = random.Random(SEED)
+    board = random_board(rng, 15, 12)
+    ai = AI(CONST.ENGINE_BATCH)
+    ai.time_manager.timeout_turn = 400
+    y, x = map(int, ai.play_ai_turn(board).split(","))
+    assert board[y][x] == CONST.CELL_EMPTY
+    with unittest.mock.patch.object(batch_engine, "np", None):
+        fallback = AI(CONST.ENGINE_BATCH)
+        fallback.time_manager.timeout_turn = 400
+        assert fallback.batch.available is False
+        y, x = map(int, fallback.play_ai_turn(board).split(","))
+        assert board[y][x] == CONST.CELL_EMPTY
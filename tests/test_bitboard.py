@@ -0,0 +1,108 @@
+"""
+    File in charge of testing the bitboard representation of the board.
+"""
+
+import os
+import sys
+import random
+from typing import List
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.bitboard import BitBoard
+    from src.parser import SystemBoard
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+AII: AI = AI()
+
+SEED = 1337
+SIZES = (5, 15, 20, 40)
+
+
+def random_board(rng: random.Random, size: int, stones: int) -> List[List[int]]:
+    """
+    Create a board filled with a given number of random stones.
+    """
+    board = [[CONST.CELL_EMPTY for _ in range(size)] for _ in range(size)]
+    cells = [(y, x) for y in range(size) for x in range(size)]
+    rng.shuffle(cells)
+    for y, x in cells[:stones]:
+        board[y][x] = rng.choice((CONST.CELL_PLAYER, CONST.CELL_ENEMY))
+    return board
+
+
+def test_round_trip():
+    """
+    Test the conversion from a list board to a bitboard and back.
+    """
+    rng = random.Random(SEED)
+    for size in SIZES:
+        board = random_board(rng, size, size * 2)
+        bitboard = BitBoard.from_board(board)
+        assert bitboard.to_board() == board
+        for y in range(size):
+            for x in range(size):
+                assert bitboard.get_cell(y, x) == board[y][x]
+
+
+def test_has_five_matches_full_scan():
+    """
+    Test that the bitboard alignment check agrees with the full scan.
+    """
+    rng = random.Random(SEED)
+    for size in SIZES:
+        for stones in (size, size * 3, size * size // 2):
+            board = random_board(rng, size, stones)
+            bitboard = BitBoard.from_board(board)
+            for player in (CONST.CELL_PLAYER, CONST.CELL_ENEMY):
+                assert bitboard.has_five(player) == AII._check_all_alignments(board, player)
+
+
+def test_has_five_does_not_wrap():
+    """
+    Test that lines split across the board edge are not wins.
+    """
+    size = 10
+    board = [[CONST.CELL_EMPTY for _ in range(size)] for _ in range(size)]
+    for x in (7, 8, 9):
+        board[3][x] = CONST.CELL_PLAYER
+    for x in (0, 1):
+        board[4][x] = CONST.CELL_PLAYER
+    for y, x in ((0, 2), (1, 1), (2, 0), (3, 9), (4, 8)):
+        board[y][x] = CONST.CELL_ENEMY
+    bitboard = BitBoard.from_board(board)
+    assert bitboard.has_five(CONST.CELL_PLAYER) is False
+    assert bitboard.has_five(CONST.CELL_ENEMY) is False
+
+
+def test_neighbours_match_possible_moves():
+    """
+    Test that the neighbour mask matches the list based move generation.
+    """
+    rng = random.Random(SEED)
+    for size in SIZES:
+        for radius in (1, 2, 3):
+            board = random_board(rng, size, size // 2)
+            bitboard = BitBoard.from_board(board)
+            expected = sorted(AII._generate_possible_moves(board, radius))
+            assert sorted(bitboard.cells(bitboard.neighbours(radius))) == expected
+
+
+def test_system_board_keeps_bitboard_in_sync():
+    """
+    Test that the cells written through the system board reach the bitboard.
+    """
+    game_board = SystemBoard()
+    game_board.create_board(20)
+    game_board.set_cell(3, 4, CONST.CELL_PLAYER)
+    game_board.set_cell(5, 6, CONST.CELL_ENEMY)
+    assert game_board.get_cell(3, 4) == CONST.CELL_PLAYER
+    assert game_board.bitboard.to_board() == game_board.board
+    game_board.set_cell(3, 4, CONST.CELL_EMPTY)
+    assert game_board.bitboard.to_board() == game_board.board
+    game_board.recreate_board()
+    assert game_board.bitboard.occupied() == 0
@@ -0,0 +1,146 @@
+"""
+    File in charge of testing the incrementally maintained candidate moves.
+"""
+
+import os
+import sys
+import random
+from typing import List
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.candidates import CandidateSet
+    from src.parser import SystemBoard, ParserThread
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+AII: AI = AI()
+
+SEED = 7
+
+
+def empty_board(size: int) -> List[List[int]]:
+    """
+    Create an empty square board.
+    """
+    return [[CONST.CELL_EMPTY for _ in range(size)] for _ in range(size)]
+
+
+def test_place_and_remove_match_full_generation():
+    """
+    Test that the candidates always match a full regeneration.
+    """
+    rng = random.Random(SEED)
+    for size in (5, 20, 40):
+        board = empty_board(size)
+        candidates = CandidateSet(size)
+        played = []
+        for _ in range(size * 3):
+            if played and rng.random() < 0.3:
+                y, x = played.pop(rng.randrange(len(played)))
+                board[y][x] = CONST.CELL_EMPTY
+                candidates.remove(y, x)
+            else:
+                y, x = rng.randrange(size), rng.randrange(size)
+                if board[y][x] != CONST.CELL_EMPTY:
+                    continue
+                board[y][x] = rng.choice((CONST.CELL_PLAYER, CONST.CELL_ENEMY))
+                candidates.place(y, x)
+                played.append((y, x))
+            expected = sorted(AII._generate_possible_moves(board, CONST.CANDIDATE_RADIUS))
+            assert sorted(candidates.cells()) == expected
+            assert len(candidates) == len(expected)
+
+
+def test_undo_restores_the_set():
+    """
+    Test that removing stones in reverse order restores the original set.
+    """
+    candidates = CandidateSet(20)
+    candidates.place(10, 10)
+    before = sorted(candidates.cells())
+    for y, x in ((11, 11), (12, 12), (13, 9)):
+        candidates.place(y, x)
+    for y, x in ((13, 9), (12, 12), (11, 11)):
+        candidates.remove(y, x)
+    assert sorted(candidates.cells()) == before
+    assert (10, 10) not in candidates
+    assert (12, 12) in candidates
+
+
+def test_from_board_and_copy():
+    """
+    Test the construction from a board and the independence of copies.
+    """
+    board = empty_board(15)
+    board[0][0] = CONST.CELL_PLAYER
+    board[7][7] = CONST.CELL_ENEMY
+    candidates = CandidateSet.from_board(board)
+    assert sorted(candidates.cells()) == sorted(AII._generate_possible_moves(board))
+    other = candidates.copy()
+    other.place(7, 8)
+    assert (7, 8) in candidates
+    assert (7, 8) not in other
+
+
+def test_parser_commands_keep_candidates_in_sync():
+    """
+    Test that TURN, BOARD and RESTART update the candidates of the board.
+    """
+    game_board = SystemBoard()
+    node = ParserThread(game_board, None)
+    node.process_command([CONST.CMD_START, "20"])
+    assert len(game_board.candidates) == 0
+    node.process_command([CONST.CMD_TURN, "10,10"])
+    assert sorted(game_board.candidates.cells()) == sorted(
+        AII._generate_possible_moves(game_board.board)
+    )
+    node.process_command([CONST.CMD_BOARD])
+    node.process_board_command(["3,4,1"])
+    node.process_board_command(["3,5,2"])
+    node.process_board_command(["DONE"])
+    assert game_board.board[10][10] == CONST.CELL_EMPTY
+    assert sorted(game_board.candidates.cells()) == sorted(
+        AII._generate_possible_moves(game_board.board)
+    )
+    node.process_command([CONST.CMD_RESTART])
+    assert len(game_board.candidates) == 0
+
+
+def test_board_command_loads_the_position_at_once():
+    """
+    Test that a BOARD block builds the same state as placing its stones one
+    by one, reporting and skipping the invalid lines.
+    """
+    generator = random.Random(3)
+    cells = generator.sample([(y, x) for y in range(20) for x in range(20)], 210)
+    expected = SystemBoard()
+    expected.create_board(20)
+    game_board = SystemBoard()
+    game_board.create_board(20)
+    game_board.set_cell(0, 0, CONST.CELL_PLAYER)
+    node = ParserThread(game_board, None)
+    node.process_command([CONST.CMD_BOARD])
+    for turn, (y, x) in enumerate(cells):
+        value = CONST.CELL_PLAYER if turn % 2 == 0 else CONST.CELL_ENEMY
+        expected.set_cell(y, x, value)
+        node.process_board_command([f"{y},{x},{value}"])
+    node.process_board_command(["20,1,1"])
+    node.process_board_command(["1,1,7"])
+    assert node.process_board_command(["DONE"]) == CONST.ERROR
+    assert node.output.pending == ["ERROR Invalid board row: 20", "ERROR Invalid board value: 7"]
+    assert node.board_mode is False
+    assert game_board.board == expected.board
+    assert game_board.bitboard.stones == expected.bitboard.stones
+    assert sorted(game_board.candidates.moves) == sorted(expected.candidates.moves)
+    for index, position in enumerate(game_board.candidates.position):
+        assert position == -1 or game_board.candidates.moves[position] == index
+    assert game_board.candidates.counts == expected.candidates.counts
+    assert game_board.evaluator.lines == expected.evaluator.lines
+    assert game_board.evaluator.totals == expected.evaluator.totals
+    assert game_board.evaluator.shapes == expected.evaluator.shapes
+    assert game_board.hash == expected.hash
+    assert game_board.hashes == expected.hashes
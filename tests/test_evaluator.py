@@ -0,0 +1,114 @@
+"""
+    File in charge of testing the pattern based evaluator.
+"""
+
+import os
+import sys
+import random
+from typing import List
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.bitboard import BitBoard
+    from src.candidates import CandidateSet
+    from src.evaluator import Evaluator, line_shapes
+    from src.mcts import MCTS
+    from src.parser import SystemBoard
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+SEED = 5
+
+
+def empty_board(size: int) -> List[List[int]]:
+    """
+    Create an empty square board.
+    """
+    return [[CONST.CELL_EMPTY for _ in range(size)] for _ in range(size)]
+
+
+def test_line_shapes() -> None:
+    """
+    Test that the shapes of single lines are recognised.
+    """
+    assert line_shapes("..xxxxx..")[CONST.SHAPE_FIVE] == 1
+    assert line_shapes("..xxxx..")[CONST.SHAPE_OPEN_FOUR] == 1
+    assert line_shapes("..xxxx..")[CONST.SHAPE_FOUR] == 0
+    assert line_shapes("xxxx.o..")[CONST.SHAPE_FOUR] == 1
+    assert line_shapes("..xx.xx..")[CONST.SHAPE_FOUR] == 1
+    assert line_shapes("...xxx...")[CONST.SHAPE_OPEN_THREE] == 1
+    assert line_shapes("o.xxx.o..")[CONST.SHAPE_OPEN_THREE] == 0
+    assert line_shapes("..xx.x...")[CONST.SHAPE_BROKEN_THREE] == 1
+    assert line_shapes("..xx.....")[CONST.SHAPE_TWO] > 0
+    assert line_shapes(".........") == (0,) * CONST.SHAPES
+
+
+def test_incremental_scores_match_full_build() -> None:
+    """
+    Test that placing and removing stones gives the scores of a fresh evaluator.
+    """
+    random.seed(SEED)
+    size: int = 15
+    board = empty_board(size)
+    evaluator = Evaluator(size)
+    for _ in range(400):
+        y, x = random.randrange(size), random.randrange(size)
+        value = random.choice((CONST.CELL_EMPTY, CONST.CELL_PLAYER, CONST.CELL_ENEMY))
+        board[y][x] = value
+        evaluator.set_cell(y, x, value)
+    fresh = Evaluator.from_board(board)
+    assert evaluator.totals == fresh.totals
+    assert evaluator.shapes == fresh.shapes
+
+
+def test_evaluation_sides_and_copy() -> None:
+    """
+    Test the sign of the evaluation and the independence of the copies.
+    """
+    evaluator = Evaluator(15)
+    for x in range(5, 8):
+        evaluator.set_cell(7, x, CONST.CELL_PLAYER)
+    assert evaluator.count(CONST.CELL_PLAYER, CONST.SHAPE_OPEN_THREE) == 1
+    assert evaluator.evaluate(CONST.CELL_PLAYER) > 0
+    assert evaluator.evaluate(CONST.CELL_ENEMY) == -evaluator.evaluate(CONST.CELL_PLAYER)
+    other = evaluator.copy()
+    other.set_cell(7, 8, CONST.CELL_PLAYER)
+    assert other.count(CONST.CELL_PLAYER, CONST.SHAPE_OPEN_FOUR) == 1
+    assert other.has_four(CONST.CELL_PLAYER)
+    assert not evaluator.has_four(CONST.CELL_PLAYER)
+
+
+def test_system_board_keeps_evaluator_in_sync() -> None:
+    """
+    Test that the game board updates its evaluator on every cell change.
+    """
+    game_board = SystemBoard()
+    game_board.create_board(10)
+    for x in range(4):
+        game_board.set_cell(2, x + 1, CONST.CELL_ENEMY)
+    assert game_board.evaluator.has_four(CONST.CELL_ENEMY)
+    game_board.set_cell(2, 1, CONST.CELL_EMPTY)
+    assert not game_board.evaluator.has_four(CONST.CELL_ENEMY)
+    game_board.clear_board()
+    assert game_board.evaluator.totals == [0, 0, 0]
+
+
+def test_tree_search_blocks_a_four_with_the_evaluator() -> None:
+    """
+    Test that the evaluator driven tree search blocks the four of the enemy.
+    """
+    random.seed(SEED)
+    board = empty_board(15)
+    for x in range(3, 7):
+        board[7][x] = CONST.CELL_ENEMY
+    board[6][6] = CONST.CELL_PLAYER
+    board[8][3] = CONST.CELL_PLAYER
+    board[7][2] = CONST.CELL_PLAYER
+    bitboard = BitBoard.from_board(board)
+    evaluator = Evaluator.from_board(board)
+    search = MCTS(lambda *_: 0)
+    move = search.search(bitboard, CandidateSet.from_board(board), float("inf"), 2000, evaluator)
+    assert move == (7, 7)
+    assert evaluator.totals == Evaluator.from_board(board).totals
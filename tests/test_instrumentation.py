@@ -0,0 +1,139 @@
+"""
+    File in charge of testing the figures reported for every turn.
+"""
+
+import os
+import sys
+import json
+import time
+from io import BytesIO, StringIO
+from typing import List
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.parser import Parser, SystemBoard, ParserThread, ProtocolWriter
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+
+def empty_board(size: int) -> List[List[int]]:
+    """
+    Create an empty square board.
+    """
+    return [[CONST.CELL_EMPTY for _ in range(size)] for _ in range(size)]
+
+
+def session(output: StringIO) -> ParserThread:
+    """
+    Create a single process brain writing to output, with short turns.
+    """
+    node = ParserThread(SystemBoard(), AI(CONST.ENGINE_MCTS, 0), ProtocolWriter(output))
+    node.ai.ponder = False
+    node.dispatch("START 15")
+    node.dispatch("INFO timeout_turn 100")
+    return node
+
+
+def test_turn_statistics_report_the_phases() -> None:
+    """
+    Test the figures of a searched turn and the source of the other moves.
+    """
+    ai = AI(CONST.ENGINE_MCTS, 0)
+    ai.time_manager.timeout_turn = 100
+    board = empty_board(15)
+    assert ai.play_ai_turn(board) == "7,7"
+    assert ai.turn_statistics["source"] == CONST.TURN_SOURCE_CENTER
+    board[7][7] = CONST.CELL_ENEMY
+    board[5][5] = CONST.CELL_PLAYER
+    move = ai.play_ai_turn(board)
+    statistics = ai.turn_statistics
+    assert statistics["source"] == CONST.TURN_SOURCE_SEARCH
+    assert statistics["move"] == move
+    assert statistics["engine"] == CONST.ENGINE_MCTS
+    assert statistics["stones"] == 2
+    assert statistics["candidates"] > 0
+    assert statistics["nodes"] > 0
+    assert statistics["budget"] > 0
+    assert statistics["turn_time"] >= statistics["time"] > 0
+    assert statistics["turn_time"] >= statistics["setup_time"] + statistics["win_check_time"]
+    for x in range(4):
+        board[0][x] = CONST.CELL_PLAYER
+    assert ai.play_ai_turn(board) == "0,4"
+    assert ai.turn_statistics["source"] == CONST.TURN_SOURCE_WIN
+    assert "source=win" in ai.turn_summary()
+
+
+def test_trace_message_precedes_the_move() -> None:
+    """
+    Test that the message mode sends the summary of the turn before its move.
+    """
+    output = StringIO()
+    node = session(output)
+    assert node.dispatch("INFO trace message") == CONST.SUCCESS
+    node.dispatch("TURN 7,7")
+    lines = output.getvalue().splitlines()
+    assert lines[-2].startswith("MESSAGE engine=mcts source=search")
+    assert f"move={lines[-1]} " in lines[-2]
+
+
+def test_trace_off_adds_no_line() -> None:
+    """
+    Test that nothing is added to the protocol when the trace is off.
+    """
+    output = StringIO()
+    node = session(output)
+    node.dispatch("INFO trace off")
+    node.dispatch("TURN 7,7")
+    assert output.getvalue().splitlines() == ["OK", node.ai.turn_statistics["move"]]
+    assert node.set_trace("everything") is False
+    assert node.trace == CONST.TRACE_OFF
+
+
+def test_trace_file_writes_one_json_line_per_turn(tmp_path) -> None:
+    """
+    Test that the file mode appends the figures of each turn to the trace
+    file of the folder given by the manager.
+    """
+    output = StringIO()
+    node = session(output)
+    node.dispatch(f"INFO folder {tmp_path}")
+    node.dispatch("INFO trace file")
+    node.dispatch("TURN 7,7")
+    row = 0 if node.game_board.board[0][0] == CONST.CELL_EMPTY else 14
+    node.dispatch(f"TURN {row},{row}")
+    node.dispatch("END")
+    with open(tmp_path / CONST.TRACE_FILE_NAME, encoding="utf-8") as trace:
+        turns = [json.loads(line) for line in trace]
+    assert len(turns) == 2
+    assert [turn["move"] for turn in turns] == output.getvalue().splitlines()[1:]
+    assert turns[1]["stones"] == 3
+
+
+class SlowInput(BytesIO):
+    """
+    An input of the manager taking some time to send each line, like an
+    opponent thinking.
+    """
+
+    def readline(self, *args) -> bytes:
+        time.sleep(0.2)
+        return super().readline(*args)
+
+
+def test_trace_reports_the_pondering_of_a_parsed_turn() -> None:
+    """
+    Test that a turn read by the parser reports the nodes searched while
+    waiting for it, although the parser stops the pondering before the turn.
+    """
+    parser = Parser(SlowInput(b"START 15\nINFO timeout_turn 200\nINFO ponder 1\nINFO trace message\nBEGIN\nTURN 8,8\nEND\n"))
+    parser.ai = AI(CONST.ENGINE_MCTS, 0)
+    output = StringIO()
+    parser.processor.output = ProtocolWriter(output)
+    parser()
+    messages = [line for line in output.getvalue().splitlines() if line.startswith("MESSAGE")]
+    assert len(messages) == 2
+    assert " ponder=0 " in messages[0]
+    assert int(messages[1].split(" ponder=")[1].split(" ")[0]) > 0
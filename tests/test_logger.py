@@ -0,0 +1,77 @@
+"""
+    File in charge of testing the debug log.
+"""
+
+import os
+import sys
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.logger import Logger, parse_level, temp_folder
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+
+class Counter:
+    """
+    An argument counting how many times it was formatted.
+    """
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self) -> str:
+        self.formatted += 1
+        return "counter"
+
+
+def test_disabled_messages_are_not_formatted(tmp_path) -> None:
+    """
+    Test that a message above the level of the log is neither formatted nor written.
+    """
+    path = os.path.join(str(tmp_path), "brain.log")
+    logger = Logger(CONST.LOG_INFO, path)
+    argument = Counter()
+    logger.debug("value %s", argument)
+    logger.trace("value %s", argument)
+    assert argument.formatted == 0
+    assert logger.thread is None
+    assert not logger.enabled(CONST.LOG_DEBUG)
+    logger.close()
+    assert not os.path.exists(path)
+
+
+def test_enabled_messages_reach_the_file(tmp_path) -> None:
+    """
+    Test that the queued messages are written in order once the log is closed.
+    """
+    path = os.path.join(str(tmp_path), "brain.log")
+    logger = Logger(CONST.LOG_DEBUG, path)
+    argument = Counter()
+    for index in range(100):
+        logger.debug("line %d %s", index, argument)
+    logger.trace("hidden")
+    logger.close()
+    assert argument.formatted == 100
+    with open(path, encoding="utf-8") as log_file:
+        lines = log_file.read().splitlines()
+    assert len(lines) == 100
+    assert lines[0].endswith(f"{CONST.LOG_DEBUG} line 0 counter")
+    assert lines[-1].endswith("line 99 counter")
+
+
+def test_levels_and_folder(tmp_path, monkeypatch) -> None:
+    """
+    Test the level names and the choice of the temporary folder.
+    """
+    assert parse_level("Trace") == CONST.LOG_TRACE
+    assert parse_level("9") == CONST.LOG_TRACE
+    assert parse_level("loud") is None
+    monkeypatch.setenv(CONST.ENV_LOG, "info")
+    assert Logger().level == CONST.LOG_INFO
+    folder = os.path.join(str(tmp_path), "brain")
+    monkeypatch.setenv(CONST.ENV_TEMP_FOLDER, folder)
+    assert temp_folder() == folder
+    assert os.path.isdir(folder)
@@ -0,0 +1,104 @@
+"""
+    File in charge of testing the Monte Carlo Tree Search engine.
+"""
+
+import os
+import sys
+import time
+import random
+from typing import List
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.bitboard import BitBoard
+    from src.candidates import CandidateSet
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+SEED = 3
+ITERATIONS = 4000
+FAR_DEADLINE = 60.0
+
+
+def board_with(size: int, player: List[tuple], enemy: List[tuple]) -> List[List[int]]:
+    """
+    Create a board holding the given stones.
+    """
+    board = [[CONST.CELL_EMPTY for _ in range(size)] for _ in range(size)]
+    for y, x in player:
+        board[y][x] = CONST.CELL_PLAYER
+    for y, x in enemy:
+        board[y][x] = CONST.CELL_ENEMY
+    return board
+
+
+def search(board: List[List[int]]) -> tuple:
+    """
+    Run a bounded search on the board and check that it is left untouched.
+    """
+    random.seed(SEED)
+    ai = AI(CONST.ENGINE_MCTS)
+    bitboard = BitBoard.from_board(board)
+    candidates = CandidateSet.from_board(board)
+    before = sorted(candidates.cells())
+    move = ai.mcts.search(
+        bitboard, candidates, time.time() + FAR_DEADLINE, ITERATIONS
+    )
+    assert ai.mcts.iterations == ITERATIONS
+    assert bitboard.to_board() == board
+    assert sorted(candidates.cells()) == before
+    return move
+
+
+def test_search_completes_a_five():
+    """
+    Test that the search plays the winning move.
+    """
+    board = board_with(
+        15,
+        [(7, 4), (7, 5), (7, 6), (7, 7)],
+        [(6, 4), (6, 5), (8, 8), (3, 3)]
+    )
+    assert search(board) in ((7, 3), (7, 8))
+
+
+def test_search_blocks_a_four():
+    """
+    Test that the search blocks the only open end of an enemy four.
+    """
+    board = board_with(
+        15,
+        [(7, 4), (9, 9), (8, 6)],
+        [(7, 5), (7, 6), (7, 7), (7, 8)]
+    )
+    assert search(board) == (7, 9)
+
+
+def test_search_without_candidates():
+    """
+    Test that an empty board gives no move to the search.
+    """
+    board = board_with(15, [], [])
+    ai = AI(CONST.ENGINE_MCTS)
+    move = ai.mcts.search(
+        BitBoard.from_board(board), CandidateSet.from_board(board),
+        time.time() + FAR_DEADLINE, ITERATIONS
+    )
+    assert move is None
+
+
+def test_engines_answer_a_legal_move():
+    """
+    Test that every engine answers an empty cell of the board.
+    """
+    board = board_with(15, [(7, 7)], [(7, 8)])
+    for engine in CONST.ENGINES:
+        random.seed(SEED)
+        ai = AI(engine)
+        ai.time_manager.timeout_turn = 300
+        response = ai.play_ai_turn(board)
+        y, x = map(int, response.split(","))
+        assert board[y][x] == CONST.CELL_EMPTY
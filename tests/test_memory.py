@@ -0,0 +1,183 @@
+"""
+    File in charge of testing the memory budget of the search structures.
+"""
+
+import os
+import sys
+import time
+from typing import List
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.mcts import MCTS, NodeStore
+    from src.memory import MemoryBudget, base_memory
+    from src.zobrist import TranspositionTable
+    from src.bitboard import BitBoard
+    from src.candidates import CandidateSet
+    from src.evaluator import Evaluator
+    from src.parser import SystemBoard, ParserThread
+    from src import evaluator as EVALUATOR
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+MEMORY = 80 << 20
+
+
+def position(size: int) -> List[List[int]]:
+    """
+    Create a board with a few stones in the middle.
+    """
+    board = [[CONST.CELL_EMPTY for _ in range(size)] for _ in range(size)]
+    center = size // 2
+    board[center][center] = CONST.CELL_ENEMY
+    board[center - 1][center - 1] = CONST.CELL_PLAYER
+    board[center + 1][center - 1] = CONST.CELL_ENEMY
+    return board
+
+
+def test_budget_is_shared_among_processes_and_structures() -> None:
+    """
+    Test the bytes given to a process and to its structures.
+    """
+    single = MemoryBudget(MEMORY, 1)
+    assert single.total() == int(MEMORY * (1 - CONST.MEMORY_MARGIN)) - base_memory()
+    double = MemoryBudget(MEMORY, 2)
+    assert double.total() < single.total() // 2
+    assert MemoryBudget(1 << 20, 4).total() == CONST.MEMORY_MINIMUM
+    assert MemoryBudget(0).total() == MemoryBudget(CONST.DEFAULT_MAX_MEMORY).total()
+    shares = sum(single.share(CONST.ENGINE_MCTS, part) for part in CONST.MEMORY_SHARES[CONST.ENGINE_MCTS])
+    assert shares <= single.total()
+    assert single.share(CONST.ENGINE_ALPHABETA, CONST.MEMORY_TREE) == 0
+
+
+def test_table_size_follows_its_share() -> None:
+    """
+    Test the sizing, the resizing and the accounting of the transposition table.
+    """
+    buckets = TranspositionTable.buckets_for(8 << 20)
+    assert buckets & (buckets - 1) == 0
+    full = 2 * buckets * (CONST.TT_SLOT_BYTES + CONST.TT_ENTRY_BYTES)
+    assert full <= 8 << 20 < 2 * full
+    assert TranspositionTable.buckets_for(0) == CONST.TT_MIN_BUCKETS
+    table = TranspositionTable(64)
+    for key in range(200):
+        table.store(key * 7919, 1, 0.5, -1, 1)
+    assert len(table) == sum(1 for depth in table.depths if depth >= 0)
+    assert table.memory() == 128 * CONST.TT_SLOT_BYTES + len(table) * CONST.TT_ENTRY_BYTES
+    table.resize(64)
+    assert len(table) > 0
+    table.resize(100)
+    assert table.buckets == 128 and len(table) == 0
+
+
+def test_line_cache_forgets_the_least_recently_used_contents() -> None:
+    """
+    Test that the line cache keeps within its limit, dropping the entries
+    used the least recently.
+    """
+    try:
+        EVALUATOR.set_line_cache_limit(100)
+        EVALUATOR._LINE_CACHE.clear()
+        lines = [f"2{number:b}0".encode() for number in range(1, 120)]
+        for line in lines:
+            EVALUATOR._line_entry(line)
+            EVALUATOR._line_entry(lines[0])
+        assert len(EVALUATOR._LINE_CACHE) == 100
+        assert lines[0] in EVALUATOR._LINE_CACHE
+        assert lines[1] not in EVALUATOR._LINE_CACHE
+        assert lines[-1] in EVALUATOR._LINE_CACHE
+        EVALUATOR.set_line_cache_limit(10)
+        assert list(EVALUATOR._LINE_CACHE) == lines[-9:] + [lines[0]]
+        assert EVALUATOR.line_cache_memory() == 10 * CONST.EVALUATOR_ENTRY_BYTES
+    finally:
+        EVALUATOR.set_line_cache_limit(CONST.EVALUATOR_CACHE_SIZE)
+
+
+def test_prune_keeps_the_most_visited_nodes() -> None:
+    """
+    Test that pruning fits the tree in the target, keeps the best moves and
+    lets the search go on.
+    """
+    board = position(15)
+    bitboard = BitBoard.from_board(board)
+    candidates = CandidateSet.from_board(board)
+    evaluator = Evaluator.from_board(board)
+    search = MCTS(None)
+    search.search(bitboard, candidates, time.time() + 10, max_iterations=3000, evaluator=evaluator)
+    tree = search.tree
+    root = search.root
+    assert tree.count == len(tree.subtree(root))
+    best = tree.moves[max(tree.children(root), key=lambda child: tree.visits[child])]
+    target = tree.count // 4
+    search.prune(target)
+    assert tree.count <= target
+    assert tree.count == len(tree.subtree(root))
+    assert tree.child_count[root] == len(tree.children(root))
+    assert best in [tree.moves[child] for child in tree.children(root)]
+    search.search(bitboard, candidates, time.time() + 10, max_iterations=500, evaluator=evaluator)
+    assert tree.visits[search.root] > 3000
+
+
+def test_node_store_recycles_and_compacts() -> None:
+    """
+    Test that released nodes are allocated again and that compacting keeps
+    the subtree of the root, renumbered from 0.
+    """
+    tree = NodeStore()
+    root = tree.allocate(-1, CONST.CELL_ENEMY, 0)
+    children = [tree.allocate(move, CONST.CELL_PLAYER, move) for move in range(3)]
+    for child in children:
+        tree.add_child(root, child)
+    grandchild = tree.allocate(10, CONST.CELL_ENEMY, 10)
+    tree.add_child(children[1], grandchild)
+    tree.visits[grandchild] = 7
+    tree.first_child[root] = tree.sibling[children[2]]
+    tree.child_count[root] -= 1
+    tree.release(children[2])
+    assert tree.count == 4
+    assert tree.allocate(5, CONST.CELL_PLAYER, 5) == children[2]
+    new_root = tree.compact(children[1])
+    assert new_root == 0
+    assert tree.count == tree.used == 2
+    assert tree.moves[0] == 1
+    assert tree.children(0) == [1]
+    assert tree.moves[1] == 10 and tree.visits[1] == 7
+
+
+def test_search_stays_within_the_tree_share() -> None:
+    """
+    Test that a search with a small memory limit prunes its tree on the way.
+    """
+    board = position(20)
+    search = MCTS(None)
+    search.set_memory_limit(200 * NodeStore.NODE_BYTES)
+    search.search(
+        BitBoard.from_board(board), CandidateSet.from_board(board), time.time() + 10,
+        max_iterations=2000, evaluator=Evaluator.from_board(board)
+    )
+    assert search.prunes > 0
+    assert search.tree.count <= 200
+    assert search.tree.memory() <= search.memory_limit
+
+
+def test_info_max_memory_resizes_the_structures() -> None:
+    """
+    Test that INFO max_memory shares the limit among the structures of the AI.
+    """
+    node = ParserThread(SystemBoard(), AI(CONST.ENGINE_MCTS, 0))
+    default_buckets = node.ai.table.buckets
+    node.process_command([CONST.CMD_INFO, CONST.INFO_MAX_MEMORY, str(MEMORY)])
+    ai = node.ai
+    assert ai.memory.max_memory == MEMORY
+    assert ai.table.buckets < default_buckets
+    assert ai.table.memory() <= ai.memory.share(CONST.ENGINE_MCTS, CONST.MEMORY_TABLE) or ai.table.buckets == CONST.TT_MIN_BUCKETS
+    assert ai.mcts.memory_limit == ai.memory.share(CONST.ENGINE_MCTS, CONST.MEMORY_TREE)
+    assert ai.alphabeta.table.buckets == CONST.TT_MIN_BUCKETS
+    ai.set_engine(CONST.ENGINE_ALPHABETA)
+    assert ai.alphabeta.table.buckets > CONST.TT_MIN_BUCKETS
+    assert ai.table.buckets == CONST.TT_MIN_BUCKETS
+    node.process_command([CONST.CMD_INFO, CONST.INFO_MAX_MEMORY, "0"])
+    assert ai.memory.total() == MemoryBudget(CONST.DEFAULT_MAX_MEMORY).total()
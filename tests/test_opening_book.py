@@ -0,0 +1,115 @@
+"""
+    File in charge of testing the memory mapped opening book.
+"""
+
+import mmap
+import os
+import sys
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.bitboard import BitBoard
+    from src.opening_book import OpeningBook, read_book, write_book
+    from src.parser import SystemBoard, ParserThread
+    from src.zobrist import Zobrist
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+SIZE = 15
+
+
+def position_key(board) -> int:
+    """
+    Return the book key of a list based board.
+    """
+    return Zobrist(len(board)).hash_stones(BitBoard.from_board(board).stones)
+
+
+def make_book(folder: str) -> dict:
+    """
+    Write a small book holding the empty board and one reply.
+    """
+    board = [[CONST.CELL_EMPTY] * SIZE for _ in range(SIZE)]
+    entries = {position_key(board): {(7, 7): 3, (6, 6): 1}}
+    board[7][7] = CONST.CELL_ENEMY
+    entries[position_key(board)] = {(7, 7): 9, (8, 8): 2}
+    write_book(os.path.join(folder, CONST.OPENING_BOOK_FILE), entries)
+    return entries
+
+
+def test_book_round_trip(tmp_path) -> None:
+    """
+    Test that the written entries are read back and looked up by key.
+    """
+    entries = make_book(str(tmp_path))
+    assert read_book(os.path.join(str(tmp_path), CONST.OPENING_BOOK_FILE)) == entries
+    book = OpeningBook()
+    assert book.open(str(tmp_path))
+    assert book.count == 4
+    for key, moves in entries.items():
+        assert sorted(book.moves(key)) == sorted((row, col, weight) for (row, col), weight in moves.items())
+    assert book.lookup(1) is None
+    book.close()
+    assert not book.loaded
+
+
+def test_missing_or_invalid_book(tmp_path) -> None:
+    """
+    Test that a missing or corrupted file leaves the AI without book.
+    """
+    book = OpeningBook()
+    assert not book.open(str(tmp_path))
+    with open(os.path.join(str(tmp_path), CONST.OPENING_BOOK_FILE), "wb") as book_file:
+        book_file.write(b"NOPE" + bytes(20))
+    assert not book.open(str(tmp_path))
+    assert not book.loaded
+
+
+def test_unmappable_book(tmp_path, monkeypatch) -> None:
+    """
+    Test that a book the brain cannot map leaves the AI without book.
+    """
+    make_book(str(tmp_path))
+
+    def refuse(*_, **__) -> None:
+        raise OSError("cannot map")
+
+    monkeypatch.setattr(mmap, "mmap", refuse)
+    book = OpeningBook()
+    assert not book.open(str(tmp_path))
+    assert not book.loaded
+
+
+def test_ai_answers_from_the_book(tmp_path) -> None:
+    """
+    Test that a book position is answered without searching, and that an
+    occupied book move is ignored.
+    """
+    make_book(str(tmp_path))
+    ai = AI(CONST.ENGINE_MCTS, 0)
+    ai.time_manager.timeout_turn = 200
+    assert ai.book.open(str(tmp_path))
+    board = [[CONST.CELL_EMPTY] * SIZE for _ in range(SIZE)]
+    assert ai.play_ai_turn(board) == "7,7"
+    assert ai.nodes == 0
+    board[7][7] = CONST.CELL_ENEMY
+    y, x = map(int, ai.play_ai_turn(board).split(","))
+    assert board[y][x] == CONST.CELL_EMPTY
+    assert ai.nodes > 0
+
+
+def test_info_folder_opens_the_book(tmp_path) -> None:
+    """
+    Test that "INFO folder" loads the book of the folder.
+    """
+    make_book(str(tmp_path))
+    ai = AI(CONST.ENGINE_MCTS, 0)
+    game_board = SystemBoard()
+    game_board.create_board(SIZE)
+    node = ParserThread(game_board, ai)
+    node.process_command(["INFO", "folder", str(tmp_path)])
+    assert ai.book.loaded
+    ai.book.close()
@@ -0,0 +1,94 @@
+"""
+    File in charge of testing the process pool of the parallel search.
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI, _init_worker, _search_worker
+    from src.bitboard import BitBoard
+    from src.parallel import ParallelSearch, merge_root_statistics
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+SIZE = 15
+
+
+def make_bitboard() -> BitBoard:
+    """
+    Create a small position.
+    """
+    bitboard = BitBoard(SIZE)
+    bitboard.set_cell(7, 7, CONST.CELL_ENEMY)
+    bitboard.set_cell(7, 8, CONST.CELL_PLAYER)
+    bitboard.set_cell(8, 8, CONST.CELL_ENEMY)
+    return bitboard
+
+
+def test_merge_root_statistics():
+    """
+    Test that the visits and wins are summed move by move.
+    """
+    merged = merge_root_statistics([
+        {1: (10, 4.0), 2: (3, 1.5)},
+        {1: (5, 2.0), 7: (1, 1.0)},
+        {}
+    ])
+    assert merged == {1: (15, 6.0), 2: (3, 1.5), 7: (1, 1.0)}
+
+
+def test_disabled_pool():
+    """
+    Test that no process is started without workers.
+    """
+    search = ParallelSearch(0)
+    assert search.start() is False
+    assert search.active is False
+    assert search.submit(_search_worker, [()]) == []
+    search.stop()
+
+
+def test_workers_return_root_statistics():
+    """
+    Test that every worker searches its own copy of the position.
+    """
+    bitboard = make_bitboard()
+    search = ParallelSearch(2, _init_worker)
+    assert search.start() is True
+    try:
+        deadline = time.time() + 0.3
+        stones = bitboard.stones
+        tasks = search.submit(_search_worker, [
+            (SIZE, stones[CONST.CELL_PLAYER], stones[CONST.CELL_ENEMY], deadline, seed)
+            for seed in (1, 2)
+        ])
+        results = search.collect(tasks, deadline)
+    finally:
+        search.stop()
+    assert search.active is False
+    assert len(results) == 2
+    for statistics in results:
+        assert statistics
+        for move in statistics:
+            assert bitboard.get_cell(*bitboard.coordinates(move)) == CONST.CELL_EMPTY
+
+
+def test_parallel_turn():
+    """
+    Test a full turn of the AI with its worker processes.
+    """
+    ai = AI(CONST.ENGINE_MCTS, 2)
+    ai.time_manager.timeout_turn = 600
+    assert ai.start_workers() is True
+    try:
+        bitboard = make_bitboard()
+        response = ai.play_ai_turn(bitboard)
+    finally:
+        ai.stop_workers()
+    y, x = map(int, response.split(","))
+    assert bitboard.get_cell(y, x) == CONST.CELL_EMPTY
@@ -0,0 +1,116 @@
+"""
+    File in charge of testing the search during the turn of the opponent.
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.parser import SystemBoard, ParserThread
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+
+def create_game(engine: str) -> tuple:
+    """
+    Create a pondering AI and a game board after our first move.
+    """
+    ai = AI(engine, 0)
+    ai.ponder = True
+    ai.time_manager.timeout_turn = 1000
+    game_board = SystemBoard()
+    game_board.create_board(15)
+    game_board.set_cell(7, 7, CONST.CELL_ENEMY)
+    game_board.set_cell(7, 8, CONST.CELL_PLAYER)
+    return ai, game_board
+
+
+def test_pondering_is_off_unless_enabled() -> None:
+    """
+    Test that no thread is started when pondering is disabled.
+    """
+    ai, game_board = create_game(CONST.ENGINE_MCTS)
+    ai.ponder = False
+    assert not ai.start_pondering(game_board.bitboard, game_board.candidates, game_board.evaluator)
+    assert ai.ponder_thread is None
+
+
+def test_pondering_leaves_the_game_board_untouched() -> None:
+    """
+    Test that the background search works on copies and stops on request.
+    """
+    ai, game_board = create_game(CONST.ENGINE_MCTS)
+    stones = dict(game_board.bitboard.stones)
+    moves = game_board.candidates.moves[:]
+    assert ai.start_pondering(game_board.bitboard, game_board.candidates, game_board.evaluator)
+    time.sleep(0.1)
+    ai.stop_pondering()
+    assert ai.ponder_thread is None
+    assert ai.ponder_nodes > 0
+    assert game_board.bitboard.stones == stones
+    assert game_board.candidates.moves == moves
+
+
+def test_next_turn_reuses_the_pondered_statistics() -> None:
+    """
+    Test that the search after the reply of the opponent finds the
+    positions explored while pondering.
+    """
+    for engine in (CONST.ENGINE_MCTS, CONST.ENGINE_ALPHABETA):
+        ai, game_board = create_game(engine)
+        ai.start_pondering(game_board.bitboard, game_board.candidates, game_board.evaluator)
+        time.sleep(0.2)
+        ai.stop_pondering()
+        table = ai.table if engine == CONST.ENGINE_MCTS else ai.alphabeta.table
+        assert len(table) > 0
+        game_board.set_cell(8, 8, CONST.CELL_ENEMY)
+        table.lookups = table.hits = 0
+        ai.time_manager.timeout_turn = 200
+        ai.play_ai_turn(game_board.bitboard, game_board.candidates, game_board.evaluator)
+        assert table.hits > 0
+
+
+def test_pondering_follows_the_forced_reply() -> None:
+    """
+    Test that a four of ours makes the pondering search the position after
+    the only reply of the opponent, and that a winning reply of the
+    opponent leaves nothing to ponder.
+    """
+    ai, game_board = create_game(CONST.ENGINE_MCTS)
+    for x in range(4, 8):
+        game_board.set_cell(10, x, CONST.CELL_PLAYER)
+    game_board.set_cell(10, 8, CONST.CELL_ENEMY)
+    ai.start_pondering(game_board.bitboard, game_board.candidates, game_board.evaluator)
+    time.sleep(0.1)
+    ai.stop_pondering()
+    assert ai.ponder_nodes > 0
+    assert ai.mcts.root_stones[CONST.CELL_ENEMY] >> game_board.bitboard.index(10, 3) & 1
+    game_board.set_cell(10, 3, CONST.CELL_ENEMY)
+    ai.time_manager.timeout_turn = 200
+    ai.play_ai_turn(game_board.bitboard, game_board.candidates, game_board.evaluator)
+    assert ai.mcts.reused_visits > 0
+    ai, game_board = create_game(CONST.ENGINE_MCTS)
+    for y in range(3, 7):
+        game_board.set_cell(y, 3, CONST.CELL_ENEMY)
+    ai.ponder_nodes = 0
+    ai.start_pondering(game_board.bitboard, game_board.candidates, game_board.evaluator)
+    ai.ponder_thread.join()
+    ai.stop_pondering()
+    assert ai.ponder_nodes == 0
+
+
+def test_info_switches_pondering() -> None:
+    """
+    Test the INFO key enabling and disabling the pondering.
+    """
+    ai, game_board = create_game(CONST.ENGINE_MCTS)
+    node = ParserThread(game_board, ai)
+    node.process_command(["INFO", "ponder", "0"])
+    assert ai.ponder is False
+    node.process_command(["INFO", "ponder", "1"])
+    assert ai.ponder is True
@@ -0,0 +1,126 @@
+"""
+    File in charge of testing the profiler of the turns.
+"""
+
+import os
+import sys
+import time
+import pstats
+import cProfile
+from io import StringIO
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.profiler import TurnProfiler, collapse_profile
+    from src.parser import SystemBoard, ParserThread, ProtocolWriter
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+
+def leaf(count: int) -> int:
+    """
+    Spend some time in a function of its own.
+    """
+    return sum(i * i for i in range(count))
+
+
+def busy(duration: float) -> int:
+    """
+    Keep the thread busy for duration seconds.
+    """
+    end = time.perf_counter() + duration
+    calls = 0
+    while time.perf_counter() < end:
+        leaf(2000)
+        calls += 1
+    return calls
+
+
+def read_stacks(path: str) -> dict:
+    """
+    Read a collapsed stacks file.
+    """
+    stacks = {}
+    with open(path, encoding="utf-8") as collapsed:
+        for line in collapsed:
+            stack, count = line.rstrip("\n").rsplit(" ", 1)
+            stacks[stack] = int(count)
+    return stacks
+
+
+def test_off_runs_without_files(tmp_path) -> None:
+    """
+    Test that a disabled profiler only calls the function.
+    """
+    profiler = TurnProfiler(CONST.PROFILE_OFF, str(tmp_path))
+    assert profiler.run(lambda: CONST.SUCCESS) == CONST.SUCCESS
+    assert profiler.files == []
+    assert os.listdir(tmp_path) == []
+    assert profiler.set_mode("perf") is False
+    assert profiler.mode == CONST.PROFILE_OFF
+
+
+def test_cprofile_writes_pstats_and_stacks(tmp_path) -> None:
+    """
+    Test the files of a turn under cProfile.
+    """
+    profiler = TurnProfiler(CONST.PROFILE_CPROFILE, str(tmp_path))
+    assert profiler.run(lambda: busy(0.05)) > 0
+    pstats_file, collapsed_file = profiler.files
+    assert pstats_file.endswith(f"-{os.getpid()}-0001{CONST.PROFILE_PSTATS}")
+    functions = {name for _, _, name in pstats.Stats(pstats_file).stats}
+    assert {"busy", "leaf"} <= functions
+    stacks = read_stacks(collapsed_file)
+    assert any("busy (test_profiler.py:30);leaf (test_profiler.py:23)" in stack for stack in stacks)
+    profiler.run(lambda: busy(0.01))
+    assert len(profiler.files) == 2
+    assert profiler.files[0].endswith(f"-{os.getpid()}-0002{CONST.PROFILE_PSTATS}")
+
+
+def test_collapsed_stacks_keep_the_time() -> None:
+    """
+    Test that the collapsed stacks share out the own time of the functions.
+    """
+    profile = cProfile.Profile()
+    profile.runcall(busy, 0.05)
+    total = sum(entry[2] for entry in pstats.Stats(profile).stats.values())
+    assert abs(sum(collapse_profile(profile).values()) / 1e6 - total) < 0.05 * total
+
+
+def test_sampling_records_the_playing_thread(tmp_path) -> None:
+    """
+    Test that the sampler reads the stacks below the profiled call.
+    """
+    profiler = TurnProfiler(CONST.PROFILE_SAMPLE, str(tmp_path))
+    profiler.run(lambda: busy(0.2))
+    assert len(profiler.files) == 1
+    stacks = read_stacks(profiler.files[0])
+    assert sum(stacks.values()) > 0
+    for stack in stacks:
+        assert stack.startswith("<lambda> (test_profiler.py:")
+        assert "busy (test_profiler.py:30)" in stack
+
+
+def test_info_profile_wraps_the_turns(tmp_path) -> None:
+    """
+    Test that "INFO profile" profiles the following turns.
+    """
+    node = ParserThread(SystemBoard(), AI(CONST.ENGINE_MCTS, 0), ProtocolWriter(StringIO()))
+    node.ai.ponder = False
+    node.profiler.folder = str(tmp_path)
+    node.dispatch("START 15")
+    node.dispatch("INFO timeout_turn 100")
+    node.dispatch("TURN 7,7")
+    assert os.listdir(tmp_path) == []
+    node.dispatch("INFO profile cprofile")
+    row = 0 if node.game_board.board[0][0] == CONST.CELL_EMPTY else 14
+    node.dispatch(f"TURN {row},{row}")
+    assert sorted(os.listdir(tmp_path)) == [
+        f"{CONST.PROFILE_FILE_PREFIX}-{os.getpid()}-0001{CONST.PROFILE_COLLAPSED}",
+        f"{CONST.PROFILE_FILE_PREFIX}-{os.getpid()}-0001{CONST.PROFILE_PSTATS}"
+    ]
+    functions = {name for _, _, name in pstats.Stats(node.profiler.files[0]).stats}
+    assert "play_ai_turn" in functions
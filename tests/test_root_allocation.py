@@ -0,0 +1,75 @@
+"""
+    File in charge of testing the successive halving of the root playouts.
+"""
+
+import os
+import sys
+import time
+import random
+from typing import Dict, Optional
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.bitboard import BitBoard
+    from src.candidates import CandidateSet
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+SEED = 11
+FAR_DEADLINE = 60.0
+BEST_CELL = (9, 11)
+
+
+def make_position():
+    """
+    Create a crowded position with many root candidates.
+    """
+    rng = random.Random(SEED)
+    board = [[CONST.CELL_EMPTY for _ in range(20)] for _ in range(20)]
+    for _ in range(40):
+        y, x = rng.randrange(5, 15), rng.randrange(5, 15)
+        if (y, x) != BEST_CELL:
+            board[y][x] = rng.choice((CONST.CELL_PLAYER, CONST.CELL_ENEMY))
+    board[BEST_CELL[0]][BEST_CELL[1]] = CONST.CELL_EMPTY
+    return BitBoard.from_board(board), CandidateSet.from_board(board)
+
+
+def test_successive_halving_finds_the_best_candidate():
+    """
+    Test that every candidate is sampled and the best one gets the most playouts.
+    """
+    random.seed(SEED)
+    bitboard, candidates = make_position()
+    best_bit = 1 << bitboard.index(*BEST_CELL)
+    calls: Dict[int, int] = {}
+
+    def fake_playout(board: BitBoard, player: int, depth: int, cands: Optional[CandidateSet] = None) -> int:
+        root = board.stones[CONST.CELL_PLAYER]
+        calls[root] = calls.get(root, 0) + 1
+        if root & best_bit:
+            return 1 if random.random() < 0.9 else 0
+        return random.choice((-1, 0, 0, 1))
+
+    ai = AI(CONST.ENGINE_FLAT)
+    ai._simulate_random_game_bitboard = fake_playout
+    count = len(candidates)
+    move = ai._play_flat_monte_carlo(bitboard, candidates, time.time() + FAR_DEADLINE)
+    assert count > 100
+    assert move == BEST_CELL
+    assert len(calls) == count
+    assert sum(calls.values()) <= count * CONST.MAX_SIMULATIONS
+    best_calls = [value for key, value in calls.items() if key & best_bit][0]
+    assert best_calls == max(calls.values())
+
+
+def test_successive_halving_answers_when_out_of_time():
+    """
+    Test that a deadline in the past still gives a candidate.
+    """
+    bitboard, candidates = make_position()
+    ai = AI(CONST.ENGINE_FLAT)
+    move = ai._play_flat_monte_carlo(bitboard, candidates, time.time() - 1.0)
+    assert move in candidates
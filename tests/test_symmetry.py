@@ -0,0 +1,196 @@
+"""
+    File in charge of testing the canonical keys of the positions.
+"""
+
+import os
+import sys
+import random
+import unittest.mock
+from io import StringIO
+from typing import List
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.alphabeta import AlphaBeta
+    from src.bitboard import BitBoard
+    from src.candidates import CandidateSet
+    from src.evaluator import Evaluator, _line_entry
+    from src.opening_book import write_book
+    from src.parser import SystemBoard, ParserThread, ProtocolWriter
+    from src.symmetry import Symmetry
+    from src.zobrist import TranspositionTable, Zobrist
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+SIZE = 15
+
+
+def random_board(stones: int, seed: int) -> List[List[int]]:
+    """
+    Create a board holding the given number of random stones.
+    """
+    generator = random.Random(seed)
+    board = [[CONST.CELL_EMPTY] * SIZE for _ in range(SIZE)]
+    for turn in range(stones):
+        y, x = generator.randrange(SIZE), generator.randrange(SIZE)
+        board[y][x] = CONST.CELL_PLAYER if turn % 2 == 0 else CONST.CELL_ENEMY
+    return board
+
+
+def transformed(board: List[List[int]], symmetry: Symmetry, transform: int) -> List[List[int]]:
+    """
+    Return the image of a list based board by a transform.
+    """
+    image = [[CONST.CELL_EMPTY] * SIZE for _ in range(SIZE)]
+    for y in range(SIZE):
+        for x in range(SIZE):
+            row, col = symmetry.cell_to_canonical(y, x, transform)
+            image[row][col] = board[y][x]
+    return image
+
+
+def test_transforms_are_the_eight_symmetries() -> None:
+    """
+    Test that the maps are distinct permutations of the cells, undone by their inverse.
+    """
+    symmetry = Symmetry(SIZE)
+    cells = {y * (SIZE + 1) + x for y in range(SIZE) for x in range(SIZE)}
+    images = set()
+    for transform in range(CONST.SYMMETRIES):
+        mapped = [symmetry.to_canonical(cell, transform) for cell in sorted(cells)]
+        assert set(mapped) == cells
+        images.add(tuple(mapped))
+        for cell in cells:
+            assert symmetry.from_canonical(symmetry.to_canonical(cell, transform), transform) == cell
+    assert len(images) == CONST.SYMMETRIES
+    assert symmetry.cell_to_canonical(0, 1, 1) == (1, 0)
+
+
+def test_images_share_the_canonical_key() -> None:
+    """
+    Test that the eight images of a position have the same canonical key and
+    that the identity key is the plain Zobrist key.
+    """
+    symmetry = Symmetry(SIZE)
+    board = random_board(12, 1)
+    stones = BitBoard.from_board(board).stones
+    key, _ = symmetry.canonical(stones)
+    assert symmetry.hashes(stones)[0] == Zobrist(SIZE).hash_stones(stones)
+    for transform in range(CONST.SYMMETRIES):
+        image = transformed(board, symmetry, transform)
+        assert symmetry.canonical(BitBoard.from_board(image).stones)[0] == key
+    assert symmetry.canonical(BitBoard.from_board(random_board(12, 2)).stones)[0] != key
+
+
+def test_canonical_move_maps_back_onto_the_board() -> None:
+    """
+    Test that a move stored in the canonical frame comes back as the same
+    move of every image.
+    """
+    symmetry = Symmetry(SIZE)
+    board = random_board(9, 3)
+    key, transform = symmetry.canonical(BitBoard.from_board(board).stones)
+    stored = symmetry.cell_to_canonical(2, 5, transform)
+    for image_transform in range(CONST.SYMMETRIES):
+        image = transformed(board, symmetry, image_transform)
+        image_key, image_canonical = symmetry.canonical(BitBoard.from_board(image).stones)
+        assert image_key == key
+        row, col = symmetry.cell_from_canonical(stored[0], stored[1], image_canonical)
+        assert image[row][col] == board[2][5]
+        assert (row, col) == symmetry.cell_to_canonical(2, 5, image_transform)
+
+
+def test_system_board_keeps_the_hashes_in_sync() -> None:
+    """
+    Test that the incremental keys of the board match a full computation.
+    """
+    game_board = SystemBoard()
+    game_board.create_board(SIZE)
+    board = random_board(20, 4)
+    for y in range(SIZE):
+        for x in range(SIZE):
+            if board[y][x] != CONST.CELL_EMPTY:
+                game_board.set_cell(y, x, board[y][x])
+    game_board.set_cell(0, 0, CONST.CELL_PLAYER)
+    game_board.set_cell(0, 0, CONST.CELL_ENEMY)
+    game_board.set_cell(0, 0, CONST.CELL_EMPTY)
+    assert game_board.canonical() == game_board.symmetry.canonical(game_board.bitboard.stones)
+    assert game_board.hashes[0] == game_board.hash
+    game_board.clear_board()
+    assert game_board.canonical() == (0, 0)
+
+
+def test_book_answers_every_image(tmp_path) -> None:
+    """
+    Test that one book record answers the eight images of its position.
+    """
+    symmetry = Symmetry(SIZE)
+    board = [[CONST.CELL_EMPTY] * SIZE for _ in range(SIZE)]
+    board[7][7] = CONST.CELL_ENEMY
+    board[7][8] = CONST.CELL_PLAYER
+    board[6][9] = CONST.CELL_ENEMY
+    key, transform = symmetry.canonical(BitBoard.from_board(board).stones)
+    write_book(
+        os.path.join(str(tmp_path), CONST.OPENING_BOOK_FILE),
+        {key: {symmetry.cell_to_canonical(5, 10, transform): 1}}
+    )
+    ai = AI(CONST.ENGINE_MCTS, 0)
+    assert ai.book.open(str(tmp_path))
+    for image_transform in range(CONST.SYMMETRIES):
+        image = transformed(board, symmetry, image_transform)
+        expected = symmetry.cell_to_canonical(5, 10, image_transform)
+        assert ai.play_ai_turn(image) == f"{expected[0]},{expected[1]}"
+        assert ai.nodes == 0
+    ai.book.close()
+
+
+def test_alphabeta_table_is_shared_by_the_images() -> None:
+    """
+    Test that the best move stored for a position is found for its images.
+    """
+    board = random_board(10, 5)
+    engine = AlphaBeta(table=TranspositionTable(1 << 12), symmetry=Symmetry())
+    engine.search(
+        BitBoard.from_board(board), CandidateSet.from_board(board),
+        Evaluator.from_board(board), float("inf"), 2
+    )
+    assert engine.nodes > 0
+    best = engine.candidates.moves[0]
+    engine._store_move(best, 0, CONST.ALPHABETA_MAX_DEPTH)
+    assert engine._probe_move() == best
+    symmetry = engine.symmetry
+    for transform in range(CONST.SYMMETRIES):
+        image = transformed(board, symmetry, transform)
+        engine.hashes = symmetry.hashes(BitBoard.from_board(image).stones)
+        assert engine._probe_move() == symmetry.to_canonical(best, transform)
+
+
+def test_turn_uses_the_keys_of_the_game_board(tmp_path) -> None:
+    """
+    Test that the book lookup and the alpha-beta root take the keys kept by
+    the game board, and that the tables of a size are built once.
+    """
+    write_book(os.path.join(str(tmp_path), CONST.OPENING_BOOK_FILE), {1: {(0, 0): 1}})
+    node = ParserThread(SystemBoard(), AI(CONST.ENGINE_ALPHABETA, 0), ProtocolWriter(StringIO()))
+    node.ai.ponder = False
+    node.dispatch("START 15")
+    node.dispatch("INFO timeout_turn 100")
+    node.dispatch(f"INFO folder {tmp_path}")
+    assert node.ai.book.loaded
+    with unittest.mock.patch.object(Symmetry, "hashes", side_effect=AssertionError):
+        assert node.dispatch("TURN 7,7") == CONST.SUCCESS
+    assert node.ai.alphabeta.nodes > 0
+    assert node.ai.symmetry.maps is node.game_board.symmetry.maps
+    assert node.ai.alphabeta.symmetry.keys is node.game_board.symmetry.keys
+    node.ai.book.close()
+
+
+def test_line_cache_is_shared_by_both_directions() -> None:
+    """
+    Test that a line and its reverse share their cache entry.
+    """
+    line = b"0112010221"
+    assert _line_entry(line) is _line_entry(line[::-1])
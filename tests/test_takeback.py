@@ -0,0 +1,134 @@
+"""
+    File in charge of testing the TAKEBACK command.
+"""
+
+import os
+import sys
+import random
+from io import StringIO
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.mcts import MCTS
+    from src.parser import SystemBoard, ParserThread, ProtocolWriter
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+SEED = 5
+ITERATIONS = 300
+STONES = [((7, 7), CONST.CELL_ENEMY), ((7, 8), CONST.CELL_PLAYER), ((8, 8), CONST.CELL_ENEMY), ((6, 6), CONST.CELL_PLAYER)]
+
+
+def create_position() -> SystemBoard:
+    """
+    Create a game board with a few stones.
+    """
+    game_board = SystemBoard()
+    game_board.create_board(15)
+    for (row, col), value in STONES:
+        game_board.set_cell(row, col, value)
+    return game_board
+
+
+def assert_same_position(game_board: SystemBoard, expected: SystemBoard) -> None:
+    """
+    Check that every structure of game_board matches the ones of expected.
+    """
+    assert game_board.board == expected.board
+    assert game_board.bitboard.stones == expected.bitboard.stones
+    assert sorted(game_board.candidates.moves) == sorted(expected.candidates.moves)
+    assert game_board.candidates.counts == expected.candidates.counts
+    assert game_board.evaluator.totals == expected.evaluator.totals
+    assert game_board.evaluator.shapes == expected.evaluator.shapes
+    assert game_board.hash == expected.hash
+    assert game_board.hashes == expected.hashes
+
+
+def test_take_back_restores_every_structure() -> None:
+    """
+    Test that removing the last stones gives back the earlier positions.
+    """
+    game_board = create_position()
+    for count in range(len(STONES) - 1, -1, -1):
+        (row, col), value = STONES[count]
+        assert game_board.take_back(row, col) == value
+        expected = SystemBoard()
+        expected.create_board(15)
+        expected.load(dict(STONES[:count]))
+        assert_same_position(game_board, expected)
+    assert game_board.take_back(7, 7) == CONST.CELL_EMPTY
+
+
+def test_takeback_command_replies_ok() -> None:
+    """
+    Test the replies of the manager command.
+    """
+    stream = StringIO()
+    node = ParserThread(create_position(), None, ProtocolWriter(stream))
+    assert node.dispatch("TAKEBACK 6,6") == CONST.SUCCESS
+    assert node.game_board.get_cell(6, 6) == CONST.CELL_EMPTY
+    assert node.dispatch("TAKEBACK 6,6") == CONST.ERROR
+    assert node.dispatch("TAKEBACK 20,1") == CONST.ERROR
+    assert stream.getvalue().splitlines() == [
+        "OK", "ERROR Invalid board cell: 6,6", "ERROR Invalid turn parameters: 20"
+    ]
+
+
+def test_takeback_steps_the_tree_back() -> None:
+    """
+    Test that the tree is kept under a new root for the earlier position
+    and reused when the same stone is played again.
+    """
+    random.seed(SEED)
+    game_board = create_position()
+    search = MCTS(lambda *_: 0)
+    search.search(game_board.bitboard.copy(), game_board.candidates.copy(), float("inf"), ITERATIONS)
+    tree = search.tree
+    root = search.root
+    visits = tree.visits[root]
+    index = game_board.bitboard.index(8, 8)
+    search.take_back(index, CONST.CELL_ENEMY)
+    game_board.take_back(8, 8)
+    assert tree.children(search.root) == [root]
+    assert tree.moves[root] == index
+    assert search.root_stones == game_board.bitboard.stones
+    assert tree.visits[search.root] == visits
+    game_board.set_cell(8, 8, CONST.CELL_ENEMY)
+    search.search(game_board.bitboard.copy(), game_board.candidates.copy(), float("inf"), ITERATIONS)
+    assert search.reused_visits == visits
+
+
+def test_takeback_of_the_side_to_move_drops_the_tree() -> None:
+    """
+    Test that a stone that cannot be undone above the root drops the tree.
+    """
+    random.seed(SEED)
+    game_board = create_position()
+    search = MCTS(lambda *_: 0)
+    search.search(game_board.bitboard.copy(), game_board.candidates.copy(), float("inf"), ITERATIONS)
+    search.take_back(game_board.bitboard.index(6, 6), CONST.CELL_PLAYER)
+    assert search.root == CONST.MCTS_NO_NODE
+    assert search.tree.count == 0
+
+
+def test_takeback_through_the_ai() -> None:
+    """
+    Test that the AI follows a takeback of its own move.
+    """
+    stream = StringIO()
+    game_board = SystemBoard()
+    node = ParserThread(game_board, AI(CONST.ENGINE_MCTS, 0), ProtocolWriter(stream))
+    node.ai.ponder = False
+    node.dispatch("INFO timeout_turn 200")
+    node.dispatch("START 15")
+    node.dispatch("TURN 7,7")
+    row, col = (int(value) for value in stream.getvalue().splitlines()[-1].split(","))
+    stones = dict(game_board.bitboard.stones)
+    assert node.dispatch(f"TAKEBACK {row},{col}") == CONST.SUCCESS
+    assert stream.getvalue().splitlines()[-1] == "OK"
+    stones[CONST.CELL_PLAYER] &= ~(1 << game_board.bitboard.index(row, col))
+    assert game_board.bitboard.stones == stones
+    assert node.ai.mcts.root_stones.get(CONST.CELL_PLAYER, 0) & ~stones[CONST.CELL_PLAYER] == 0
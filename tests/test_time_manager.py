@@ -0,0 +1,103 @@
+"""
+    File in charge of testing the time manager of the AI.
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.parser import ParserThread, SystemBoard
+    from src.time_manager import TimeManager
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+
+def test_default_budget():
+    """
+    Test that the default limit keeps the historical 4.8 seconds.
+    """
+    manager = TimeManager()
+    assert abs(manager.turn_budget() - 4.8) < 1e-9
+
+
+def test_play_as_fast_as_possible():
+    """
+    Test that a turn limit of 0 gives the minimal thinking time.
+    """
+    manager = TimeManager()
+    assert manager.update(CONST.INFO_TIMEOUT_TURN, "0") is True
+    assert manager.turn_budget(criticality=CONST.TIME_CRITICAL_FACTOR) == CONST.TIME_FAST_MOVE
+
+
+def test_match_time_is_shared():
+    """
+    Test that the remaining match time is shared between the moves left.
+    """
+    manager = TimeManager()
+    manager.update(CONST.INFO_TIMEOUT_TURN, "30000")
+    manager.update(CONST.INFO_TIMEOUT_MATCH, "180000")
+    manager.update(CONST.INFO_TIME_LEFT, "100000")
+    quiet = manager.turn_budget(20, 1.0)
+    critical = manager.turn_budget(20, CONST.TIME_CRITICAL_FACTOR)
+    assert quiet == 100 / (CONST.TIME_EXPECTED_MOVES - 10)
+    assert quiet < critical < 30
+    manager.update(CONST.INFO_TIME_LEFT, "-20")
+    assert manager.turn_budget(20, 1.0) == CONST.TIME_FAST_MOVE
+
+
+def test_unlimited_match_and_invalid_values():
+    """
+    Test the unlimited time left value and the rejected INFO values.
+    """
+    manager = TimeManager()
+    manager.update(CONST.INFO_TIMEOUT_TURN, "2000")
+    manager.update(CONST.INFO_TIME_LEFT, str(CONST.TIME_LEFT_UNLIMITED))
+    assert manager.turn_budget() == 2 - CONST.TIME_MARGIN_MIN
+    assert manager.update(CONST.INFO_TIMEOUT_TURN, "fast") is False
+    assert manager.update("evaluate", "10,10") is False
+    assert manager.timeout_turn == 2000
+
+
+def test_deadline_starts_at_begin_turn():
+    """
+    Test that the deadline counts from the start of the turn, once.
+    """
+    manager = TimeManager()
+    start = time.time() - 1.0
+    manager.begin_turn(start)
+    assert manager.deadline() == start + manager.turn_budget()
+    assert manager.deadline() > start + manager.turn_budget()
+
+
+def test_info_command_reaches_the_time_manager():
+    """
+    Test that the INFO command updates the time manager of the AI.
+    """
+    node = ParserThread(SystemBoard(), AI())
+    node.process_command([CONST.CMD_INFO, "timeout_turn", "1000"])
+    node.process_command([CONST.CMD_INFO, "time_left", "50000"])
+    node.process_command([CONST.CMD_INFO, "max_memory", "83886080"])
+    assert node.ai.time_manager.timeout_turn == 1000
+    assert node.ai.time_manager.time_left == 50000
+    assert node.global_status == CONST.SUCCESS
+
+
+def test_new_game_restores_the_default_limits():
+    """
+    Test that START and RESTART forget the time limits of the previous game.
+    """
+    node = ParserThread(SystemBoard(), AI(CONST.ENGINE_MCTS, 0))
+    for command in ([CONST.CMD_START, "15"], [CONST.CMD_RESTART]):
+        node.process_command([CONST.CMD_INFO, "timeout_turn", "1000"])
+        node.process_command([CONST.CMD_INFO, "timeout_match", "90000"])
+        node.process_command([CONST.CMD_INFO, "time_left", "50000"])
+        node.process_command(command)
+        assert node.ai.time_manager.timeout_turn == CONST.DEFAULT_TIMEOUT_TURN
+        assert node.ai.time_manager.timeout_match == CONST.DEFAULT_TIMEOUT_MATCH
+        assert node.ai.time_manager.time_left is None
+    node.process_command([CONST.CMD_END])
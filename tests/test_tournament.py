@@ -0,0 +1,64 @@
+"""
+    File in charge of testing the statistics and the openings of the match harness.
+"""
+
+import os
+import sys
+import math
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from benchmarks.tournament import elo, make_opening, score_interval
+    from src.bitboard import BitBoard
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+
+def test_score_interval() -> None:
+    """
+    Test the mean score and its 95% confidence interval.
+    """
+    mean, low, high = score_interval([1.0, 0.0] * 10)
+    error = 1.96 * math.sqrt((20 * 0.25 / 19) / 20)
+    assert mean == 0.5
+    assert math.isclose(low, 0.5 - error)
+    assert math.isclose(high, 0.5 + error)
+    assert score_interval([1.0, 0.0, 1.0, 0.0]) == (0.5, 0.0, 1.0)
+    assert score_interval([1.0, 1.0, 1.0]) == (1.0, 1.0, 1.0)
+    assert score_interval([]) == (0.0, 0.0, 0.0)
+
+
+def test_elo() -> None:
+    """
+    Test the sign and the symmetry of the Elo difference.
+    """
+    assert elo(0.5) == 0.0
+    assert elo(0.75) > 0 > elo(0.25)
+    assert math.isclose(elo(0.75), -elo(0.25))
+    assert math.isclose(elo(10 / 11), 400)
+    assert math.isclose(elo(1.0), -elo(0.0))
+
+
+def test_make_opening() -> None:
+    """
+    Test that an opening has its stones, on distinct cells of the board and
+    without five, and that a seed always gives the same opening.
+    """
+    size = 20
+    for seed in range(20):
+        opening = make_opening(size, 5, seed)
+        assert len(opening) == 5
+        assert opening[0] == (size // 2, size // 2)
+        assert len(set(opening)) == len(opening)
+        assert all(0 <= y < size and 0 <= x < size for y, x in opening)
+        board = [[CONST.CELL_EMPTY] * size for _ in range(size)]
+        for turn, (y, x) in enumerate(opening):
+            board[y][x] = CONST.CELL_PLAYER if turn % 2 == 0 else CONST.CELL_ENEMY
+        bitboard = BitBoard.from_board(board)
+        assert not bitboard.has_five(CONST.CELL_PLAYER)
+        assert not bitboard.has_five(CONST.CELL_ENEMY)
+        assert make_opening(size, 5, seed) == opening
+    assert make_opening(size, 5, 1) != make_opening(size, 5, 2)
+    assert make_opening(size, 0, 1) == []
@@ -0,0 +1,135 @@
+"""
+    File in charge of testing the reuse of the search tree between the turns.
+"""
+
+import os
+import sys
+import random
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.bitboard import BitBoard
+    from src.candidates import CandidateSet
+    from src.mcts import MCTS
+    from src.parser import SystemBoard, ParserThread
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+SEED = 3
+ITERATIONS = 300
+
+
+def create_position() -> SystemBoard:
+    """
+    Create a game board with a few stones.
+    """
+    game_board = SystemBoard()
+    game_board.create_board(12)
+    game_board.set_cell(5, 5, CONST.CELL_ENEMY)
+    game_board.set_cell(5, 6, CONST.CELL_PLAYER)
+    game_board.set_cell(6, 6, CONST.CELL_ENEMY)
+    return game_board
+
+
+def run(search: MCTS, game_board: SystemBoard, player: int = CONST.CELL_PLAYER) -> tuple:
+    """
+    Search the game board for a fixed number of iterations.
+    """
+    return search.search(
+        game_board.bitboard.copy(), game_board.candidates.copy(),
+        float("inf"), ITERATIONS, game_board.evaluator.copy(), player
+    )
+
+
+def test_tree_is_rerooted_after_both_moves() -> None:
+    """
+    Test that the node of our move then of the reply becomes the new root.
+    """
+    random.seed(SEED)
+    game_board = create_position()
+    search = MCTS(lambda *_: 0)
+    tree = search.tree
+    move = run(search, game_board)
+    child = next(node for node in tree.children(search.root) if tree.moves[node] == game_board.bitboard.index(*move))
+    assert tree.child_count[child] > 0
+    reply = tree.first_child[child]
+    reply_move = tree.moves[reply]
+    game_board.set_cell(move[0], move[1], CONST.CELL_PLAYER)
+    game_board.set_cell(*game_board.bitboard.coordinates(reply_move), CONST.CELL_ENEMY)
+    inherited = tree.visits[reply]
+    kept = len(tree.subtree(reply))
+    run(search, game_board)
+    assert search.root == 0
+    assert tree.moves[search.root] == reply_move
+    assert search.reused_visits == inherited
+    assert tree.visits[search.root] == inherited + ITERATIONS
+    assert tree.count >= kept
+
+
+def test_tree_is_rerooted_after_our_move_only() -> None:
+    """
+    Test the reuse for the position after our move (opponent to move).
+    """
+    random.seed(SEED)
+    game_board = create_position()
+    search = MCTS(lambda *_: 0)
+    tree = search.tree
+    move = run(search, game_board)
+    best = max(tree.children(search.root), key=lambda node: tree.visits[node])
+    inherited = tree.visits[best]
+    assert tree.moves[best] == game_board.bitboard.index(*move)
+    game_board.set_cell(move[0], move[1], CONST.CELL_PLAYER)
+    run(search, game_board, CONST.CELL_ENEMY)
+    assert tree.moves[search.root] == game_board.bitboard.index(*move)
+    assert search.reused_visits == inherited
+
+
+def test_tree_is_dropped_when_the_position_does_not_follow() -> None:
+    """
+    Test that a removed stone or an unexplored reply starts a new tree.
+    """
+    random.seed(SEED)
+    game_board = create_position()
+    search = MCTS(lambda *_: 0)
+    run(search, game_board)
+    game_board.set_cell(5, 5, CONST.CELL_EMPTY)
+    run(search, game_board)
+    assert search.reused_visits == 0
+    game_board.set_cell(0, 0, CONST.CELL_PLAYER)
+    game_board.set_cell(11, 11, CONST.CELL_ENEMY)
+    run(search, game_board)
+    assert search.reused_visits == 0
+    assert search.tree.moves[search.root] == -1
+
+
+def test_restart_and_start_reset_the_tree() -> None:
+    """
+    Test that a new game forgets the tree of the previous one.
+    """
+    ai = AI(CONST.ENGINE_MCTS, 0)
+    game_board = create_position()
+    run(ai.mcts, game_board)
+    node = ParserThread(game_board, ai)
+    node.process_command(["RESTART"])
+    assert ai.mcts.root == CONST.MCTS_NO_NODE
+    run(ai.mcts, game_board)
+    node.process_command(["START", "12"])
+    assert ai.mcts.root == CONST.MCTS_NO_NODE
+
+
+def test_bitboard_is_untouched_by_the_reuse() -> None:
+    """
+    Test that a reused search restores the position it was given.
+    """
+    random.seed(SEED)
+    game_board = create_position()
+    search = MCTS(lambda *_: 0)
+    run(search, game_board)
+    bitboard = game_board.bitboard.copy()
+    candidates = game_board.candidates.copy()
+    search.search(bitboard, candidates, float("inf"), ITERATIONS)
+    assert bitboard.stones == game_board.bitboard.stones
+    assert sorted(candidates.moves) == sorted(CandidateSet.from_board(BitBoard.to_board(bitboard)).moves)
@@ -0,0 +1,132 @@
+"""
+    File in charge of testing the Zobrist keys and the transposition table.
+"""
+
+import os
+import sys
+import random
+import unittest.mock
+from io import StringIO
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join("..", os.getcwd()))
+try:
+    from src.ai import AI
+    from src.bitboard import BitBoard
+    from src.candidates import CandidateSet
+    from src.mcts import MCTS
+    from src.parser import SystemBoard, ParserThread, ProtocolWriter
+    from src.zobrist import TranspositionTable, Zobrist
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+SEED = 11
+
+
+def test_keys_are_the_same_in_every_instance() -> None:
+    """
+    Test that two tables of the same size draw the same keys.
+    """
+    assert Zobrist(15).keys == Zobrist(15).keys
+
+
+def test_incremental_hash_matches_full_hash() -> None:
+    """
+    Test that the hash kept by the game board follows random placements and removals.
+    """
+    random.seed(SEED)
+    game_board = SystemBoard()
+    game_board.create_board(15)
+    for _ in range(300):
+        row, col = random.randrange(15), random.randrange(15)
+        value = random.choice((CONST.CELL_EMPTY, CONST.CELL_PLAYER, CONST.CELL_ENEMY))
+        game_board.set_cell(row, col, value)
+        assert game_board.hash == game_board.zobrist.hash_board(game_board.board)
+    assert game_board.hash == game_board.zobrist.hash_stones(game_board.bitboard.stones)
+    game_board.clear_board()
+    assert game_board.hash == 0
+
+
+def test_move_order_gives_the_same_key() -> None:
+    """
+    Test that transposed move orders reach the same key.
+    """
+    zobrist = Zobrist(10)
+    first = zobrist.toggle(zobrist.toggle(0, 12, CONST.CELL_PLAYER), 40, CONST.CELL_ENEMY)
+    second = zobrist.toggle(zobrist.toggle(0, 40, CONST.CELL_ENEMY), 12, CONST.CELL_PLAYER)
+    assert first == second != 0
+
+
+def test_table_probe_and_hit_rate() -> None:
+    """
+    Test that stored entries are found and that the lookups are counted.
+    """
+    table = TranspositionTable(8)
+    assert table.probe(123) is None
+    table.store(123, 10, 6.5, 4, 10)
+    assert table.probe(123) == (10, 6.5, 4, 10)
+    assert table.hit_rate() == 0.5
+    table.clear()
+    assert table.probe(123) is None
+    assert len(table) == 0
+
+
+def test_table_replacement_policy() -> None:
+    """
+    Test that a deep entry only gives way to a deeper one, while the second
+    entry of the bucket is always replaced.
+    """
+    table = TranspositionTable(4)
+    deep, shallow, other = 1, 1 + 4, 1 + 8
+    table.store(deep, 50, 25.0, -1, 50)
+    table.store(shallow, 2, 1.0, -1, 2)
+    table.store(other, 3, 1.0, -1, 3)
+    assert table.probe(deep) is not None
+    assert table.probe(shallow) is None
+    assert table.probe(other) is not None
+    table.store(shallow, 80, 1.0, -1, 80)
+    assert table.probe(shallow) is not None
+    assert table.probe(deep) is None
+    assert len(table) == 2
+
+
+def test_tree_search_fills_and_reuses_the_table() -> None:
+    """
+    Test that a second search of the same position, started without the
+    previous tree, hits the stored nodes.
+    """
+    random.seed(SEED)
+    board = [[CONST.CELL_EMPTY for _ in range(10)] for _ in range(10)]
+    board[4][4] = CONST.CELL_PLAYER
+    board[5][5] = CONST.CELL_ENEMY
+    bitboard = BitBoard.from_board(board)
+    candidates = CandidateSet.from_board(board)
+    table = TranspositionTable(1 << 10)
+    search = MCTS(lambda *_: 0, table=table)
+    search.search(bitboard, candidates, float("inf"), 200)
+    assert len(table) > 0
+    first_rate = table.hit_rate()
+    search.reset()
+    search.search(bitboard, candidates, float("inf"), 200)
+    assert table.hit_rate() > first_rate
+    assert bitboard.stones == BitBoard.from_board(board).stones
+
+
+def test_turn_searches_from_the_key_of_the_game_board() -> None:
+    """
+    Test that the engines start from the key kept by the game board instead
+    of hashing the stones again.
+    """
+    for engine in (CONST.ENGINE_MCTS, CONST.ENGINE_ALPHABETA):
+        node = ParserThread(SystemBoard(), AI(engine, 0), ProtocolWriter(StringIO()))
+        node.ai.ponder = False
+        node.dispatch("START 15")
+        node.dispatch("INFO timeout_turn 100")
+        node.dispatch("TURN 7,7")
+        row = 0 if node.game_board.board[0][0] == CONST.CELL_EMPTY else 14
+        with unittest.mock.patch.object(Zobrist, "hash_stones", side_effect=AssertionError):
+            key = node.game_board.zobrist.toggle(node.game_board.hash, node.game_board.bitboard.index(row, row), CONST.CELL_ENEMY)
+            assert node.dispatch(f"TURN {row},{row}") == CONST.SUCCESS
+        if engine == CONST.ENGINE_MCTS:
+            assert node.ai.mcts.tree.keys[node.ai.mcts.root] == key
@@ -0,0 +1,105 @@
+"""
+    Build (or extend) the opening book of the AI from self-play games.
+
+    Every game starts at the centre, the second stone is drawn at random
+    next to it so that the games explore different openings, then the
+    alpha-beta engine plays both sides. The moves chosen by the engine while
+    the board holds fewer than OPENING_BOOK_STONES stones are recorded, the
+    weight of a move being the number of games that chose it. Positions are
+    recorded under their canonical key, the moves in the canonical frame.
+
+    Usage (from the root of the repository):
+        python3 tools/build_opening_book.py <folder> [games] [timeout_turn_ms] [board_size]
+"""
+
+import os
+import sys
+import random
+from typing import List, Tuple
+
+sys.path.append(os.getcwd())
+try:
+    from src.ai import AI
+    from src.bitboard import BitBoard
+    from src.opening_book import BookEntries, read_book, write_book
+    from src.symmetry import Symmetry
+    from src import constants as CONST
+except ImportError as e:
+    raise ImportError("The module is not found") from e
+
+
+def player_view(board: List[List[int]], colour: int) -> List[List[int]]:
+    """
+    Return the board seen by the player of the given colour (its stones are CELL_PLAYER).
+    """
+    return [
+        [cell if cell == CONST.CELL_EMPTY else (CONST.CELL_PLAYER if cell == colour else CONST.CELL_ENEMY) for cell in row]
+        for row in board
+    ]
+
+
+def record(symmetry: Symmetry, board: List[List[int]], move: Tuple[int, int], entries: BookEntries) -> None:
+    """
+    Count one more game choosing move in the position of board.
+    """
+    key, transform = symmetry.canonical(BitBoard.from_board(board).stones)
+    cell: Tuple[int, int] = symmetry.cell_to_canonical(move[0], move[1], transform)
+    moves = entries.setdefault(key, {})
+    moves[cell] = moves.get(cell, 0) + 1
+
+
+def play_opening(ai: AI, symmetry: Symmetry, size: int, entries: BookEntries) -> None:
+    """
+    Play the opening of one game and record the moves of the engine.
+    """
+    board = [[CONST.CELL_EMPTY] * size for _ in range(size)]
+    center: int = size // 2
+    colour: int = CONST.CELL_PLAYER
+    record(symmetry, board, (center, center), entries)
+    board[center][center] = colour
+    colour = 3 - colour
+    around: List[Tuple[int, int]] = [
+        (center + dy, center + dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx
+    ]
+    y, x = random.choice(around)
+    board[y][x] = colour
+    colour = 3 - colour
+    for _ in range(CONST.OPENING_BOOK_STONES - 2):
+        view = player_view(board, colour)
+        y, x = map(int, ai.play_ai_turn(view).split(","))
+        record(symmetry, view, (y, x), entries)
+        board[y][x] = colour
+        if BitBoard.from_board(board).has_five(colour):
+            return
+        colour = 3 - colour
+
+
+def main(arguments: List[str]) -> int:
+    """
+    Play the games and write the merged book into the folder.
+    """
+    if not arguments:
+        print(__doc__)
+        return CONST.ERROR
+    folder: str = arguments[0]
+    games: int = int(arguments[1]) if len(arguments) > 1 else 16
+    timeout_turn: int = int(arguments[2]) if len(arguments) > 2 else 1000
+    size: int = int(arguments[3]) if len(arguments) > 3 else 20
+    os.makedirs(folder, exist_ok=True)
+    path: str = os.path.join(folder, CONST.OPENING_BOOK_FILE)
+    entries: BookEntries = read_book(path)
+    ai = AI(CONST.ENGINE_ALPHABETA, 0)
+    ai.time_manager.timeout_turn = timeout_turn
+    symmetry = Symmetry(size)
+    for game in range(games):
+        random.seed(game)
+        ai.reset()
+        play_opening(ai, symmetry, size, entries)
+        print(f"game {game + 1}/{games}: {len(entries)} positions", flush=True)
+    records: int = write_book(path, entries)
+    print(f"{records} moves written to {path}")
+    return CONST.SUCCESS
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))